@@ -0,0 +1,120 @@
+"""Per-directory file-age histograms gathered during the size walk.
+
+Each directory reported by the walker gets two rows of bytes per age bucket,
+one keyed on ``st_mtime`` and one on ``st_atime``, so cold data can be ranked
+without a second pass over the disk. Rows are accumulated with NumPy and
+rolled up into ancestors the same way sizes are.
+
+Note that ``atime`` is only as good as the mount allows: with ``noatime`` it
+never moves and with ``relatime`` it is updated at most once a day.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_AGE_BUCKETS = (7, 30, 90, 180, 365, 730)
+AGE_KINDS = ("mtime", "atime")
+SECONDS_PER_DAY = 86400
+
+
+def bucket_labels(edges: Sequence[int]) -> List[str]:
+    labels = [f"<{edges[0]}d"]
+    labels.extend(f"{low}-{high}d" for low, high in zip(edges, edges[1:]))
+    labels.append(f">={edges[-1]}d")
+    return labels
+
+
+def normalize_edges(edges: Sequence[int], *extra: int) -> tuple:
+    """Sorted, de-duplicated positive day edges, including any ``extra`` cut-offs."""
+    return tuple(sorted({int(days) for days in (*edges, *extra) if days > 0}))
+
+
+class AgeAccumulator:
+    """Collect ``(mtime, atime, bytes)`` for one directory listing, then bin them at once."""
+
+    __slots__ = ("mtimes", "atimes", "sizes")
+
+    def __init__(self) -> None:
+        self.mtimes: List[float] = []
+        self.atimes: List[float] = []
+        self.sizes: List[int] = []
+
+    def add(self, mtime: float, atime: float, size: int) -> None:
+        self.mtimes.append(mtime)
+        self.atimes.append(atime)
+        self.sizes.append(size)
+
+    def histogram(self, now: float, cutoffs: np.ndarray) -> np.ndarray:
+        """Return a ``(2, buckets)`` array of bytes, mtime row first."""
+        rows = np.zeros((len(AGE_KINDS), len(cutoffs) + 1), dtype=np.int64)
+        if not self.sizes:
+            return rows
+        sizes = np.asarray(self.sizes, dtype=np.int64)
+        for row, stamps in enumerate((self.mtimes, self.atimes)):
+            ages = now - np.asarray(stamps, dtype=np.float64)
+            # Cut-offs are ascending ages in seconds; a file exactly on an
+            # edge belongs to the older bucket.
+            buckets = np.searchsorted(cutoffs, ages, side="right")
+            rows[row] = np.bincount(buckets, weights=sizes, minlength=len(cutoffs) + 1)
+        return rows
+
+
+class AgeHistograms:
+    """Bytes per age bucket for every node of a ``DirTree`` (same indices)."""
+
+    __slots__ = ("edges", "now", "bytes")
+
+    def __init__(self, edges: Sequence[int], now: float, rows: np.ndarray):
+        self.edges = tuple(edges)
+        self.now = now
+        self.bytes = rows  # shape (nodes, len(AGE_KINDS), buckets)
+
+    @classmethod
+    def from_rows(cls, edges: Sequence[int], now: float, count: int, rows: Dict[int, np.ndarray]) -> "AgeHistograms":
+        hist = np.zeros((count, len(AGE_KINDS), len(edges) + 1), dtype=np.int64)
+        for index, row in rows.items():
+            if index < count:
+                hist[index] = row
+        return cls(edges, now, hist)
+
+    @property
+    def labels(self) -> List[str]:
+        return bucket_labels(self.edges)
+
+    def rollup(self, parents: Sequence[int]) -> None:
+        """Add each node's rows into its ancestors, deepest level first."""
+        count = len(self.bytes)
+        if count < 2:
+            return
+        parent_index = np.asarray(parents, dtype=np.int64)
+        levels = np.zeros(count, dtype=np.int64)
+        # Parents precede children, so one forward pass assigns every level.
+        for index in range(1, count):
+            levels[index] = levels[parent_index[index]] + 1
+        for level in range(int(levels.max()), 0, -1):
+            nodes = np.flatnonzero(levels == level)
+            np.add.at(self.bytes, parent_index[nodes], self.bytes[nodes])
+
+    def older_fraction(self, days: int, kind: str = "mtime") -> np.ndarray:
+        """Fraction of each node's file bytes at least ``days`` old (0 for empty nodes)."""
+        if days not in self.edges:
+            raise ValueError(f"{days} is not an age bucket edge; edges are {self.edges}")
+        rows = self.bytes[:, AGE_KINDS.index(kind), :]
+        first_old = self.edges.index(days) + 1
+        totals = rows.sum(axis=1)
+        old = rows[:, first_old:].sum(axis=1)
+        return np.divide(old, totals, out=np.zeros(len(rows), dtype=np.float64), where=totals > 0)
+
+    def cold_nodes(self, days: int, fraction: float, kind: str = "mtime") -> np.ndarray:
+        """Indices of nodes holding file bytes of which at least ``fraction`` are ``days`` old."""
+        return np.flatnonzero(self.older_fraction(days, kind) >= fraction)
+
+    def summary(self, index: int) -> dict:
+        labels = self.labels
+        return {
+            kind: dict(zip(labels, (int(value) for value in self.bytes[index, row])))
+            for row, kind in enumerate(AGE_KINDS)
+        }
@@ -0,0 +1,276 @@
+"""Concurrent deletion engine for disk hygiene cleanup.
+
+Targets are removed in parallel (bounded by ``max_workers``), while each tree
+is deleted by a single worker using directory file descriptors: entries are
+stat'ed, unlinked and rmdir'ed relative to their parent's fd, so no path is
+resolved more than once and a directory swapped for a symlink mid-run is
+never followed. Bytes are counted as entries disappear.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .walker import entry_bytes
+
+MAX_ERROR_SAMPLES = 5
+
+_DIR_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+FD_RELATIVE_SUPPORTED = (
+    os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+    and os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+
+
+class DeletionTarget(NamedTuple):
+    path: str
+    group: str
+
+
+@dataclass
+class DeletionResult:
+    path: str
+    group: str
+    bytes_freed: int = 0
+    files_removed: int = 0
+    dirs_removed: int = 0
+    error_count: int = 0
+    errors: List[OSError] = field(default_factory=list)
+    skipped: bool = False
+    cancelled: bool = False
+
+    @property
+    def removed(self) -> bool:
+        return not (self.error_count or self.skipped or self.cancelled)
+
+
+@dataclass
+class DeletionProgress:
+    targets_total: int
+    targets_done: int = 0
+    bytes_freed: int = 0
+    files_removed: int = 0
+    errors: int = 0
+
+
+class _Frame:
+    __slots__ = ("fd", "entries", "position", "name", "parent_fd", "dir_bytes")
+
+    def __init__(self, fd: int, entries: list, name: str, parent_fd: int, dir_bytes: int):
+        self.fd = fd
+        self.entries = entries
+        self.position = 0
+        self.name = name
+        self.parent_fd = parent_fd
+        self.dir_bytes = dir_bytes
+
+
+class DeletionExecutor:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        *,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_progress: Optional[Callable[[DeletionProgress], None]] = None,
+        progress_interval: float = 5.0,
+        allow: Optional[Callable[[str], bool]] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.deadline = deadline
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.allow = allow
+
+        self._lock = threading.Lock()
+        self._progress = DeletionProgress(targets_total=0)
+        self._last_report = 0.0
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def cancelled(self) -> bool:
+        if self.cancel_event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel_event.set()
+            return True
+        return False
+
+    def run(self, targets: Iterable[DeletionTarget]) -> List[DeletionResult]:
+        targets = list(targets)
+        self._progress = DeletionProgress(targets_total=len(targets))
+        self._last_report = time.monotonic()
+        if not targets:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(targets)),
+            thread_name_prefix="disk-delete",
+        ) as pool:
+            results = list(pool.map(self._delete_target, targets))
+
+        self._report(force=True)
+        return results
+
+    def _delete_target(self, target: DeletionTarget) -> DeletionResult:
+        result = DeletionResult(path=target.path, group=target.group)
+        if self.cancelled():
+            result.cancelled = True
+        elif self.allow is not None and not self.allow(target.path):
+            result.skipped = True
+        elif FD_RELATIVE_SUPPORTED:
+            self._delete_fd_relative(target.path, result)
+        else:
+            self._delete_by_path(target.path, result)
+
+        with self._lock:
+            self._progress.targets_done += 1
+        self._report()
+        return result
+
+    def _record(self, result: DeletionResult, freed: int = 0, files: int = 0, dirs: int = 0) -> None:
+        result.bytes_freed += freed
+        result.files_removed += files
+        result.dirs_removed += dirs
+        with self._lock:
+            self._progress.bytes_freed += freed
+            self._progress.files_removed += files
+        self._report()
+
+    def _error(self, result: DeletionResult, exc: OSError) -> None:
+        result.error_count += 1
+        if len(result.errors) < MAX_ERROR_SAMPLES:
+            result.errors.append(exc)
+        with self._lock:
+            self._progress.errors += 1
+
+    def _report(self, force: bool = False) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        with self._lock:
+            if not force and now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+            snapshot = DeletionProgress(**vars(self._progress))
+            self.on_progress(snapshot)
+
+    def _delete_fd_relative(self, path: str, result: DeletionResult) -> None:
+        parent, name = os.path.split(path.rstrip("/"))
+        try:
+            parent_fd = os.open(parent or "/", _DIR_FLAGS)
+        except OSError as exc:
+            self._error(result, exc)
+            return
+
+        stack: List[_Frame] = []
+        try:
+            try:
+                st = os.stat(name, dir_fd=parent_fd, follow_symlinks=False)
+                if not stat.S_ISDIR(st.st_mode):
+                    os.unlink(name, dir_fd=parent_fd)
+                    self._record(result, entry_bytes(st), files=1)
+                    return
+                stack.append(self._open_frame(name, parent_fd, entry_bytes(st)))
+            except OSError as exc:
+                self._error(result, exc)
+                return
+
+            while stack:
+                if self.cancelled():
+                    result.cancelled = True
+                    return
+
+                frame = stack[-1]
+                if frame.position < len(frame.entries):
+                    entry = frame.entries[frame.position]
+                    frame.position += 1
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if stat.S_ISDIR(st.st_mode):
+                            stack.append(self._open_frame(entry.name, frame.fd, entry_bytes(st)))
+                        else:
+                            os.unlink(entry.name, dir_fd=frame.fd)
+                            self._record(result, entry_bytes(st), files=1)
+                    except OSError as exc:
+                        self._error(result, exc)
+                    continue
+
+                stack.pop()
+                os.close(frame.fd)
+                try:
+                    os.rmdir(frame.name, dir_fd=frame.parent_fd)
+                    self._record(result, frame.dir_bytes, dirs=1)
+                except OSError as exc:
+                    self._error(result, exc)
+        finally:
+            for frame in stack:
+                os.close(frame.fd)
+            os.close(parent_fd)
+
+    @staticmethod
+    def _open_frame(name: str, parent_fd: int, dir_bytes: int) -> _Frame:
+        fd = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+        try:
+            with os.scandir(fd) as iterator:
+                entries = list(iterator)
+        except OSError:
+            os.close(fd)
+            raise
+        return _Frame(fd, entries, name, parent_fd, dir_bytes)
+
+    def _delete_by_path(self, path: str, result: DeletionResult) -> None:
+        try:
+            st = os.lstat(path)
+            if not stat.S_ISDIR(st.st_mode):
+                os.unlink(path)
+                self._record(result, entry_bytes(st), files=1)
+                return
+        except OSError as exc:
+            self._error(result, exc)
+            return
+
+        stack = [(path, False)]
+        while stack:
+            if self.cancelled():
+                result.cancelled = True
+                return
+
+            directory, listed = stack.pop()
+            if listed:
+                try:
+                    dir_bytes = entry_bytes(os.lstat(directory))
+                    os.rmdir(directory)
+                    self._record(result, dir_bytes, dirs=1)
+                except OSError as exc:
+                    self._error(result, exc)
+                continue
+
+            stack.append((directory, True))
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, False))
+                                continue
+                            size = entry_bytes(entry.stat(follow_symlinks=False))
+                            os.unlink(entry.path)
+                            self._record(result, size, files=1)
+                        except OSError as exc:
+                            self._error(result, exc)
+            except OSError as exc:
+                self._error(result, exc)
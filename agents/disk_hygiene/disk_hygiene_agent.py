@@ -1,22 +1,66 @@
+import heapq
 import os
-import shutil
+import sqlite3
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
-    from agentic_tools.workspace_logger.logger import log_milestone, log_reflection
+    from agentic_tools.workspace_logger.logger import flush_coalesced, log_milestone, log_reflection, write_log_block
+    from agentic_tools.workspace_logger.spans import span
+    from agentic_tools.agents.disk_hygiene.ages import AGE_KINDS, DEFAULT_AGE_BUCKETS, bucket_labels, normalize_edges
+    from agentic_tools.agents.disk_hygiene.deletion import (
+        DeletionExecutor,
+        DeletionProgress,
+        DeletionResult,
+        DeletionTarget,
+    )
+    from agentic_tools.agents.disk_hygiene.duplicates import DEFAULT_MIN_SIZE, find_duplicate_groups
+    from agentic_tools.agents.disk_hygiene.size_cache import TreeSizeCache
+    from agentic_tools.agents.disk_hygiene.size_index import SizeIndex
+    from agentic_tools.agents.disk_hygiene.tree import DirEntryView, DirTree, format_size
+    from agentic_tools.agents.disk_hygiene.walker import DEFAULT_WORKERS, entry_bytes, walk_tree
+    from agentic_tools.agents.disk_hygiene.watch import DiskWatcher, is_supported as watch_supported
+    from agentic_tools.config.loader import CompiledConfig, PathTrie, load_config
 except ModuleNotFoundError:
     repo_root = Path(__file__).resolve().parents[2]
     repo_root_str = str(repo_root)
     if repo_root_str not in sys.path:
         sys.path.insert(0, repo_root_str)
-    from workspace_logger.logger import log_milestone, log_reflection
+    from workspace_logger.logger import flush_coalesced, log_milestone, log_reflection, write_log_block
+    from workspace_logger.spans import span
+    from agents.disk_hygiene.ages import AGE_KINDS, DEFAULT_AGE_BUCKETS, bucket_labels, normalize_edges
+    from agents.disk_hygiene.deletion import (
+        DeletionExecutor,
+        DeletionProgress,
+        DeletionResult,
+        DeletionTarget,
+    )
+    from agents.disk_hygiene.duplicates import DEFAULT_MIN_SIZE, find_duplicate_groups
+    from agents.disk_hygiene.size_cache import TreeSizeCache
+    from agents.disk_hygiene.size_index import SizeIndex
+    from agents.disk_hygiene.tree import DirEntryView, DirTree, format_size
+    from agents.disk_hygiene.walker import DEFAULT_WORKERS, entry_bytes, walk_tree
+    from agents.disk_hygiene.watch import DiskWatcher, is_supported as watch_supported
+    from config.loader import CompiledConfig, PathTrie, load_config
 
 
 class DiskHygieneAgent:
+    # Coalescing keys of cleanup milestones, closed at the end of each cleanup
+    # run so its counts land with it (other agents' windows are left alone).
+    CLEANUP_COALESCE_KEYS = (
+        "Skipped protected cleanup candidates",
+        "Skipped protected children of safe roots",
+        "Skipped cleanup targets (permission denied)",
+        "Failed to prune cleanup targets",
+        "Cancelled cleanup targets",
+    )
+
     def __init__(
         self,
         scan_roots: Optional[Iterable[Path]] = None,
@@ -24,14 +68,67 @@ class DiskHygieneAgent:
         default_depth: int = 3,
         default_limit: int = 50,
         min_cleanup_bytes: int = 200 * 1024 * 1024,
+        scan_timeout: float = 180,
+        walker_workers: Optional[int] = None,
+        incremental: bool = True,
+        index_path: Optional[Union[str, Path]] = None,
+        cleanup_workers: int = 4,
+        cleanup_timeout: Optional[float] = None,
+        config_dir: Optional[Union[str, Path]] = None,
     ):
         self.home = Path.home()
         self.default_depth = default_depth
         self.default_limit = default_limit
         self.min_cleanup_bytes = min_cleanup_bytes
-
-        self.scan_roots = self._resolve_scan_roots(scan_roots)
-        self.safe_cleanup_roots = self._resolve_safe_roots(safe_cleanup_roots)
+        self.scan_timeout = scan_timeout
+        self.walker_workers = walker_workers
+        self.last_scan_coverage: Dict[str, dict] = {}
+        self.last_age_trees: Dict[str, DirTree] = {}
+        self.size_index: Optional[SizeIndex] = SizeIndex(index_path) if incremental else None
+        self.size_cache = TreeSizeCache()
+        self.cleanup_workers = cleanup_workers
+        self.cleanup_timeout = cleanup_timeout
+        self.watcher: Optional[DiskWatcher] = None
+
+        # Roots passed here are fixed; otherwise they follow the config file,
+        # which is re-read whenever it changes.
+        self.config_dir = config_dir
+        self._config: Optional[CompiledConfig] = None
+        self._scan_roots_override = self._resolve_scan_roots(scan_roots) if scan_roots is not None else None
+        self._safe_roots_override: Optional[List[Path]] = None
+        self._safe_override_rules: Optional[PathTrie] = None
+        if safe_cleanup_roots is not None:
+            self.safe_cleanup_roots = self._resolve_safe_roots(safe_cleanup_roots)
+
+    @property
+    def config(self) -> CompiledConfig:
+        config = load_config(self.config_dir)
+        if config is not self._config:
+            self._config = config
+            for note, reflection in config.problems:
+                log_milestone("ERROR", note=note, reflection=reflection)
+        return config
+
+    @property
+    def scan_roots(self) -> List[Path]:
+        if self._scan_roots_override is not None:
+            return self._scan_roots_override
+        return self._default_scan_roots()
+
+    @scan_roots.setter
+    def scan_roots(self, roots: Iterable[Path]) -> None:
+        self._scan_roots_override = list(roots)
+
+    @property
+    def safe_cleanup_roots(self) -> List[Path]:
+        if self._safe_roots_override is not None:
+            return self._safe_roots_override
+        return self._default_safe_roots()
+
+    @safe_cleanup_roots.setter
+    def safe_cleanup_roots(self, roots: Iterable[Path]) -> None:
+        self._safe_roots_override = list(roots)
+        self._safe_override_rules = PathTrie((str(root), True) for root in self._safe_roots_override)
 
     def scan(
         self,
@@ -39,7 +136,25 @@ class DiskHygieneAgent:
         limit: Optional[int] = None,
         auto_cleanup: bool = True,
         roots: Optional[Iterable[Path]] = None,
+        find_duplicates: bool = False,
+        age_histograms: bool = False,
+        cold_days: int = 180,
+        cold_fraction: float = 0.9,
+        cold_by: str = "mtime",
     ):
+        """Measure the scan roots and optionally clean up and look for duplicates.
+
+        With ``age_histograms`` every du entry also carries bytes per age
+        bucket (by mtime and atime), and ``report["cold"]`` ranks the largest
+        directories whose file bytes are at least ``cold_fraction`` older than
+        ``cold_days`` by ``cold_by``.
+        """
+        # Checked before df and the walk so a bad argument fails fast.
+        if cold_by not in AGE_KINDS:
+            raise ValueError(f"cold_by must be one of {AGE_KINDS}, not {cold_by!r}")
+        if age_histograms and not (isinstance(cold_days, int) and cold_days > 0):
+            raise ValueError(f"cold_days must be a positive whole number of days, not {cold_days!r}")
+
         timestamp = datetime.now().isoformat()
         depth = depth if depth is not None else self.default_depth
         limit = limit if limit is not None else self.default_limit
@@ -61,9 +176,31 @@ class DiskHygieneAgent:
             timestamp=timestamp,
         )
 
-        du_entries = self._run_du(roots_to_scan, depth=depth, limit=limit)
+        age_buckets = normalize_edges(DEFAULT_AGE_BUCKETS, cold_days) if age_histograms else None
+
+        # The report outlives the scanned trees and is serialized as JSON, so
+        # its entries are plain dicts rather than views into the trees.
+        du_entries = [
+            entry.to_dict()
+            for entry in heapq.nlargest(
+                limit,
+                self.scan_iter(depth=depth, limit=limit, roots=roots_to_scan, age_buckets=age_buckets),
+                key=lambda item: item["size_bytes"],
+            )
+        ]
         self.reflect_on_du(du_entries)
 
+        cold_entries: Optional[List[dict]] = None
+        if age_buckets is not None:
+            cold_entries = [
+                entry.to_dict()
+                for entry in self.cold_entries(limit, days=cold_days, fraction=cold_fraction, kind=cold_by)
+            ]
+
+        duplicates: Optional[List[dict]] = None
+        if find_duplicates:
+            duplicates = self._find_duplicates(roots_to_scan, limit=limit)
+
         cleanup_actions: List[dict] = []
         if auto_cleanup:
             cleanup_actions = self.cleanup_safe_targets(du_entries)
@@ -73,15 +210,28 @@ class DiskHygieneAgent:
             "df": df_output,
             "du": du_entries,
             "scan_roots": [str(path) for path in roots_to_scan],
+            "coverage": dict(self.last_scan_coverage),
+            "root_status": {
+                root: stats.get("status", "complete") for root, stats in self.last_scan_coverage.items()
+            },
             "cleanup_actions": cleanup_actions,
         }
-
+        if cold_entries is not None:
+            report["age_buckets"] = bucket_labels(age_buckets)
+            report["cold_criteria"] = {"days": cold_days, "fraction": cold_fraction, "by": cold_by}
+            report["cold"] = cold_entries
+        if duplicates is not None:
+            report["duplicates"] = duplicates
+            report["duplicate_reclaimable_bytes"] = sum(group["size_bytes"] for group in duplicates)
+
+        partial_roots = [root for root, status in report["root_status"].items() if status != "complete"]
         log_milestone(
             "REFLECT",
             note="Disk hygiene summary",
             reflection=(
                 f"Scan complete: {len(du_entries)} du entries, "
-                f"{len(cleanup_actions)} cleanup actions."
+                f"{len(cleanup_actions)} cleanup actions, "
+                f"{len(partial_roots)} partial roots."
             ),
             timestamp=timestamp,
         )
@@ -89,6 +239,7 @@ class DiskHygieneAgent:
         self.write_summary(report)
         return report
 
+    @span("disk.df")
     def _run_df(self) -> str:
         try:
             result = subprocess.run(
@@ -115,82 +266,348 @@ class DiskHygieneAgent:
             )
             return f"Error running df: {exc}"
 
-    def _run_du(self, roots: List[Path], depth: int, limit: int) -> List[dict]:
-        if not roots:
+    def scan_iter(
+        self,
+        depth: Optional[int] = None,
+        limit: Optional[int] = None,
+        roots: Optional[Iterable[Path]] = None,
+        age_buckets: Optional[Tuple[int, ...]] = None,
+    ) -> Iterator[dict]:
+        """Yield du entries root by root, skipping any that cannot reach the top ``limit``.
+
+        Every yielded entry was in the running top ``limit`` when it was
+        yielded, so ``heapq.nlargest(limit, ...)`` over the stream gives the
+        final ranking while holding at most ``limit`` entries.
+
+        With ``age_buckets`` the full tree of each root is kept in
+        ``last_age_trees`` so ``cold_entries()`` can rank every directory,
+        not just the ones yielded here.
+        """
+        depth = depth if depth is not None else self.default_depth
+        limit = limit if limit is not None else self.default_limit
+        if roots is None:
+            roots_to_scan = self.scan_roots
+        else:
+            roots_to_scan = [self._normalize_path(path) for path in roots]
+
+        self.last_scan_coverage = {}
+        self.last_age_trees = {}
+        self.size_cache.clear()
+
+        if not roots_to_scan:
             log_milestone(
                 "OBSERVE",
                 note="No scan roots",
                 reflection="Skipping du; no directories available to inspect.",
             )
-            return []
+            return
+
+        # All roots share one deadline and one walker budget, so the slowest
+        # root no longer serialises the others and a timeout keeps partial data.
+        deadline = time.monotonic() + self.scan_timeout
+        total_workers = self.walker_workers or DEFAULT_WORKERS
+        workers_per_root = max(2, total_workers // len(roots_to_scan))
+
+        floor: List[int] = []
+        with ThreadPoolExecutor(
+            max_workers=len(roots_to_scan),
+            thread_name_prefix="disk-scan-root",
+        ) as pool:
+            futures = {
+                pool.submit(
+                    self._run_du_for_root,
+                    root,
+                    depth,
+                    limit=limit,
+                    deadline=deadline,
+                    max_workers=workers_per_root,
+                    age_buckets=age_buckets,
+                ): root
+                for root in roots_to_scan
+            }
+            for future in as_completed(futures):
+                root = futures[future]
+                try:
+                    root_entries = future.result()
+                except Exception as exc:
+                    self.last_scan_coverage[str(root)] = {"status": "failed", "complete": False}
+                    log_milestone(
+                        "ERROR",
+                        note=f"Disk walk failed for {root}",
+                        reflection=str(exc),
+                    )
+                    continue
 
-        entries: List[dict] = []
-        for root in roots:
-            entries.extend(self._run_du_for_root(root, depth))
+                for entry in root_entries:
+                    size_bytes = entry["size_bytes"]
+                    if len(floor) < limit:
+                        heapq.heappush(floor, size_bytes)
+                    elif size_bytes > floor[0]:
+                        heapq.heapreplace(floor, size_bytes)
+                    else:
+                        # Entries arrive largest first; the rest of this root cannot qualify.
+                        break
+                    yield entry
 
-        entries.sort(key=lambda item: item.get("size_bytes", 0), reverse=True)
-        return entries[:limit]
+    def _run_du(self, roots: List[Path], depth: int, limit: int) -> List[dict]:
+        return heapq.nlargest(
+            limit,
+            self.scan_iter(depth=depth, limit=limit, roots=roots),
+            key=lambda item: item["size_bytes"],
+        )
 
-    def _run_du_for_root(self, root: Path, depth: int) -> List[dict]:
+    @span("disk.du_root", label_args=("root",))
+    def _run_du_for_root(
+        self,
+        root: Path,
+        depth: int,
+        limit: Optional[int] = None,
+        deadline: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        age_buckets: Optional[Tuple[int, ...]] = None,
+    ) -> List[dict]:
         if not root.exists():
+            self.last_scan_coverage[str(root)] = {"status": "missing", "complete": False}
             return []
 
-        command = ["du", "-k", "-x", "-d", str(depth), str(root)]
+        # Only rules under this root can prune its walk or live tree.
+        exclude = self.config.exclusions_under(str(root)) or None
+
+        # The live tree tracks sizes only; age histograms always walk the disk.
+        if self.watcher is not None and age_buckets is None:
+            live_tree = self.watcher.dir_tree(str(root), depth, exclude or ())
+            if live_tree is not None:
+                self.last_scan_coverage[str(root)] = {
+                    "status": "complete",
+                    "complete": True,
+                    "source": "live",
+                }
+                return self._entries_for_root(live_tree, limit)
+
+        if deadline is None:
+            deadline = time.monotonic() + self.scan_timeout
+        max_workers = max_workers or self.walker_workers
 
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=90,
-                check=False,
+            result = walk_tree(
+                root,
+                depth,
+                max_workers=max_workers,
+                deadline=deadline,
+                index=self.size_index,
+                age_buckets=age_buckets,
+                exclude=exclude,
             )
-        except subprocess.TimeoutExpired:
+        except sqlite3.Error as exc:
             log_milestone(
                 "ERROR",
-                note="du command timed out",
-                reflection=f"Root={root}, depth={depth}",
+                note="Size index unavailable",
+                reflection=f"Falling back to full walks: {exc}",
+            )
+            self.size_index = None
+            result = walk_tree(
+                root,
+                depth,
+                max_workers=max_workers,
+                deadline=deadline,
+                age_buckets=age_buckets,
+                exclude=exclude,
             )
-            return []
 
-        if result.stderr:
+        self.last_scan_coverage[str(root)] = {
+            "status": "complete" if result.complete else "partial",
+            "complete": result.complete,
+            "coverage": round(result.coverage, 4),
+            "dirs_scanned": result.dirs_scanned,
+            "dirs_pending": result.dirs_pending,
+            "dirs_reused": result.dirs_reused,
+            "files_counted": result.files_counted,
+            "errors": result.error_count,
+            "elapsed_seconds": round(result.elapsed, 3),
+        }
+
+        if result.errors:
             log_milestone(
                 "OBSERVE",
-                note=f"du stderr for {root}",
-                reflection=result.stderr.strip(),
+                note=f"Walk errors for {root}",
+                reflection=(
+                    f"{result.error_count} unreadable entries; first: "
+                    + "; ".join(result.errors[:5])
+                ),
             )
 
-        lines = result.stdout.splitlines()
-        entries: List[dict] = []
+        if not result.complete:
+            log_milestone(
+                "ERROR",
+                note="Disk walk timed out",
+                reflection=(
+                    f"Root={root}, depth={depth}; returning partial sizes "
+                    f"({result.dirs_scanned} dirs scanned, {result.dirs_pending} pending)"
+                ),
+            )
 
-        for raw_line in lines:
-            parts = raw_line.strip().split("\t", 1)
-            if len(parts) != 2:
-                parts = raw_line.strip().split(maxsplit=1)
-            if len(parts) != 2:
-                continue
+        tree = result.tree or DirTree(str(root))
+        if tree.ages is not None:
+            self.last_age_trees[str(root)] = tree
+        return self._entries_for_root(tree, limit)
+
+    def _entries_for_root(self, tree: DirTree, limit: Optional[int]) -> List[DirEntryView]:
+        self.size_cache.update(tree.items_under(str(safe_root) for safe_root in self.safe_cleanup_roots))
+        config = self.config
+        if not len(config.exclude_rules):
+            return tree.top(limit)
+        # Walks and live trees are pruned below the root; this drops a root
+        # that a rule above it excludes.
+        entries = [entry for entry in tree.top(None) if not config.is_excluded(entry["path"])]
+        return entries[:limit] if limit is not None else entries
+
+    def cold_entries(
+        self,
+        limit: Optional[int] = None,
+        days: int = 180,
+        fraction: float = 0.9,
+        kind: str = "mtime",
+    ) -> List[DirEntryView]:
+        """Largest directories from the last age scan whose bytes are mostly ``days`` old."""
+        limit = limit if limit is not None else self.default_limit
+        candidates: List[DirEntryView] = []
+        for tree in self.last_age_trees.values():
+            if days not in tree.ages.edges:
+                raise ValueError(f"The last scan has no {days}-day age bucket; rescan with cold_days={days}")
+            candidates.extend(tree.view(int(index)) for index in tree.ages.cold_nodes(days, fraction, kind))
+        return heapq.nlargest(limit, candidates, key=lambda item: item["size_bytes"])
+
+    def start_watch(
+        self,
+        roots: Optional[Iterable[Path]] = None,
+        batch_interval: float = 1.0,
+    ) -> Optional[DiskWatcher]:
+        """Build a live size tree for ``roots`` and keep it current via inotify.
+
+        While the watcher runs, ``scan()`` reads those roots from the live tree
+        instead of walking the disk.
+        """
+        if not watch_supported():
+            log_milestone(
+                "OBSERVE",
+                note="Disk watch unavailable",
+                reflection="inotify is not supported on this platform; scans keep walking the disk.",
+            )
+            return None
 
-            size_str, path_str = parts
-            try:
-                size_kb = int(size_str)
-            except ValueError:
-                continue
+        self.stop_watch()
+        roots_to_watch = self._resolve_scan_roots(roots) if roots is not None else self.scan_roots
+        started = time.monotonic()
+        watcher = DiskWatcher(
+            [str(root) for root in roots_to_watch],
+            batch_interval=batch_interval,
+            max_workers=self.walker_workers,
+        )
+        try:
+            watcher.start()
+        except OSError as exc:
+            log_milestone(
+                "ERROR",
+                note="Disk watch failed to start",
+                reflection=str(exc),
+            )
+            return None
+
+        self.watcher = watcher
+        watch_errors = sum(stats["watch_errors"] for stats in watcher.stats.values())
+        log_milestone(
+            "FLOW",
+            note="Disk watch started",
+            reflection=(
+                f"roots={watcher.roots}, built in {time.monotonic() - started:.1f}s, "
+                f"{watch_errors} directories could not be watched"
+            ),
+        )
+        return watcher
 
+    def stop_watch(self) -> None:
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def find_duplicates(
+        self,
+        roots: Optional[Iterable[Path]] = None,
+        limit: Optional[int] = None,
+        min_size: int = DEFAULT_MIN_SIZE,
+    ) -> dict:
+        timestamp = datetime.now().isoformat()
+        roots_to_scan = self._resolve_scan_roots(roots) if roots is not None else self.scan_roots
+        duplicates = self._find_duplicates(roots_to_scan, limit=limit, min_size=min_size)
+        return {
+            "timestamp": timestamp,
+            "scan_roots": [str(path) for path in roots_to_scan],
+            "duplicates": duplicates,
+            "duplicate_reclaimable_bytes": sum(group["size_bytes"] for group in duplicates),
+        }
+
+    def _find_duplicates(
+        self,
+        roots: List[Path],
+        limit: Optional[int] = None,
+        min_size: int = DEFAULT_MIN_SIZE,
+    ) -> List[dict]:
+        started = time.monotonic()
+        try:
+            groups = find_duplicate_groups([str(root) for root in roots], min_size=min_size)
+        except Exception as exc:
+            log_milestone(
+                "ERROR",
+                note="Duplicate detection failed",
+                reflection=str(exc),
+            )
+            return []
+
+        # Shaped like du entries: size_bytes is what deleting every copy but
+        # the first would reclaim, and path is the copy that would be kept.
+        entries: List[dict] = []
+        for files in groups:
+            reclaimable = sum(allocated for _, _, allocated in files[1:])
             entries.append({
-                "size_bytes": size_kb * 1024,
-                "size": self._format_size(size_kb * 1024),
-                "path": path_str,
-                "root": str(root),
+                "size_bytes": reclaimable,
+                "size": self._format_size(reclaimable),
+                "path": files[0][0],
+                "root": next((str(root) for root in roots if self._is_within(files[0][0], str(root))), ""),
+                "file_size": files[0][1],
+                "count": len(files),
+                "paths": [path for path, _, _ in files],
             })
 
+        entries.sort(key=lambda item: item["size_bytes"], reverse=True)
+        if limit is not None:
+            entries = entries[:limit]
+
+        total = sum(entry["size_bytes"] for entry in entries)
+        log_milestone(
+            "REFLECT",
+            note="Duplicate files",
+            reflection=(
+                f"{len(groups)} duplicate groups, {self._format_size(total)} reclaimable "
+                f"in the top {len(entries)} ({time.monotonic() - started:.1f}s)"
+            ),
+        )
         return entries
 
-    def cleanup_safe_targets(self, du_entries: List[dict]) -> List[dict]:
+    @span("disk.cleanup")
+    def cleanup_safe_targets(
+        self,
+        du_entries: List[dict],
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[dict]:
         actions: List[dict] = []
         if not self.safe_cleanup_roots:
             return actions
 
-        processed: set[str] = set()
+        # Plan first (cheap, sequential checks), then delete every target
+        # concurrently. Nested candidates are collapsed so no two workers ever
+        # delete inside the same tree.
+        plans: Dict[str, dict] = {}
         for entry in du_entries:
             path_str = entry.get("path")
             size_bytes = entry.get("size_bytes")
@@ -199,7 +616,9 @@ class DiskHygieneAgent:
 
             candidate_path = self._normalize_path(path_str)
             normalized_str = str(candidate_path)
-            if normalized_str in processed or not candidate_path.exists():
+            if any(self._is_within(normalized_str, planned) for planned in plans):
+                continue
+            if not candidate_path.exists():
                 continue
 
             safe_root = self._match_safe_root(candidate_path)
@@ -220,37 +639,107 @@ class DiskHygieneAgent:
                     "OBSERVE",
                     note=f"Skipped {normalized_str}",
                     reflection="Path is protected or lacks delete permissions.",
+                    coalesce="Skipped protected cleanup candidates",
+                    sample=normalized_str,
                 )
                 continue
 
             if size_bytes < self.min_cleanup_bytes and safe_root.name != ".Trash":
                 continue
 
-            try:
-                if candidate_path == safe_root:
-                    freed_bytes = self._clear_directory_contents(candidate_path)
-                else:
-                    freed_bytes = self._remove_path(candidate_path)
-            except PermissionError as exc:
+            for planned in [planned for planned in plans if self._is_within(planned, normalized_str)]:
+                del plans[planned]
+
+            plans[normalized_str] = {
+                "path": candidate_path,
+                "safe_root": safe_root,
+                "size_bytes": size_bytes,
+                "clear": candidate_path == safe_root,
+            }
+
+        if not plans:
+            flush_coalesced(self.CLEANUP_COALESCE_KEYS)
+            return actions
+
+        targets: List[DeletionTarget] = []
+        for normalized_str, plan in plans.items():
+            if plan["clear"]:
+                targets.extend(self._clear_targets(plan["path"], group=normalized_str))
+            else:
+                targets.append(DeletionTarget(normalized_str, normalized_str))
+
+        if deadline is None and self.cleanup_timeout is not None:
+            deadline = time.monotonic() + self.cleanup_timeout
+
+        results = self._run_deletions(targets, deadline=deadline, cancel_event=cancel_event)
+
+        grouped: Dict[str, List[DeletionResult]] = {key: [] for key in plans}
+        for result in results:
+            grouped[result.group].append(result)
+
+        for normalized_str, group_results in grouped.items():
+            plan = plans[normalized_str]
+            safe_root = plan["safe_root"]
+            freed_bytes = sum(result.bytes_freed for result in group_results)
+            errors = [exc for result in group_results for exc in result.errors]
+            error_count = sum(result.error_count for result in group_results)
+            cancelled = any(result.cancelled for result in group_results)
+            skipped = [result.path for result in group_results if result.skipped]
+            removed = sum(result.files_removed + result.dirs_removed for result in group_results)
+
+            # Nothing to delete (a cleared directory with no eligible children)
+            # or refused by the execution-time re-check: nothing was freed.
+            if not group_results or skipped:
                 log_milestone(
                     "OBSERVE",
                     note=f"Skipped {normalized_str}",
-                    reflection=f"Permission denied: {exc}",
+                    reflection=(
+                        f"{len(skipped)} target(s) no longer allowed at deletion time, e.g. {skipped[0]}"
+                        if skipped else "No eligible entries to remove."
+                    ),
+                    coalesce="Skipped protected cleanup candidates",
+                    sample=normalized_str,
                 )
-                continue
-            except Exception as exc:
+                if not removed:
+                    continue
+
+            if error_count:
+                first = errors[0]
+                if all(isinstance(exc, PermissionError) for exc in errors):
+                    log_milestone(
+                        "OBSERVE",
+                        note=f"Skipped {normalized_str}",
+                        reflection=f"Permission denied for {error_count} entries: {first}",
+                        coalesce="Skipped cleanup targets (permission denied)",
+                        sample=normalized_str,
+                    )
+                else:
+                    log_milestone(
+                        "ERROR",
+                        note=f"Failed to prune {normalized_str}",
+                        reflection=f"{error_count} entries could not be removed; first: {first}",
+                        coalesce="Failed to prune cleanup targets",
+                        sample=normalized_str,
+                    )
+                if freed_bytes <= 0:
+                    continue
+
+            if cancelled:
                 log_milestone(
-                    "ERROR",
-                    note=f"Failed to prune {candidate_path}",
-                    reflection=str(exc),
+                    "OBSERVE",
+                    note=f"Cleanup of {normalized_str} cancelled",
+                    reflection="Deadline reached or cleanup cancelled before the tree was fully removed.",
+                    coalesce="Cancelled cleanup targets",
+                    sample=normalized_str,
                 )
-                continue
 
-            freed_bytes = freed_bytes or size_bytes or 0
+            # Byte counts can be zero (e.g. filesystems without st_blocks);
+            # fall back to the planned size only for a complete removal.
+            if removed and not (error_count or cancelled or skipped):
+                freed_bytes = freed_bytes or plan["size_bytes"] or 0
             if freed_bytes <= 0:
                 continue
 
-            processed.add(normalized_str)
             action = {
                 "path": normalized_str,
                 "bytes_freed": freed_bytes,
@@ -265,32 +754,50 @@ class DiskHygieneAgent:
                 reflection=f"Freed approximately {action['human_freed']} (under {safe_root})",
             )
 
+        flush_coalesced(self.CLEANUP_COALESCE_KEYS)
         return actions
 
     def write_summary(self, report: dict, path: Optional[str] = None) -> None:
         log_path = Path(path or "~/repos/agentic_tools/workspace_logger/workspace_log.txt").expanduser()
 
         try:
-            with open(log_path, "a") as handle:
-                handle.write(f"\n[SUMMARY] {report['timestamp']}\n")
-                handle.write("Scanned Roots:\n")
-                for root in report.get("scan_roots", []):
-                    handle.write(f"- {root}\n")
-                handle.write("\nDisk Usage (df):\n")
-                handle.write((report.get("df") or "Unavailable") + "\n\n")
-                handle.write("Top Directories (du):\n")
-                for entry in report.get("du", []):
-                    handle.write(f"{entry.get('size', '?')}  {entry.get('path', '?')}\n")
-                cleanup_actions = report.get("cleanup_actions", [])
-                handle.write("\nCleanup Actions:\n")
-                if cleanup_actions:
-                    for action in cleanup_actions:
-                        handle.write(
-                            f"- Freed {action.get('human_freed', '?')} from {action.get('path', '?')}"
-                            f" (safe root: {action.get('safe_root', '?')})\n"
-                        )
-                else:
-                    handle.write("- None\n")
+            lines = [f"\n[SUMMARY] {report['timestamp']}", "Scanned Roots:"]
+            root_status = report.get("root_status", {})
+            for root in report.get("scan_roots", []):
+                status = root_status.get(root, "complete")
+                lines.append(f"- {root}" if status == "complete" else f"- {root} ({status})")
+            lines.append("\nDisk Usage (df):")
+            lines.append((report.get("df") or "Unavailable") + "\n")
+            lines.append("Top Directories (du):")
+            for entry in report.get("du", []):
+                lines.append(f"{entry.get('size', '?')}  {entry.get('path', '?')}")
+            if "cold" in report:
+                criteria = report.get("cold_criteria", {})
+                lines.append(
+                    f"\nCold Directories (>= {criteria.get('fraction', 0):.0%} older than "
+                    f"{criteria.get('days', '?')} days by {criteria.get('by', 'mtime')}):"
+                )
+                for entry in report["cold"]:
+                    lines.append(f"{entry.get('size', '?')}  {entry.get('path', '?')}")
+            if "duplicates" in report:
+                lines.append("\nDuplicate Files (reclaimable):")
+                for group in report["duplicates"]:
+                    lines.append(
+                        f"{group.get('size', '?')}  {group.get('path', '?')}"
+                        f" (+{group.get('count', 1) - 1} copies)"
+                    )
+            cleanup_actions = report.get("cleanup_actions", [])
+            lines.append("\nCleanup Actions:")
+            if cleanup_actions:
+                for action in cleanup_actions:
+                    lines.append(
+                        f"- Freed {action.get('human_freed', '?')} from {action.get('path', '?')}"
+                        f" (safe root: {action.get('safe_root', '?')})"
+                    )
+            else:
+                lines.append("- None")
+            # One rotated append instead of a line-by-line write to an ever-growing file.
+            write_log_block("\n".join(lines), log_path)
         except Exception as exc:
             log_milestone(
                 "ERROR",
@@ -298,6 +805,7 @@ class DiskHygieneAgent:
                 reflection=str(exc),
             )
 
+    @span("disk.reflect")
     def reflect_on_du(self, du_output: List[dict]) -> None:
         try:
             categories = {
@@ -321,9 +829,9 @@ class DiskHygieneAgent:
                     categories["other"].append(entry)
 
             def summarize(entries: List[dict], label: str) -> str:
-                large = [e for e in entries if isinstance(e.get("size"), str) and (e["size"].endswith("G") or e["size"].endswith("M"))]
+                large = [e for e in entries if (e.get("size_bytes") or 0) >= 1024 * 1024]
                 top = large[:3]
-                return f"{label}: " + ", ".join([f"{e['size']} → {e['path']}" for e in top]) if top else f"{label}: none"
+                return f"{label}: " + ", ".join([f"{format_size(e['size_bytes'])} → {e['path']}" for e in top]) if top else f"{label}: none"
 
             reflection = "\n".join([
                 summarize(categories["user"], "User data"),
@@ -343,81 +851,116 @@ class DiskHygieneAgent:
                 reflection=str(exc),
             )
 
-    def _clear_directory_contents(self, directory: Path) -> int:
-        total = 0
+    def _clear_targets(self, directory: Path, group: str) -> List[DeletionTarget]:
+        targets: List[DeletionTarget] = []
         if not directory.exists() or not directory.is_dir():
-            return total
+            return targets
 
         for child in directory.iterdir():
-            try:
-                total += self._remove_path(child)
-            except PermissionError as exc:
+            if not self._is_removal_allowed(child):
                 log_milestone(
                     "OBSERVE",
                     note=f"Skipped {child}",
-                    reflection=f"Permission denied: {exc}",
-                )
-            except Exception as exc:
-                log_milestone(
-                    "ERROR",
-                    note=f"Failed to remove {child}",
-                    reflection=str(exc),
+                    reflection="Permission denied: Removal not allowed for protected path.",
+                    coalesce="Skipped protected children of safe roots",
+                    sample=str(child),
                 )
+                continue
+            targets.append(DeletionTarget(str(child), group))
+
+        return targets
+
+    def _run_deletions(
+        self,
+        targets: List[DeletionTarget],
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[DeletionResult]:
+        def report(progress: DeletionProgress) -> None:
+            log_milestone(
+                "FLOW",
+                note="Cleanup progress",
+                reflection=(
+                    f"{progress.targets_done}/{progress.targets_total} targets, "
+                    f"{progress.files_removed} files, freed {self._format_size(progress.bytes_freed)}"
+                ),
+            )
+
+        executor = DeletionExecutor(
+            self.cleanup_workers,
+            deadline=deadline,
+            cancel_event=cancel_event,
+            on_progress=report if len(targets) > 1 else None,
+            allow=self._deletion_allowed,
+        )
+        results = executor.run(targets)
 
-        return total
+        for result in results:
+            if result.bytes_freed or result.removed:
+                self.size_cache.record_removal(result.path, result.bytes_freed, removed=result.removed)
+
+        return results
+
+    def _deletion_allowed(self, path_str: str) -> bool:
+        # Re-checked at execution time: planning and deletion are separated by
+        # however long the other workers take.
+        # Resolve only the parent so a symlink is judged by where it lives.
+        path = Path(path_str)
+        location = self._normalize_path(path.parent) / path.name
+        return self._match_safe_root(location) is not None and self._is_removal_allowed(path)
+
+    def _clear_directory_contents(self, directory: Path) -> int:
+        results = self._run_deletions(self._clear_targets(directory, group=str(directory)))
+        return sum(result.bytes_freed for result in results)
 
     def _remove_path(self, path: Path) -> int:
         if not self._is_removal_allowed(path):
             raise PermissionError("Removal not allowed for protected path.")
 
-        size = self._compute_path_size(path)
-
-        if path.is_symlink() or path.is_file():
-            path.unlink(missing_ok=True)
-        elif path.is_dir():
-            shutil.rmtree(path)
+        results = self._run_deletions([DeletionTarget(str(path), str(path))])
+        result = results[0]
+        if result.skipped:
+            raise PermissionError("Removal not allowed for protected path.")
+        if result.errors and result.bytes_freed == 0:
+            raise result.errors[0]
+        return result.bytes_freed
 
-        return size
+    @staticmethod
+    def _is_within(path_str: str, ancestor: str) -> bool:
+        return path_str == ancestor or path_str.startswith(ancestor.rstrip("/") + "/")
 
     def _compute_path_size(self, path: Path) -> int:
+        path_str = str(path)
+        cached = self.size_cache.get(path_str)
+        if cached is not None:
+            return cached
+
+        if self.size_index is not None:
+            try:
+                indexed = self.size_index.total_for(path_str)
+            except sqlite3.Error:
+                indexed = None
+            if indexed is not None:
+                return indexed
+
         try:
-            if path.is_symlink():
-                return path.lstat().st_size
-            if path.is_file():
-                return path.stat().st_size
-            if not path.is_dir():
-                return 0
+            if path.is_symlink() or not path.is_dir():
+                return entry_bytes(path.lstat())
         except OSError:
             return 0
 
-        total = 0
-
-        def _ignore(_: OSError) -> None:
-            return None
-
-        for root, _, files in os.walk(path, onerror=_ignore):
-            root_path = Path(root)
-            for name in files:
-                file_path = root_path / name
-                try:
-                    if file_path.is_symlink():
-                        total += file_path.lstat().st_size
-                    else:
-                        total += file_path.stat().st_size
-                except OSError:
-                    continue
-
-        return total
+        result = walk_tree(path, 0, max_workers=self.walker_workers, timeout=self.scan_timeout)
+        size = result.entries[0][1] if result.entries else 0
+        self.size_cache.update([(path_str, size)])
+        return size
 
     def _match_safe_root(self, path: Path) -> Optional[Path]:
-        for safe_root in self.safe_cleanup_roots:
-            try:
-                path.relative_to(safe_root)
-                return safe_root
-            except ValueError:
-                continue
-
-        return None
+        # Deepest containing safe root, found in O(path depth).
+        if self._safe_override_rules is not None:
+            match = self._safe_override_rules.longest_match(str(path))
+            return Path(match[0]) if match else None
+        safe_root = self.config.safe_root_for(str(path))
+        return Path(safe_root) if safe_root is not None and os.path.exists(safe_root) else None
 
     def _is_removal_allowed(self, path: Path) -> bool:
         if not path.exists():
@@ -465,25 +1008,10 @@ class DiskHygieneAgent:
         return [path for path in resolved if path.exists()]
 
     def _default_scan_roots(self) -> List[Path]:
-        candidates = [
-            self.home / "Downloads",
-            self.home / "Documents",
-            self.home / "Desktop",
-            self.home / "Library" / "Caches",
-            self.home / "Library" / "Logs",
-            self.home / "Library" / "Developer" / "Xcode" / "DerivedData",
-            self.home / "repos",
-        ]
-        return [path for path in candidates if path.exists()]
+        return [Path(path) for path in self.config.scan_roots if os.path.exists(path)]
 
     def _default_safe_roots(self) -> List[Path]:
-        candidates = [
-            self.home / "Library" / "Caches",
-            self.home / "Library" / "Logs",
-            self.home / "Library" / "Developer" / "Xcode" / "DerivedData",
-            self.home / ".Trash",
-        ]
-        return [path for path in candidates if path.exists()]
+        return [Path(path) for path in self.config.safe_roots if os.path.exists(path)]
 
     def _normalize_path(self, candidate: Path) -> Path:
         try:
@@ -497,30 +1025,55 @@ class DiskHygieneAgent:
             return expanded
 
     def _format_size(self, size_bytes: int) -> str:
-        if size_bytes is None or size_bytes < 0:
-            return "?"
+        return format_size(size_bytes)
 
-        units = ["B", "K", "M", "G", "T", "P"]
-        value = float(size_bytes)
 
-        for unit in units:
-            if value < 1024 or unit == units[-1]:
-                if unit == "B":
-                    return f"{int(value)}B"
-                if value >= 10:
-                    return f"{value:.0f}{unit}"
-                return f"{value:.1f}{unit}"
-            value /= 1024
+def check_disk_usage(depth: Optional[int] = None, limit: Optional[int] = None):
+    agent = DiskHygieneAgent()
+    return agent.scan(depth=depth, limit=limit)
 
-        return f"{value:.1f}P"
 
+def watch_disk_usage(
+    interval: float = 300,
+    depth: Optional[int] = None,
+    limit: Optional[int] = None,
+    check_thresholds: bool = True,
+    threshold_max_staleness: Optional[float] = None,
+) -> None:
+    """Keep a live size tree and report from it every ``interval`` seconds.
+
+    Threshold paths are checked on an adaptive schedule, each at least once
+    per ``threshold_max_staleness`` seconds.
+    """
+    try:
+        from agentic_tools.agents.threshold_alert.threshold_agent_alert import check_thresholds as run_threshold_check
+        from agentic_tools.agents.threshold_alert.scheduler import DEFAULT_MAX_STALENESS, AdaptiveScheduler
+    except ModuleNotFoundError:
+        from agents.threshold_alert.threshold_agent_alert import check_thresholds as run_threshold_check
+        from agents.threshold_alert.scheduler import DEFAULT_MAX_STALENESS, AdaptiveScheduler
 
-def check_disk_usage(depth: Optional[int] = None, limit: Optional[int] = None):
     agent = DiskHygieneAgent()
-    return agent.scan(depth=depth, limit=limit)
+    watcher = agent.start_watch()
+    scheduler = AdaptiveScheduler(
+        min_interval=min(interval, 60),
+        max_staleness=threshold_max_staleness or DEFAULT_MAX_STALENESS,
+    )
+    try:
+        while True:
+            agent.scan(depth=depth, limit=limit, auto_cleanup=False)
+            if check_thresholds:
+                run_threshold_check(live=watcher, scheduler=scheduler)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop_watch()
 
 
 if __name__ == "__main__":
-    agent = DiskHygieneAgent()
-    result = agent.scan()
-    print(f"[agent result] keys: {list(result.keys())}")
+    if "--watch" in sys.argv[1:]:
+        watch_disk_usage()
+    else:
+        agent = DiskHygieneAgent()
+        result = agent.scan()
+        print(f"[agent result] keys: {list(result.keys())}")
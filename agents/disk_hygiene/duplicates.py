@@ -0,0 +1,149 @@
+"""Staged duplicate-file detection for the disk hygiene agent.
+
+Files are grouped by size first, then by a digest of their first and last few
+KB, and only files that still collide are fully hashed. Hashing runs on a
+process pool over memory-mapped reads; hardlinks to the same inode are folded
+together up front because they do not occupy extra space.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import multiprocessing
+import os
+import stat
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .walker import entry_bytes
+
+SAMPLE_BYTES = 4096
+DEFAULT_MIN_SIZE = 1024 * 1024
+# Below this many files to hash, spawning a process pool costs more than it saves.
+POOL_THRESHOLD = 32
+
+FileInfo = Tuple[str, int, int]  # (path, apparent size, allocated bytes)
+
+
+def _pool_context():
+    # Not fork: the parent runs logger, watcher and event-loop threads whose
+    # held locks a forked child would inherit.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def iter_files(
+    roots: Iterable[str],
+    min_size: int = 1,
+    one_filesystem: bool = True,
+) -> Iterator[FileInfo]:
+    """Yield regular files under ``roots`` once per inode, without following symlinks."""
+    seen_inodes = set()
+    for root in roots:
+        try:
+            root_dev = os.lstat(root).st_dev
+        except OSError:
+            continue
+
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if stat.S_ISDIR(st.st_mode):
+                            if not one_filesystem or st.st_dev == root_dev:
+                                stack.append(entry.path)
+                            continue
+                        if not stat.S_ISREG(st.st_mode) or st.st_size < min_size:
+                            continue
+                        key = (st.st_dev, st.st_ino)
+                        if key in seen_inodes:
+                            continue
+                        seen_inodes.add(key)
+                        yield entry.path, st.st_size, entry_bytes(st)
+            except OSError:
+                continue
+
+
+def _digest(task: Tuple[str, int, bool]) -> Optional[bytes]:
+    path, size, full = task
+    try:
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            hasher = hashlib.blake2b(digest_size=20)
+            if full:
+                if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                hasher.update(mapped)
+            else:
+                hasher.update(mapped[:SAMPLE_BYTES])
+                if size > SAMPLE_BYTES:
+                    hasher.update(mapped[max(SAMPLE_BYTES, size - SAMPLE_BYTES):])
+            return hasher.digest()
+    except (OSError, ValueError):
+        return None
+
+
+def _hash_all(tasks: List[Tuple[str, int, bool]], pool: Optional[ProcessPoolExecutor]) -> List[Optional[bytes]]:
+    if pool is None or len(tasks) < POOL_THRESHOLD:
+        return [_digest(task) for task in tasks]
+    return list(pool.map(_digest, tasks, chunksize=16))
+
+
+def _regroup(
+    groups: Iterable[List[FileInfo]],
+    full: bool,
+    pool: Optional[ProcessPoolExecutor],
+) -> List[List[FileInfo]]:
+    candidates = [files for files in groups if len(files) > 1]
+    tasks = [(path, size, full) for files in candidates for path, size, _ in files]
+    digests = iter(_hash_all(tasks, pool))
+
+    regrouped: List[List[FileInfo]] = []
+    for files in candidates:
+        buckets: Dict[bytes, List[FileInfo]] = defaultdict(list)
+        for info in files:
+            digest = next(digests)
+            if digest is not None:
+                buckets[digest].append(info)
+        regrouped.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+    return regrouped
+
+
+def find_duplicate_groups(
+    roots: Iterable[str],
+    *,
+    min_size: int = DEFAULT_MIN_SIZE,
+    max_workers: Optional[int] = None,
+    one_filesystem: bool = True,
+) -> List[List[FileInfo]]:
+    """Return groups of byte-identical files, each sorted by path."""
+    by_size: Dict[int, List[FileInfo]] = defaultdict(list)
+    for info in iter_files(roots, min_size=max(1, min_size), one_filesystem=one_filesystem):
+        by_size[info[1]].append(info)
+
+    candidates = [files for files in by_size.values() if len(files) > 1]
+    if not candidates:
+        return []
+
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        if sum(len(files) for files in candidates) >= POOL_THRESHOLD:
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=_pool_context())
+        partial = _regroup(candidates, full=False, pool=pool)
+
+        # Files no larger than both samples were hashed in full already.
+        small = [files for files in partial if files[0][1] <= 2 * SAMPLE_BYTES]
+        large = [files for files in partial if files[0][1] > 2 * SAMPLE_BYTES]
+        confirmed = small + _regroup(large, full=True, pool=pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return [sorted(files) for files in confirmed]
@@ -0,0 +1,46 @@
+"""Per-scan cache of subtree sizes shared by the scan and cleanup phases."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class TreeSizeCache:
+    def __init__(self) -> None:
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._sizes
+
+    def update(self, entries: Iterable[Tuple[str, int]]) -> None:
+        with self._lock:
+            self._sizes.update(entries)
+
+    def get(self, path: str) -> Optional[int]:
+        return self._sizes.get(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sizes.clear()
+
+    def record_removal(self, path: str, freed_bytes: int, removed: bool = True) -> None:
+        """Shrink cached ancestors by ``freed_bytes`` and forget the removed subtree."""
+        with self._lock:
+            if removed:
+                prefix = path.rstrip("/") + "/"
+                for key in [key for key in self._sizes if key == path or key.startswith(prefix)]:
+                    del self._sizes[key]
+            elif path in self._sizes:
+                self._sizes[path] = max(0, self._sizes[path] - freed_bytes)
+
+            parent = os.path.dirname(path)
+            while parent and parent != path:
+                if parent in self._sizes:
+                    self._sizes[parent] = max(0, self._sizes[parent] - freed_bytes)
+                path, parent = parent, os.path.dirname(parent)
@@ -0,0 +1,211 @@
+"""Persistent per-directory size index used for incremental disk walks.
+
+Each directory is keyed by path and stores the metadata that changes whenever
+its entries change (device, inode, mtime) alongside the bytes of its direct
+children, the names of its subdirectories and its aggregated subtree size.
+A later walk that finds identical metadata reuses the cached listing instead
+of calling ``scandir`` and ``stat`` on every file again.
+
+Files that grow in place (logs, VM images, databases) do not change their
+directory's mtime, so a listing is only reused for ``max_age`` seconds after
+it was last taken; older ones are listed again.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+DEFAULT_INDEX_PATH = Path(
+    os.environ.get(
+        "AGENTIC_DISK_INDEX",
+        str(Path.home() / ".cache" / "agentic_tools" / "disk_index.sqlite3"),
+    )
+).expanduser()
+# Seconds an indexed listing may be reused before the directory is re-listed.
+DEFAULT_MAX_AGE = float(os.environ.get("AGENTIC_DISK_INDEX_MAX_AGE", "3600"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    own_bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    children TEXT NOT NULL,
+    total_bytes INTEGER,
+    scanned_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class IndexedDir(NamedTuple):
+    dev: int
+    ino: int
+    mtime_ns: int
+    own_bytes: int
+    files: int
+    children: Tuple[str, ...]
+    total_bytes: Optional[int]
+    scanned_at: float = 0.0
+
+    def matches(self, st: os.stat_result) -> bool:
+        return (
+            self.ino == st.st_ino
+            and self.dev == st.st_dev
+            and self.mtime_ns == st.st_mtime_ns
+        )
+
+
+# (path, dev, ino, mtime_ns, own_bytes, files, children)
+DirRecord = Tuple[str, int, int, int, int, int, Tuple[str, ...]]
+
+
+def _subtree_bounds(root: str) -> Tuple[str, str]:
+    prefix = root.rstrip("/") + "/"
+    # "0" sorts directly after "/", so [prefix, upper) is exactly the subtree.
+    return prefix, prefix[:-1] + "0"
+
+
+def _depth(path: str) -> int:
+    return path.count("/")
+
+
+class SizeIndex:
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        self.path = Path(path).expanduser() if path else DEFAULT_INDEX_PATH
+        # None reuses listings for as long as the directory mtime is unchanged.
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def reuse_after(self, now: Optional[float] = None) -> float:
+        """Listings taken before this time are stale and must not be reused."""
+        if self.max_age is None:
+            return float("-inf")
+        return (time.time() if now is None else now) - self.max_age
+
+    def snapshot(self, root: str) -> Dict[str, IndexedDir]:
+        lower, upper = _subtree_bounds(root)
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT path, dev, ino, mtime_ns, own_bytes, files, children, total_bytes, scanned_at "
+                "FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, lower, upper),
+            ).fetchall()
+
+        return {
+            row[0]: IndexedDir(
+                row[1],
+                row[2],
+                row[3],
+                row[4],
+                row[5],
+                tuple(row[6].split("/")) if row[6] else (),
+                row[7],
+                row[8],
+            )
+            for row in rows
+        }
+
+    def total_for(self, path: str) -> Optional[int]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT total_bytes, scanned_at FROM dirs WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None or row[1] < self.reuse_after():
+            return None
+        return row[0]
+
+    def update(
+        self,
+        root: str,
+        records: Iterable[DirRecord],
+        snapshot: Dict[str, IndexedDir],
+        complete: bool,
+        exclude: Collection[str] = (),
+    ) -> int:
+        """Write back changed directories; returns the number of rows touched.
+
+        Aggregated totals are only trusted (and stored) for complete walks; a
+        partial walk refreshes the per-directory listing and clears totals.
+        A walk that skipped the ``exclude`` subtrees stores every listing it
+        took, but no totals for the ancestors of what it skipped, and leaves
+        the skipped subtrees' rows alone.
+        """
+        records = list(records)
+        exclude = frozenset(exclude)
+        totals: Dict[str, int] = {}
+        if complete:
+            # Directories whose subtree includes an excluded one: total unknown.
+            short = set(exclude)
+            for path, _, _, _, own, _, children in sorted(records, key=lambda r: _depth(r[0]), reverse=True):
+                prefix = path.rstrip("/") + "/"
+                child_paths = [prefix + name for name in children]
+                if short.intersection(child_paths):
+                    short.add(path)
+                else:
+                    totals[path] = own + sum(totals.get(child, 0) for child in child_paths)
+
+        now = time.time()
+        reuse_after = self.reuse_after(now)
+        changed: List[tuple] = []
+        for path, dev, ino, mtime_ns, own, files, children in records:
+            total = totals.get(path)
+            previous = snapshot.get(path)
+            # Unchanged rows are skipped, except stale ones: those were just
+            # listed again and need their scanned_at refreshed.
+            if (
+                previous is not None
+                and previous[:7] == (dev, ino, mtime_ns, own, files, children, total)
+                and previous.scanned_at >= reuse_after
+            ):
+                continue
+            changed.append((path, dev, ino, mtime_ns, own, files, "/".join(children), total, now))
+
+        stale: List[Tuple[str]] = []
+        if complete:
+            visited = {record[0] for record in records}
+            skipped = [excluded.rstrip("/") + "/" for excluded in exclude]
+            stale = [
+                (path,)
+                for path in snapshot
+                if path not in visited and path not in exclude and not path.startswith(tuple(skipped))
+            ]
+
+        if not changed and not stale:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs "
+                    "(path, dev, ino, mtime_ns, own_bytes, files, children, total_bytes, scanned_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    changed,
+                )
+                conn.executemany("DELETE FROM dirs WHERE path = ?", stale)
+
+        return len(changed) + len(stale)
@@ -0,0 +1,191 @@
+"""Compact directory tree with a read-only dict-like view per node.
+
+Nodes live in parallel arrays (parent index, size, file count) with interned
+names, so a tree with millions of directories costs a few machine words per
+node instead of one dict with a preformatted size string each. Paths and
+human-readable sizes are only built when a view is read.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .ages import AgeHistograms
+
+_VIEW_KEYS = ("size_bytes", "size", "path", "root", "files")
+_AGE_VIEW_KEYS = _VIEW_KEYS + ("ages",)
+
+
+def format_size(size_bytes: Optional[int]) -> str:
+    if size_bytes is None or size_bytes < 0:
+        return "?"
+
+    units = ["B", "K", "M", "G", "T", "P"]
+    value = float(size_bytes)
+
+    for unit in units:
+        if value < 1024 or unit == units[-1]:
+            if unit == "B":
+                return f"{int(value)}B"
+            if value >= 10:
+                return f"{value:.0f}{unit}"
+            return f"{value:.1f}{unit}"
+        value /= 1024
+
+    return f"{value:.1f}P"
+
+
+def _is_within(path: str, ancestor: str) -> bool:
+    return path == ancestor or path.startswith(ancestor.rstrip("/") + "/")
+
+
+class DirTree:
+    __slots__ = ("root", "names", "parents", "sizes", "file_counts", "ages")
+
+    def __init__(self, root: str):
+        self.root = root
+        self.names: List[str] = []
+        self.parents = array("q")
+        self.sizes = array("q")
+        self.file_counts = array("q")
+        # Optional per-node age histograms, indexed like the arrays above.
+        self.ages: Optional["AgeHistograms"] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, parent: int, size: int = 0, files: int = 0) -> int:
+        """Append a node; ``name`` is the full root path for the first node, a basename after."""
+        self.names.append(sys.intern(name))
+        self.parents.append(parent)
+        self.sizes.append(size)
+        self.file_counts.append(files)
+        return len(self.names) - 1
+
+    def copy(self) -> "DirTree":
+        clone = DirTree(self.root)
+        clone.names = list(self.names)
+        clone.parents = array("q", self.parents)
+        clone.sizes = array("q", self.sizes)
+        clone.file_counts = array("q", self.file_counts)
+        clone.ages = self.ages
+        return clone
+
+    @classmethod
+    def from_sizes(cls, root: str, sizes: Iterable[Tuple[str, int]]) -> "DirTree":
+        """Build a tree from ``(path, size)`` pairs whose parents precede their children."""
+        tree = cls(root)
+        index_of: Dict[str, int] = {}
+        for path, size in sizes:
+            parent_path, _, name = path.rstrip("/").rpartition("/")
+            parent = index_of.get(parent_path or "/", -1)
+            index_of[path] = tree.add(path if parent < 0 else name, parent, size)
+        return tree
+
+    def rollup(self) -> None:
+        """Fold each node's own counts into its ancestors (parents precede children)."""
+        for index in range(len(self.names) - 1, 0, -1):
+            parent = self.parents[index]
+            self.sizes[parent] += self.sizes[index]
+            self.file_counts[parent] += self.file_counts[index]
+
+    def path(self, index: int) -> str:
+        parts: List[str] = []
+        while index > 0:
+            parts.append(self.names[index])
+            index = self.parents[index]
+        if not parts:
+            return self.names[0]
+        prefix = self.names[0].rstrip("/")
+        return prefix + "/" + "/".join(reversed(parts))
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        for index in range(len(self.names)):
+            yield self.path(index), self.sizes[index]
+
+    def items_under(self, prefixes: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """Yield ``(path, size)`` only for nodes at or below one of ``prefixes``.
+
+        Branches that can no longer reach a prefix are skipped without
+        building their paths.
+        """
+        prefixes = [prefix for prefix in prefixes if prefix]
+        if not prefixes or not self.names:
+            return
+
+        # Per node: None = unrelated, False = ancestor of a prefix, True = under one.
+        state: List[Optional[bool]] = [None] * len(self.names)
+        paths: List[Optional[str]] = [None] * len(self.names)
+        for index in range(len(self.names)):
+            parent = self.parents[index]
+            if parent >= 0 and state[parent] is None:
+                continue
+            path = self.names[0] if parent < 0 else paths[parent].rstrip("/") + "/" + self.names[index]
+            if parent >= 0 and state[parent]:
+                state[index] = True
+            elif any(_is_within(path, prefix) for prefix in prefixes):
+                state[index] = True
+            elif any(_is_within(prefix, path) for prefix in prefixes):
+                state[index] = False
+            else:
+                continue
+            paths[index] = path
+            if state[index]:
+                yield path, self.sizes[index]
+
+    def top(self, limit: Optional[int] = None) -> List["DirEntryView"]:
+        indices = range(len(self.names))
+        if limit is None:
+            ranked = sorted(indices, key=self.sizes.__getitem__, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, indices, key=self.sizes.__getitem__)
+        return [DirEntryView(self, index) for index in ranked]
+
+    def view(self, index: int) -> "DirEntryView":
+        return DirEntryView(self, index)
+
+
+class DirEntryView(Mapping):
+    """Read-only mapping with the keys of the historical du entry dicts."""
+
+    __slots__ = ("_tree", "_index")
+
+    def __init__(self, tree: DirTree, index: int):
+        self._tree = tree
+        self._index = index
+
+    def __getitem__(self, key: str):
+        tree, index = self._tree, self._index
+        if key == "size_bytes":
+            return tree.sizes[index]
+        if key == "size":
+            return format_size(tree.sizes[index])
+        if key == "path":
+            return tree.path(index)
+        if key == "root":
+            return tree.root
+        if key == "files":
+            return tree.file_counts[index]
+        if key == "ages" and tree.ages is not None:
+            return tree.ages.summary(index)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def _keys(self) -> Tuple[str, ...]:
+        return _VIEW_KEYS if self._tree.ages is None else _AGE_VIEW_KEYS
+
+    def to_dict(self) -> dict:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
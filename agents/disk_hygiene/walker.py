@@ -0,0 +1,438 @@
+"""Parallel, du-compatible directory size walker built on os.scandir.
+
+Mirrors ``du -k -x -d N``: every directory at depth <= N is reported with the
+size of its whole subtree, sizes come from ``st_blocks``, each hardlinked inode
+is counted once and (optionally) the walk never leaves the root's filesystem.
+The same walk can also bin file bytes by mtime/atime age (see ``ages``).
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+from .tree import DirTree
+
+if TYPE_CHECKING:
+    from .ages import AgeAccumulator, AgeHistograms
+    from .size_index import IndexedDir, SizeIndex
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+MAX_ERROR_SAMPLES = 20
+
+
+def entry_bytes(st: os.stat_result) -> int:
+    blocks = getattr(st, "st_blocks", None)
+    if blocks is None:
+        return st.st_size
+    return blocks * 512
+
+
+@dataclass
+class WalkResult:
+    root: str
+    depth: int
+    tree: Optional[DirTree] = None
+    dirs_scanned: int = 0
+    dirs_pending: int = 0
+    dirs_reused: int = 0
+    files_counted: int = 0
+    error_count: int = 0
+    errors: List[str] = field(default_factory=list)
+    complete: bool = True
+    elapsed: float = 0.0
+    records: Optional[list] = None
+
+    @property
+    def entries(self) -> List[Tuple[str, int]]:
+        """``(path, size_bytes)`` for every reported directory, parents first."""
+        return list(self.tree.items()) if self.tree is not None else []
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of discovered directories that were actually scanned."""
+        discovered = self.dirs_scanned + self.dirs_pending
+        return 1.0 if discovered == 0 else self.dirs_scanned / discovered
+
+
+class InodeSet:
+    """``(dev, ino)`` of hardlinked files already counted, shareable between walks.
+
+    Walks that share one set count each inode once across all of them, like
+    ``du`` given several paths at once.
+    """
+
+    __slots__ = ("_seen", "_lock")
+
+    def __init__(self) -> None:
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def first_link(self, st: os.stat_result) -> bool:
+        """True the first time ``st``'s inode is offered, False after that."""
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+
+class _Walk:
+    def __init__(
+        self,
+        root: str,
+        depth: int,
+        workers: int,
+        deadline: Optional[float],
+        one_filesystem: bool,
+        snapshot: Optional[Dict[str, "IndexedDir"]] = None,
+        collect_records: bool = False,
+        age_buckets: Optional[Sequence[int]] = None,
+        exclude: Optional[Collection[str]] = None,
+        reuse_after: float = float("-inf"),
+        inodes: Optional[InodeSet] = None,
+    ):
+        self.root = root
+        self.depth = depth
+        self.workers = max(1, workers)
+        self.deadline = deadline
+        self.one_filesystem = one_filesystem
+        self.exclude = frozenset(exclude or ())
+
+        self.tasks: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self.cond = threading.Condition()
+        self.pending = 0
+        self.stopped = False
+
+        self.lock = threading.Lock()
+        # Directories at depth <= N ("anchors"); deeper directories add their
+        # bytes to the nearest anchor above them.
+        self.tree = DirTree(root)
+        self.inodes = inodes if inodes is not None else InodeSet()
+
+        # Incremental mode: cached listings keyed by path, plus one record per
+        # visited directory so the index can be refreshed after the walk.
+        self.snapshot = snapshot
+        self.reuse_after = reuse_after
+        self.records: Optional[list] = [] if snapshot is not None or collect_records else None
+
+        self.dirs_scanned = 0
+        self.dirs_reused = 0
+        self.files_counted = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        self.root_dev = 0
+
+        # Age histograms need every file's timestamps, so they are only
+        # gathered (and NumPy only imported) when asked for.
+        self.age_buckets = tuple(age_buckets) if age_buckets else None
+        self.age_rows: Dict[int, object] = {}
+        self.now = time.time()
+        if self.age_buckets is not None:
+            import numpy as np
+
+            self.age_cutoffs = np.asarray(self.age_buckets, dtype=np.float64) * 86400
+
+    def run(self) -> WalkResult:
+        started = time.monotonic()
+        result = WalkResult(root=self.root, depth=self.depth)
+
+        try:
+            root_stat = os.lstat(self.root)
+        except OSError as exc:
+            result.error_count = 1
+            result.errors.append(str(exc))
+            result.elapsed = time.monotonic() - started
+            return result
+
+        if not os.path.isdir(self.root):
+            result.tree = DirTree(self.root)
+            result.tree.add(self.root, -1, entry_bytes(root_stat), 1)
+            if self.age_buckets is not None:
+                ages = self._new_accumulator()
+                ages.add(root_stat.st_mtime, root_stat.st_atime, entry_bytes(root_stat))
+                self.age_rows[0] = ages.histogram(self.now, self.age_cutoffs)
+                result.tree.ages = self._age_histograms(result.tree)
+            result.files_counted = 1
+            result.elapsed = time.monotonic() - started
+            return result
+
+        self.root_dev = root_stat.st_dev
+        root_anchor = self._new_anchor(self.root, -1)
+        self._enqueue((self.root, 0, root_anchor, root_stat))
+
+        threads = [
+            threading.Thread(target=self._worker, name=f"disk-walk-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        timed_out = False
+        with self.cond:
+            while self.pending:
+                remaining = None if self.deadline is None else self.deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    break
+                self.cond.wait(remaining)
+            self.stopped = True
+            pending = self.pending
+
+        for _ in threads:
+            self.tasks.put(None)
+        if not timed_out:
+            for thread in threads:
+                thread.join()
+
+        # Workers may still be inside a slow scandir after a timeout; snapshot
+        # under the lock and leave them to drain in the background.
+        with self.lock:
+            tree = self.tree.copy()
+            if self.age_buckets is not None:
+                tree.ages = self._age_histograms(tree)
+            result.dirs_scanned = self.dirs_scanned
+            result.dirs_reused = self.dirs_reused
+            result.files_counted = self.files_counted
+            result.error_count = self.error_count
+            result.errors = list(self.errors)
+
+        # Parents are always created before their children, so a single
+        # reverse pass rolls every subtree up into its ancestors.
+        tree.rollup()
+        if tree.ages is not None:
+            tree.ages.rollup(tree.parents)
+        result.tree = tree
+        result.dirs_pending = pending
+        result.complete = not timed_out
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def _new_accumulator(self) -> "AgeAccumulator":
+        from .ages import AgeAccumulator
+
+        return AgeAccumulator()
+
+    def _age_histograms(self, tree: DirTree) -> "AgeHistograms":
+        from .ages import AgeHistograms
+
+        return AgeHistograms.from_rows(self.age_buckets, self.now, len(tree), self.age_rows)
+
+    def _new_anchor(self, name: str, parent: int) -> int:
+        with self.lock:
+            return self.tree.add(name, parent)
+
+    def _enqueue(self, task: tuple) -> None:
+        with self.cond:
+            self.pending += 1
+        self.tasks.put(task)
+
+    def _finish_task(self) -> None:
+        with self.cond:
+            self.pending -= 1
+            if self.pending == 0:
+                self.cond.notify_all()
+
+    def _record_error(self, exc: OSError) -> None:
+        with self.lock:
+            self.error_count += 1
+            if len(self.errors) < MAX_ERROR_SAMPLES:
+                self.errors.append(str(exc))
+
+    def _worker(self) -> None:
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            try:
+                if not self.stopped:
+                    self._scan(*task)
+            finally:
+                self._finish_task()
+
+    def _descend(
+        self,
+        path: str,
+        name: str,
+        level: int,
+        anchor: int,
+        st: os.stat_result,
+    ) -> bool:
+        if self.one_filesystem and st.st_dev != self.root_dev:
+            return False
+        if path in self.exclude:
+            return False
+        child_level = level + 1
+        child_anchor = anchor
+        if child_level <= self.depth:
+            child_anchor = self._new_anchor(name, anchor)
+        self._enqueue((path, child_level, child_anchor, st))
+        return True
+
+    def _scan(self, path: str, level: int, anchor: int, dir_stat: os.stat_result) -> None:
+        if self.snapshot is not None:
+            cached = self.snapshot.get(path)
+            if cached is not None and cached.matches(dir_stat) and cached.scanned_at >= self.reuse_after:
+                self._reuse(path, level, anchor, cached)
+                return
+
+        local = entry_bytes(dir_stat)
+        files = 0
+        children: List[str] = []
+        ages = self._new_accumulator() if self.age_buckets is not None else None
+
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError as exc:
+                        self._record_error(exc)
+                        continue
+
+                    if is_dir:
+                        children.append(entry.name)
+                        self._descend(entry.path, entry.name, level, anchor, st)
+                        continue
+
+                    if st.st_nlink > 1 and not self.inodes.first_link(st):
+                        continue
+                    size = entry_bytes(st)
+                    local += size
+                    files += 1
+                    if ages is not None:
+                        ages.add(st.st_mtime, st.st_atime, size)
+        except OSError as exc:
+            self._record_error(exc)
+
+        if self.records is not None:
+            self.records.append((
+                path,
+                dir_stat.st_dev,
+                dir_stat.st_ino,
+                dir_stat.st_mtime_ns,
+                local,
+                files,
+                tuple(children),
+            ))
+
+        histogram = ages.histogram(self.now, self.age_cutoffs) if ages is not None else None
+        with self.lock:
+            self.tree.sizes[anchor] += local
+            self.tree.file_counts[anchor] += files
+            self.dirs_scanned += 1
+            self.files_counted += files
+            if histogram is not None:
+                existing = self.age_rows.get(anchor)
+                if existing is None:
+                    self.age_rows[anchor] = histogram
+                else:
+                    existing += histogram
+
+    def _reuse(self, path: str, level: int, anchor: int, cached: "IndexedDir") -> None:
+        # The directory's own entries are unchanged, so only its subdirectories
+        # need a stat to decide whether they can be reused in turn.
+        prefix = path.rstrip("/") + "/"
+        children: List[str] = []
+        for name in cached.children:
+            child_path = prefix + name
+            try:
+                st = os.lstat(child_path)
+            except OSError as exc:
+                self._record_error(exc)
+                continue
+            children.append(name)
+            self._descend(child_path, name, level, anchor, st)
+
+        if self.records is not None:
+            self.records.append((
+                path,
+                cached.dev,
+                cached.ino,
+                cached.mtime_ns,
+                cached.own_bytes,
+                cached.files,
+                tuple(children),
+            ))
+
+        with self.lock:
+            self.tree.sizes[anchor] += cached.own_bytes
+            self.tree.file_counts[anchor] += cached.files
+            self.dirs_scanned += 1
+            self.dirs_reused += 1
+            self.files_counted += cached.files
+
+
+def walk_tree(
+    root: Union[str, Path],
+    depth: int,
+    *,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    one_filesystem: bool = True,
+    index: Optional["SizeIndex"] = None,
+    collect_records: bool = False,
+    age_buckets: Optional[Sequence[int]] = None,
+    exclude: Optional[Collection[str]] = None,
+    inodes: Optional[InodeSet] = None,
+) -> WalkResult:
+    """Measure ``root`` like ``du -x -d depth``, returning partial data on timeout.
+
+    ``deadline`` is an absolute ``time.monotonic()`` value; ``timeout`` is a
+    convenience relative to now. The earlier of the two wins.
+
+    With an ``index`` the walk is incremental: directories whose inode and
+    mtime match the index are not re-listed, and the index is refreshed with
+    whatever the walk observed. Files modified in place (which does not touch
+    the directory mtime) keep their previously indexed size for at most the
+    index's ``max_age``; older listings are taken again.
+
+    ``collect_records`` attaches one ``(path, dev, ino, mtime_ns, own_bytes,
+    files, children)`` record per visited directory to the result.
+
+    ``age_buckets`` (ascending day edges) attaches ``tree.ages`` histograms of
+    file bytes by mtime and atime age. Timestamps of unchanged files can move
+    without touching the directory, so such walks list every directory and
+    only use the index to refresh it.
+
+    Directories listed in ``exclude`` (exact paths as the walk would build
+    them) are not entered and contribute nothing to their ancestors.
+
+    ``inodes`` shares hardlink bookkeeping with other walks, so a file linked
+    into several of them is counted by only one.
+    """
+    if timeout is not None:
+        timeout_deadline = time.monotonic() + timeout
+        deadline = timeout_deadline if deadline is None else min(deadline, timeout_deadline)
+
+    root_str = str(root)
+    snapshot = index.snapshot(root_str) if index is not None else None
+    walk = _Walk(
+        root_str,
+        max(0, depth),
+        max_workers or DEFAULT_WORKERS,
+        deadline,
+        one_filesystem,
+        None if age_buckets else snapshot,
+        collect_records or (index is not None and bool(age_buckets)),
+        age_buckets,
+        exclude,
+        index.reuse_after() if index is not None else float("-inf"),
+        inodes,
+    )
+    result = walk.run()
+    if collect_records:
+        result.records = list(walk.records or ())
+
+    if index is not None and walk.records is not None:
+        index.update(root_str, list(walk.records), snapshot or {}, result.complete, walk.exclude)
+
+    return result
@@ -0,0 +1,492 @@
+"""Inotify-backed live disk-usage tree (Linux only).
+
+``DiskWatcher`` walks each root once, then keeps a ``LiveTree`` of per-directory
+sizes current from inotify events. Events only mark directories dirty; after a
+short quiet period every dirty directory is re-listed once, so a burst of
+writes into one directory costs a single ``scandir``. A queue overflow falls
+back to re-walking the affected root.
+
+Hardlinked files are counted once per directory listing rather than once per
+inode, so a live tree can slightly overstate trees full of hardlinks.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from .tree import DirTree
+from .walker import entry_bytes, walk_tree
+
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+    | IN_EXCL_UNLINK
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _load_libc() -> ctypes.CDLL:
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def is_supported() -> bool:
+    try:
+        _load_libc()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+def _prefix(path: str) -> str:
+    return path.rstrip("/") + "/"
+
+
+def _depth(path: str) -> int:
+    return path.rstrip("/").count("/")
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        self.libc = _load_libc()
+        fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self.fd = fd
+
+    def add_watch(self, path: str) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float) -> List[Tuple[int, int, str]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: List[Tuple[int, int, str]] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Node:
+    __slots__ = ("own", "total", "children", "parent")
+
+    def __init__(self, own: int, children: Set[str]):
+        self.own = own
+        self.total = own
+        self.children = children
+        self.parent: Optional[str] = None
+
+
+class LiveTree:
+    def __init__(self, root: str):
+        self.root = root
+        self.nodes: Dict[str, _Node] = {}
+        self.lock = threading.RLock()
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.nodes
+
+    def graft(self, top: str, records: Iterable[tuple]) -> List[str]:
+        """Insert a freshly walked subtree, replacing any previous copy of it."""
+        new: Dict[str, _Node] = {
+            path: _Node(own, set(children))
+            for path, _, _, _, own, _, children in records
+        }
+        for path, node in new.items():
+            prefix = _prefix(path)
+            node.children = {name for name in node.children if prefix + name in new}
+            for name in node.children:
+                new[prefix + name].parent = path
+        for path in sorted(new, key=_depth, reverse=True):
+            node = new[path]
+            if node.parent is not None:
+                new[node.parent].total += node.total
+
+        with self.lock:
+            self.prune(top)
+            top_node = new.get(top)
+            if top_node is None:
+                return []
+            self.nodes.update(new)
+            parent = os.path.dirname(top.rstrip("/"))
+            if top != self.root and parent in self.nodes:
+                top_node.parent = parent
+                self.nodes[parent].children.add(os.path.basename(top.rstrip("/")))
+                self._propagate(parent, top_node.total)
+        return list(new)
+
+    def prune(self, path: str) -> List[str]:
+        with self.lock:
+            node = self.nodes.get(path)
+            if node is None:
+                return []
+
+            removed: List[str] = []
+            stack = [path]
+            while stack:
+                current = stack.pop()
+                current_node = self.nodes.pop(current, None)
+                if current_node is None:
+                    continue
+                removed.append(current)
+                prefix = _prefix(current)
+                stack.extend(prefix + name for name in current_node.children)
+
+            if node.parent is not None and node.parent in self.nodes:
+                self.nodes[node.parent].children.discard(os.path.basename(path.rstrip("/")))
+                self._propagate(node.parent, -node.total)
+            return removed
+
+    def set_own(self, path: str, own: int) -> None:
+        with self.lock:
+            node = self.nodes.get(path)
+            if node is None:
+                return
+            delta = own - node.own
+            node.own = own
+            if delta:
+                self._propagate(path, delta)
+
+    def children_of(self, path: str) -> Set[str]:
+        with self.lock:
+            node = self.nodes.get(path)
+            return set(node.children) if node is not None else set()
+
+    def size_of(self, path: str) -> Optional[int]:
+        with self.lock:
+            node = self.nodes.get(path)
+            return node.total if node is not None else None
+
+    def to_dir_tree(self, depth: int, exclude: Collection[str] = ()) -> DirTree:
+        """Snapshot every directory down to ``depth`` as a compact ``DirTree``.
+
+        As in ``walk_tree``, directories in ``exclude`` are left out and their
+        bytes are taken off every ancestor.
+        """
+        tree = DirTree(self.root)
+        with self.lock:
+            if self.root not in self.nodes:
+                return tree
+            excluded = {path for path in exclude if path != self.root and path in self.nodes}
+            removed: Dict[str, int] = {}
+            for path in excluded:
+                ancestors: List[str] = []
+                ancestor = self.nodes[path].parent
+                while ancestor is not None and ancestor not in excluded:
+                    ancestors.append(ancestor)
+                    ancestor = self.nodes[ancestor].parent
+                # One inside another excluded directory went with that one.
+                if ancestor is None:
+                    for ancestor in ancestors:
+                        removed[ancestor] = removed.get(ancestor, 0) + self.nodes[path].total
+
+            stack = [(self.root, self.root, -1, 0)]
+            while stack:
+                path, name, parent, level = stack.pop()
+                node = self.nodes[path]
+                index = tree.add(name, parent, node.total - removed.get(path, 0))
+                if level < depth:
+                    prefix = _prefix(path)
+                    stack.extend(
+                        (prefix + child, child, index, level + 1)
+                        for child in node.children
+                        if prefix + child not in excluded
+                    )
+        return tree
+
+    def _propagate(self, path: Optional[str], delta: int) -> None:
+        while path is not None:
+            node = self.nodes[path]
+            node.total += delta
+            path = node.parent
+
+
+class DiskWatcher:
+    def __init__(
+        self,
+        roots: Iterable[str],
+        *,
+        one_filesystem: bool = True,
+        batch_interval: float = 1.0,
+        max_workers: Optional[int] = None,
+        on_update: Optional[Callable[["DiskWatcher"], None]] = None,
+    ):
+        self.roots = [str(root) for root in roots]
+        self.one_filesystem = one_filesystem
+        self.batch_interval = batch_interval
+        self.max_workers = max_workers
+        self.on_update = on_update
+
+        self.trees: Dict[str, LiveTree] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._root_dev: Dict[str, int] = {}
+        self._wd_to_path: Dict[int, str] = {}
+        self._path_to_wd: Dict[str, int] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "DiskWatcher":
+        self._inotify = _Inotify()
+        for root in self.roots:
+            self.stats[root] = {"overflows": 0, "rescans": 0, "watch_errors": 0, "batches": 0}
+            self._build_root(root)
+        self._thread = threading.Thread(target=self._run, name="disk-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.batch_interval * 2 + 1)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def tree_for(self, path: str) -> Optional[LiveTree]:
+        best: Optional[LiveTree] = None
+        for root, tree in self.trees.items():
+            if path == root or path.startswith(_prefix(root)):
+                if best is None or len(root) > len(best.root):
+                    best = tree
+        return best
+
+    def size_of(self, path: str) -> Optional[int]:
+        tree = self.tree_for(path)
+        return tree.size_of(path) if tree is not None else None
+
+    def dir_tree(self, root: str, depth: int, exclude: Collection[str] = ()) -> Optional[DirTree]:
+        tree = self.trees.get(root)
+        if tree is None or not self.running:
+            return None
+        return tree.to_dir_tree(depth, exclude)
+
+    def _walk(self, path: str):
+        return walk_tree(
+            path,
+            0,
+            max_workers=self.max_workers,
+            one_filesystem=self.one_filesystem,
+            collect_records=True,
+        )
+
+    def _build_root(self, root: str) -> None:
+        # The replacement is built off to the side and swapped in complete, so
+        # a concurrent scan keeps reading the previous tree during a rescan
+        # (and gets None, falling back to a disk walk, during the first build).
+        previous = self.trees.get(root)
+        tree = LiveTree(root)
+        try:
+            self._root_dev[root] = os.lstat(root).st_dev
+        except OSError:
+            self.trees[root] = tree
+            if previous is not None:
+                self._unwatch(previous.prune(root))
+            return
+
+        # Watch before walking so changes made during the walk are not lost.
+        self._watch([root])
+        result = self._walk(root)
+        walked = tree.graft(root, result.records or ())
+        self._watch(walked)
+        self.trees[root] = tree
+        if previous is not None:
+            # Keep watches on directories that are still there.
+            kept = set(walked)
+            self._unwatch(path for path in previous.prune(root) if path not in kept)
+
+    def _watch(self, paths: Iterable[str]) -> None:
+        assert self._inotify is not None
+        for path in paths:
+            if path in self._path_to_wd:
+                continue
+            try:
+                wd = self._inotify.add_watch(path)
+            except OSError:
+                # By root rather than tree: a root being built has no tree yet.
+                roots = [root for root in self.stats if path == root or path.startswith(_prefix(root))]
+                if roots:
+                    self.stats[max(roots, key=len)]["watch_errors"] += 1
+                continue
+            self._wd_to_path[wd] = path
+            self._path_to_wd[path] = wd
+
+    def _unwatch(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            wd = self._path_to_wd.pop(path, None)
+            if wd is None:
+                continue
+            if self._wd_to_path.get(wd) == path:
+                del self._wd_to_path[wd]
+                if self._inotify is not None:
+                    self._inotify.rm_watch(wd)
+
+    def _run(self) -> None:
+        dirty: Set[str] = set()
+        rescan: Set[str] = set()
+        batch_started = 0.0
+
+        while not self._stop.is_set():
+            try:
+                events = self._inotify.read_events(self.batch_interval) if self._inotify else []
+            except OSError:
+                break
+
+            for wd, mask, _ in events:
+                if mask & IN_Q_OVERFLOW:
+                    rescan.update(self.roots)
+                    for root in self.roots:
+                        self.stats[root]["overflows"] += 1
+                    continue
+                path = self._wd_to_path.get(wd)
+                if path is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._wd_to_path.pop(wd, None)
+                    if self._path_to_wd.get(path) == wd:
+                        del self._path_to_wd[path]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    dirty.add(os.path.dirname(path.rstrip("/")))
+                    continue
+                dirty.add(path)
+
+            if (dirty or rescan) and not batch_started:
+                batch_started = time.monotonic()
+
+            quiet = not events
+            if batch_started and (quiet or time.monotonic() - batch_started >= self.batch_interval):
+                try:
+                    self._apply(dirty, rescan)
+                finally:
+                    dirty, rescan, batch_started = set(), set(), 0.0
+                if self.on_update is not None:
+                    try:
+                        self.on_update(self)
+                    except Exception:
+                        pass
+
+    def _apply(self, dirty: Set[str], rescan: Set[str]) -> None:
+        for root in rescan:
+            self.stats[root]["rescans"] += 1
+            self._build_root(root)
+        dirty = {path for path in dirty if not any(path == root or path.startswith(_prefix(root)) for root in rescan)}
+
+        for tree in self.trees.values():
+            paths = [path for path in dirty if path in tree]
+            if not paths:
+                continue
+            self.stats[tree.root]["batches"] += 1
+            self._reconcile(tree, sorted(paths, key=_depth))
+
+    def _reconcile(self, tree: LiveTree, paths: List[str]) -> None:
+        removals: List[str] = []
+        additions: List[str] = []
+        measured: Dict[str, int] = {}
+        root_dev = self._root_dev.get(tree.root)
+
+        for path in paths:
+            try:
+                own, names = self._measure_directory(path, root_dev)
+            except FileNotFoundError:
+                removals.append(path)
+                continue
+            except OSError:
+                continue
+            known = tree.children_of(path)
+            prefix = _prefix(path)
+            removals.extend(prefix + name for name in known - names)
+            additions.extend(prefix + name for name in names - known)
+            measured[path] = own
+
+        # Removals first: a directory moved within the tree keeps its inotify
+        # watch descriptor, and re-adding it must not be undone by the prune.
+        for path in removals:
+            self._unwatch(tree.prune(path))
+        for path, own in measured.items():
+            tree.set_own(path, own)
+        for path in additions:
+            result = self._walk(path)
+            self._watch(tree.graft(path, result.records or ()))
+
+    def _measure_directory(self, path: str, root_dev: Optional[int]) -> Tuple[int, Set[str]]:
+        own = entry_bytes(os.lstat(path))
+        names: Set[str] = set()
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.one_filesystem and root_dev is not None and st.st_dev != root_dev:
+                            continue
+                        names.add(entry.name)
+                        continue
+                except OSError:
+                    continue
+                own += entry_bytes(st)
+        return own, names
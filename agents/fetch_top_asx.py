@@ -1,7 +1,20 @@
-from agents.scrape_asx_tickers import scrape_asx_tickers
-from agents.rank_asx_tickers import rank_tickers_by_volume
+try:
+    from agentic_tools.agents.scrape_asx_tickers import scrape_asx_tickers, scrape_asx_tickers_async
+    from agentic_tools.agents.rank_asx_tickers import (
+        DEFAULT_CONCURRENCY,
+        rank_tickers_by_volume,
+        rank_tickers_by_volume_async,
+    )
+except ModuleNotFoundError:
+    from agents.scrape_asx_tickers import scrape_asx_tickers, scrape_asx_tickers_async
+    from agents.rank_asx_tickers import DEFAULT_CONCURRENCY, rank_tickers_by_volume, rank_tickers_by_volume_async
 
 def fetch_top_asx(limit=10):
     tickers = scrape_asx_tickers()
     top_tickers = rank_tickers_by_volume(tickers, limit=limit)
-    return top_tickers
\ No newline at end of file
+    return top_tickers
+
+
+async def fetch_top_asx_async(limit=10, concurrency=DEFAULT_CONCURRENCY):
+    tickers = await scrape_asx_tickers_async()
+    return await rank_tickers_by_volume_async(tickers, limit=limit, concurrency=concurrency)
@@ -1,18 +1,45 @@
-import yfinance as yf
+import asyncio
+
+try:
+    from agentic_tools.workspace_logger.spans import span
+except ModuleNotFoundError:
+    from workspace_logger.spans import span
+
+# Volume lookups in flight at once in the async variant.
+DEFAULT_CONCURRENCY = 8
 
-def rank_tickers_by_volume(tickers, limit=10):
-    ranked = []
 
-    for ticker in tickers:
-        try:
-            data = yf.Ticker(ticker).history(period="1d")
-            if data.empty:
-                continue
+def _latest_volume(ticker):
+    import yfinance as yf
 
-            volume = data['Volume'].iloc[-1]
-            ranked.append((ticker, volume))
-        except Exception:
-            continue
+    try:
+        data = yf.Ticker(ticker).history(period="1d")
+        if data.empty:
+            return None
+        return data['Volume'].iloc[-1]
+    except Exception:
+        return None
 
+
+def _top_by_volume(volumes, limit):
+    ranked = [(ticker, volume) for ticker, volume in volumes if volume is not None]
     ranked.sort(key=lambda x: x[1], reverse=True)
-    return [r[0] for r in ranked[:limit]]
\ No newline at end of file
+    return [r[0] for r in ranked[:limit]]
+
+
+@span("asx.rank_by_volume")
+def rank_tickers_by_volume(tickers, limit=10):
+    return _top_by_volume(((ticker, _latest_volume(ticker)) for ticker in tickers), limit)
+
+
+@span("asx.rank_by_volume_async")
+async def rank_tickers_by_volume_async(tickers, limit=10, concurrency=DEFAULT_CONCURRENCY):
+    # yfinance is blocking; overlap the lookups on threads, a bounded number at a time.
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def volume(ticker):
+        async with semaphore:
+            return await asyncio.to_thread(_latest_volume, ticker)
+
+    volumes = await asyncio.gather(*(volume(ticker) for ticker in tickers))
+    return _top_by_volume(zip(tickers, volumes), limit)
@@ -1,7 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+
 
 def scrape_asx_tickers():
+    import requests
+    from bs4 import BeautifulSoup
+
     url = "https://www.marketindex.com.au/asx-listed-companies"
     response = requests.get(url)
     soup = BeautifulSoup(response.text, "html.parser")
@@ -22,4 +25,10 @@ def scrape_asx_tickers():
             tickers.append(ticker)
 
     print(f"[INFO] Scraped {len(tickers)} ASX tickers.")
-    return tickers
\ No newline at end of file
+    return tickers
+
+
+async def scrape_asx_tickers_async():
+    # One request, so nothing to overlap within the agent; this keeps the
+    # fetch and parse off the event loop so other agents keep running.
+    return await asyncio.to_thread(scrape_asx_tickers)
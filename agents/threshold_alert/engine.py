@@ -0,0 +1,200 @@
+"""Shared-walk evaluation of disk-usage thresholds.
+
+All threshold paths are measured together: each distinct path is walked once,
+concurrently, with every other threshold path below it excluded, and nested
+totals are then added into their ancestors. ``/Users/dhb`` and
+``/Users/dhb/Downloads`` therefore cost one pass over the bytes, not two, and
+limits are compared in exact bytes rather than re-parsed ``du -h`` output.
+The walks share one set of counted hardlinks, so a file linked into both a
+path and a nested one is only added once.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from agentic_tools.agents.disk_hygiene.walker import DEFAULT_WORKERS, InodeSet, walk_tree
+
+if TYPE_CHECKING:
+    from agentic_tools.agents.disk_hygiene.size_index import SizeIndex
+
+GB = 1024 ** 3
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass
+class ThresholdResult:
+    path: str
+    limit_bytes: int
+    used_bytes: Optional[int] = None
+    complete: bool = True
+    source: str = "walk"
+    error: Optional[str] = None
+
+    @property
+    def exceeded(self) -> bool:
+        return self.used_bytes is not None and self.used_bytes > self.limit_bytes
+
+    @property
+    def used_gb(self) -> float:
+        return (self.used_bytes or 0) / GB
+
+    @property
+    def limit_gb(self) -> float:
+        return self.limit_bytes / GB
+
+
+def parse_threshold_entries(thresholds) -> Tuple[List[Tuple[str, float]], List[object]]:
+    """Split a thresholds config into ``(path, limit_gb)`` pairs and malformed entries.
+
+    Accepts the ``{path: limit}`` mapping of ``thresholds.yaml`` as well as a
+    list of ``{"path": ..., "limit": ...}`` dicts.
+    """
+    valid: List[Tuple[str, float]] = []
+    malformed: List[object] = []
+    entries = thresholds.items() if isinstance(thresholds, dict) else thresholds
+    for entry in entries:
+        if isinstance(entry, tuple) and len(entry) == 2:
+            path, limit = entry
+        elif isinstance(entry, dict) and "path" in entry and "limit" in entry:
+            path, limit = entry["path"], entry["limit"]
+        else:
+            malformed.append(entry)
+            continue
+        if not isinstance(limit, (int, float)) or isinstance(limit, bool):
+            malformed.append(entry)
+            continue
+        valid.append((str(path), float(limit)))
+    return valid, malformed
+
+
+def _normalize(path: str) -> str:
+    return os.path.realpath(os.path.expanduser(path))
+
+
+def _nearest_ancestors(paths: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Map each path to the closest other path in the set that contains it."""
+    path_set = set(paths)
+    parents: Dict[str, Optional[str]] = {}
+    for path in path_set:
+        parent, current = None, path
+        while current not in ("/", ""):
+            current = os.path.dirname(current)
+            if current in path_set:
+                parent = current
+                break
+        parents[path] = parent
+    return parents
+
+
+def measure_paths(
+    paths: Iterable[str],
+    *,
+    live=None,
+    index: Optional["SizeIndex"] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> Dict[str, Tuple[Optional[int], bool, str, Optional[str]]]:
+    """Measure every path once, returning ``{path: (bytes, complete, source, error)}``.
+
+    Keys are the normalized (``realpath``) forms of ``paths``. Like ``du -sx``,
+    walks stay on each path's filesystem. ``live`` (anything with ``size_of``,
+    such as a ``DiskWatcher``) answers for the paths it already tracks.
+    With a size ``index`` the walks reuse (and refresh) the listings a disk
+    scan recorded; if the index fails they fall back to full walks.
+    """
+    unique = sorted({_normalize(path) for path in paths})
+    parents = _nearest_ancestors(unique)
+    children: Dict[str, List[str]] = {path: [] for path in unique}
+    for path, parent in parents.items():
+        if parent is not None:
+            children[parent].append(path)
+
+    measured: Dict[str, Tuple[Optional[int], bool, str, Optional[str]]] = {}
+    to_walk: List[str] = []
+    for path in unique:
+        size = live.size_of(path) if live is not None else None
+        if size is not None:
+            # A live total already includes everything nested below it.
+            measured[path] = (size, True, "live", None)
+        else:
+            to_walk.append(path)
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    total_workers = max_workers or DEFAULT_WORKERS
+    exclusive: Dict[str, Tuple[Optional[int], bool, Optional[str]]] = {}
+    inodes = InodeSet()
+
+    def walk(path: str) -> Tuple[Optional[int], bool, Optional[str]]:
+        if not os.path.exists(path):
+            return None, False, "path does not exist"
+        options = dict(
+            max_workers=max(2, total_workers // max(1, len(to_walk))),
+            deadline=deadline,
+            exclude=children[path],
+            inodes=inodes,
+        )
+        try:
+            result = walk_tree(path, 0, index=index, **options)
+        except sqlite3.Error:
+            if index is None:
+                raise
+            result = walk_tree(path, 0, **options)
+        if result.tree is None or not len(result.tree):
+            return None, False, "; ".join(result.errors[:1]) or "walk failed"
+        return result.tree.sizes[0], result.complete, None
+
+    if to_walk:
+        with ThreadPoolExecutor(max_workers=len(to_walk), thread_name_prefix="threshold-walk") as pool:
+            for path, outcome in zip(to_walk, pool.map(walk, to_walk)):
+                exclusive[path] = outcome
+
+    # Deepest paths first, so each walked path adds its already complete
+    # nested totals before handing its own total to its ancestor.
+    for path in sorted(to_walk, key=lambda item: item.rstrip("/").count("/"), reverse=True):
+        size, complete, error = exclusive[path]
+        if size is not None:
+            for child in children[path]:
+                child_size, child_complete, _, _ = measured[child]
+                size += child_size or 0
+                complete = complete and child_complete
+        measured[path] = (size, complete, "walk", error)
+
+    return measured
+
+
+def evaluate_thresholds(
+    thresholds,
+    *,
+    live=None,
+    index: Optional["SizeIndex"] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> Tuple[List[ThresholdResult], List[object]]:
+    """Measure all threshold paths in one shared pass and compare exact bytes."""
+    entries, malformed = parse_threshold_entries(thresholds)
+    measured = measure_paths(
+        [path for path, _ in entries],
+        live=live,
+        index=index,
+        max_workers=max_workers,
+        timeout=timeout,
+    )
+
+    results = []
+    for path, limit_gb in entries:
+        size, complete, source, error = measured[_normalize(path)]
+        results.append(ThresholdResult(
+            path=path,
+            limit_bytes=int(limit_gb * GB),
+            used_bytes=size,
+            complete=complete,
+            source=source,
+            error=error,
+        ))
+    return results, malformed
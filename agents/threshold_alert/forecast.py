@@ -0,0 +1,126 @@
+"""Vectorized time-to-breach forecasting over many size series at once.
+
+Series of different lengths are packed into one ``(paths, samples)`` matrix
+with a validity mask, so a single set of NumPy operations fits every path:
+
+* ``linear``: least-squares slope over the window.
+* ``ewma``: exponentially weighted average of the per-interval growth rate,
+  which follows recent changes in trend more quickly.
+
+A path is forecast to breach when its growth is positive; the breach time is
+its remaining headroom divided by that growth.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORECAST_METHODS = ("linear", "ewma")
+DEFAULT_EWMA_ALPHA = 0.3
+MIN_SAMPLES = 3
+
+
+class Forecast(NamedTuple):
+    path: str
+    method: str
+    current_bytes: int
+    limit_bytes: int
+    growth_bytes_per_s: float
+    seconds_to_breach: Optional[float]
+
+    def breaches_within(self, horizon_seconds: float) -> bool:
+        return self.seconds_to_breach is not None and self.seconds_to_breach <= horizon_seconds
+
+
+def _pack(series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    width = max(len(times) for times, _ in series)
+    times = np.zeros((len(series), width))
+    sizes = np.zeros((len(series), width))
+    mask = np.zeros((len(series), width), dtype=bool)
+    for row, (row_times, row_sizes) in enumerate(series):
+        count = len(row_times)
+        times[row, :count] = row_times
+        sizes[row, :count] = row_sizes
+        mask[row, :count] = True
+    return times, sizes, mask
+
+
+def linear_growth(times: np.ndarray, sizes: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Least-squares slope (bytes/second) of each masked row."""
+    weights = mask.astype(np.float64)
+    counts = weights.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    mean_t = (times * weights).sum(axis=1) / safe_counts
+    mean_y = (sizes * weights).sum(axis=1) / safe_counts
+    dt = (times - mean_t[:, None]) * weights
+    dy = (sizes - mean_y[:, None]) * weights
+    variance = (dt * dt).sum(axis=1)
+    slope = np.divide((dt * dy).sum(axis=1), variance, out=np.zeros(len(times)), where=variance > 0)
+    return slope
+
+
+def ewma_growth(times: np.ndarray, sizes: np.ndarray, mask: np.ndarray, alpha: float = DEFAULT_EWMA_ALPHA) -> np.ndarray:
+    """EWMA of successive growth rates (bytes/second) of each masked row."""
+    elapsed = np.diff(times, axis=1)
+    valid = mask[:, 1:] & mask[:, :-1] & (elapsed > 0)
+    rates = np.divide(np.diff(sizes, axis=1), elapsed, out=np.zeros_like(elapsed), where=valid)
+
+    trend = np.zeros(len(times))
+    seeded = np.zeros(len(times), dtype=bool)
+    # One step per sample column, each applied to every path at once.
+    for column in range(rates.shape[1]):
+        step = valid[:, column]
+        first = step & ~seeded
+        update = step & seeded
+        trend[first] = rates[first, column]
+        trend[update] = alpha * rates[update, column] + (1 - alpha) * trend[update]
+        seeded |= step
+    return trend
+
+
+def forecast_breaches(
+    series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    limits: Dict[str, int],
+    method: str = "linear",
+    alpha: float = DEFAULT_EWMA_ALPHA,
+    min_samples: int = MIN_SAMPLES,
+) -> List[Forecast]:
+    """Forecast every path in ``limits`` that has at least ``min_samples`` samples."""
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"method must be one of {FORECAST_METHODS}, not {method!r}")
+
+    paths = [path for path in limits if path in series and len(series[path][0]) >= min_samples]
+    if not paths:
+        return []
+
+    times, sizes, mask = _pack([series[path] for path in paths])
+    # Re-base timestamps per row to keep the least-squares sums well conditioned.
+    times = np.where(mask, times - times[:, :1], 0.0)
+    if method == "linear":
+        growth = linear_growth(times, sizes, mask)
+    else:
+        growth = ewma_growth(times, sizes, mask, alpha)
+
+    last = mask.sum(axis=1) - 1
+    current = sizes[np.arange(len(paths)), last]
+    limit = np.asarray([limits[path] for path in paths], dtype=np.float64)
+    headroom = limit - current
+    seconds = np.where(
+        headroom <= 0,
+        0.0,
+        np.divide(headroom, growth, out=np.full(len(paths), np.inf), where=growth > 0),
+    )
+
+    return [
+        Forecast(
+            path=path,
+            method=method,
+            current_bytes=int(current[row]),
+            limit_bytes=int(limit[row]),
+            growth_bytes_per_s=float(growth[row]),
+            seconds_to_breach=float(seconds[row]) if np.isfinite(seconds[row]) else None,
+        )
+        for row, path in enumerate(paths)
+    ]
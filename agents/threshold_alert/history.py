@@ -0,0 +1,117 @@
+"""Local time-series store of measured path sizes.
+
+One SQLite table holds ``(path_id, ts, bytes)`` samples clustered by path, so
+reading a path's recent history is a single index range scan. Paths are
+interned into a small lookup table to keep each sample to three integers.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+DEFAULT_HISTORY_PATH = Path(
+    os.environ.get(
+        "AGENTIC_SIZE_HISTORY",
+        str(Path.home() / ".cache" / "agentic_tools" / "size_history.sqlite3"),
+    )
+).expanduser()
+
+DEFAULT_RETENTION_DAYS = 90
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS paths (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS samples (
+        path_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        bytes INTEGER NOT NULL,
+        PRIMARY KEY (path_id, ts)
+    ) WITHOUT ROWID
+    """,
+)
+
+# (timestamps in seconds, sizes in bytes), both sorted by time.
+Series = Tuple[np.ndarray, np.ndarray]
+
+
+class SizeHistory:
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+    ):
+        self.path = Path(path).expanduser() if path else DEFAULT_HISTORY_PATH
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._path_ids: Dict[str, int] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _path_id(self, conn: sqlite3.Connection, path: str) -> int:
+        path_id = self._path_ids.get(path)
+        if path_id is None:
+            conn.execute("INSERT OR IGNORE INTO paths (path) VALUES (?)", (path,))
+            path_id = conn.execute("SELECT id FROM paths WHERE path = ?", (path,)).fetchone()[0]
+            self._path_ids[path] = path_id
+        return path_id
+
+    def record(self, samples: Iterable[Tuple[str, float, int]]) -> int:
+        """Append ``(path, timestamp, bytes)`` samples and drop ones past retention."""
+        samples = list(samples)
+        if not samples:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                rows = [(self._path_id(conn, path), int(ts), int(size)) for path, ts, size in samples]
+                conn.executemany("INSERT OR REPLACE INTO samples (path_id, ts, bytes) VALUES (?, ?, ?)", rows)
+                if self.retention_days:
+                    cutoff = int(time.time() - self.retention_days * 86400)
+                    conn.execute("DELETE FROM samples WHERE ts < ?", (cutoff,))
+        return len(samples)
+
+    def series(self, paths: Iterable[str], since: Optional[float] = None) -> Dict[str, Series]:
+        """Samples per path (oldest first), optionally only those at or after ``since``."""
+        since_ts = int(since) if since is not None else 0
+        result: Dict[str, Series] = {}
+        with self._lock:
+            conn = self._connection()
+            for path in paths:
+                rows = conn.execute(
+                    "SELECT s.ts, s.bytes FROM samples s JOIN paths p ON p.id = s.path_id "
+                    "WHERE p.path = ? AND s.ts >= ? ORDER BY s.ts",
+                    (path, since_ts),
+                ).fetchall()
+                if rows:
+                    data = np.asarray(rows, dtype=np.float64)
+                    result[path] = (data[:, 0], data[:, 1])
+        return result
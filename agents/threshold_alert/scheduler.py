@@ -0,0 +1,128 @@
+"""Adaptive per-path check schedule for threshold evaluation.
+
+Each path gets its own next-check time. The interval shrinks as the path nears
+its limit or grows faster, and it never exceeds ``max_staleness``, so hundreds
+of roomy, stable paths can share a tight run interval with a few hot ones
+without every run walking all of them. State is kept in a small JSON file
+between runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from agentic_tools.agents.threshold_alert.engine import ThresholdResult
+
+DEFAULT_SCHEDULE_PATH = Path(
+    os.environ.get(
+        "AGENTIC_THRESHOLD_SCHEDULE",
+        str(Path.home() / ".cache" / "agentic_tools" / "threshold_schedule.json"),
+    )
+).expanduser()
+
+DEFAULT_MIN_INTERVAL = 60.0
+DEFAULT_MAX_STALENESS = 6 * 3600.0
+# Check again after this fraction of the projected time until the limit is hit.
+TIME_TO_LIMIT_SAFETY = 0.25
+# Weight of the newest growth sample in the smoothed growth rate.
+GROWTH_SMOOTHING = 0.5
+
+
+@dataclass
+class PathSchedule:
+    last_checked: float
+    next_check: float
+    used_bytes: int
+    limit_bytes: int
+    growth_bytes_per_s: float = 0.0
+
+
+class AdaptiveScheduler:
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+    ):
+        self.path = Path(path).expanduser() if path is not None else DEFAULT_SCHEDULE_PATH
+        self.min_interval = min_interval
+        self.max_staleness = max(min_interval, max_staleness)
+        self.paths: Dict[str, PathSchedule] = {}
+        self._load()
+
+    def due(self, limits: Dict[str, int], now: Optional[float] = None) -> List[str]:
+        """Paths (keys of ``{path: limit_bytes}``) that need checking now.
+
+        A path is due when it was never checked, its limit changed, its next
+        check time has passed or it is older than ``max_staleness``.
+        """
+        now = time.time() if now is None else now
+        due: List[str] = []
+        for path, limit_bytes in limits.items():
+            entry = self.paths.get(path)
+            if (
+                entry is None
+                or entry.limit_bytes != limit_bytes
+                or now >= min(entry.next_check, entry.last_checked + self.max_staleness)
+            ):
+                due.append(path)
+        return due
+
+    def record(self, result: ThresholdResult, now: Optional[float] = None) -> Optional[PathSchedule]:
+        """Fold a fresh measurement into the path's growth rate and schedule its next check."""
+        now = time.time() if now is None else now
+        if result.used_bytes is None or not result.complete:
+            # No trustworthy size: retry as soon as allowed.
+            previous = self.paths.get(result.path)
+            if previous is not None:
+                previous.next_check = now + self.min_interval
+            return previous
+
+        growth = 0.0
+        previous = self.paths.get(result.path)
+        if previous is not None and now > previous.last_checked:
+            sample = (result.used_bytes - previous.used_bytes) / (now - previous.last_checked)
+            growth = GROWTH_SMOOTHING * sample + (1 - GROWTH_SMOOTHING) * previous.growth_bytes_per_s
+
+        entry = PathSchedule(
+            last_checked=now,
+            next_check=now + self.interval_for(result.used_bytes, result.limit_bytes, growth),
+            used_bytes=result.used_bytes,
+            limit_bytes=result.limit_bytes,
+            growth_bytes_per_s=growth,
+        )
+        self.paths[result.path] = entry
+        return entry
+
+    def interval_for(self, used_bytes: int, limit_bytes: int, growth_bytes_per_s: float) -> float:
+        headroom = limit_bytes - used_bytes
+        if headroom <= 0 or limit_bytes <= 0:
+            return self.min_interval
+
+        # Roomy paths drift towards max_staleness; paths near the limit towards
+        # min_interval. Growth can only shorten the interval further.
+        interval = self.max_staleness * headroom / limit_bytes
+        if growth_bytes_per_s > 0:
+            interval = min(interval, TIME_TO_LIMIT_SAFETY * headroom / growth_bytes_per_s)
+        return min(self.max_staleness, max(self.min_interval, interval))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, "w") as handle:
+            json.dump({path: asdict(entry) for path, entry in self.paths.items()}, handle)
+        os.replace(temp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as handle:
+                data = json.load(handle)
+            self.paths = {path: PathSchedule(**entry) for path, entry in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            # Missing or unreadable state only means every path is due once.
+            self.paths = {}
@@ -1,34 +1,26 @@
-import yaml
-import subprocess
 from agentic_tools.workspace_logger.logger import log_milestone
-import os
-from agentic_tools.utils.path_utils import get_repo_root
-repo_root = get_repo_root()
+from agentic_tools.agents.threshold_alert.engine import GB, evaluate_thresholds, measure_paths, parse_threshold_entries
+from agentic_tools.agents.threshold_alert.scheduler import AdaptiveScheduler
+from agentic_tools.config.loader import CONFIG_DIR, THRESHOLDS_FILE, read_yaml
+import sqlite3
+import time
 
 def load_thresholds():
-    """Loads thresholds from config/thresholds.yaml if it exists and is valid."""
-    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    path = os.path.join(root, 'config', 'thresholds.yaml')
+    """Loads thresholds from config/thresholds.yaml if it exists and is valid.
 
-    if not os.path.exists(path):
+    The file is parsed once and re-read only when it changes on disk.
+    """
+    path = CONFIG_DIR / THRESHOLDS_FILE
+
+    try:
+        data = read_yaml(path)
+    except FileNotFoundError:
         log_milestone(
             mode="ERROR",
             note="thresholds.yaml not found",
             reflection="Agent skipped threshold check; no config available"
         )
         return {}
-
-    try:
-        with open(path) as f:
-            data = yaml.safe_load(f)
-            if not isinstance(data, dict):
-                log_milestone(
-                    mode="ERROR",
-                    note="thresholds.yaml has unexpected structure",
-                    reflection="Expected {path: limit}, got something else"
-                )
-                return {}
-            return data
     except Exception as e:
         log_milestone(
             mode="ERROR",
@@ -36,33 +28,38 @@ def load_thresholds():
             reflection=str(e)
         )
         return {}
-    
-def get_disk_usage(path):
-    """Returns disk usage in GB for the given path."""
-    try:
-        result = subprocess.run(
-            ['du', '-sh', path],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=30  # seconds
-        )
-        size_str = result.stdout.split()[0]
-        return parse_size(size_str)
-    except subprocess.TimeoutExpired:
+
+    if not isinstance(data, dict):
         log_milestone(
             mode="ERROR",
-            note=f"Timeout while checking usage for {path}",
-            reflection="Scan exceeded 30s; consider narrowing scope or increasing timeout"
+            note="thresholds.yaml has unexpected structure",
+            reflection="Expected {path: limit}, got something else"
         )
-        return 0
-    except Exception as e:
+        return {}
+    return data
+
+def get_disk_usage(path, live=None):
+    """Returns disk usage in GB for the given path.
+
+    When ``live`` (a DiskWatcher or anything with ``size_of``) already tracks
+    the path, its in-memory size is used instead of walking the disk.
+    """
+    measured = measure_paths([path], live=live)
+    size_bytes, complete, _, error = next(iter(measured.values()))
+    if error:
         log_milestone(
             mode="ERROR",
             note=f"Failed to get disk usage for {path}",
-            reflection=str(e)
+            reflection=error
         )
         return 0
+    if not complete:
+        log_milestone(
+            mode="ERROR",
+            note=f"Timeout while checking usage for {path}",
+            reflection="Walk hit its deadline; size is a lower bound"
+        )
+    return size_bytes / 1024 ** 3
 
 def parse_size(size_str, units=None):
     """Parses size strings like '3.2G' or '512M' into GB."""
@@ -74,7 +71,28 @@ def parse_size(size_str, units=None):
     except Exception:
         return 0
 
-def check_thresholds():
+def check_thresholds(
+    live=None,
+    scheduler=None,
+    history=True,
+    index=True,
+    forecast_horizon_days=7.0,
+    forecast_method="linear",
+    forecast_window_days=30.0,
+):
+    """Checks every configured threshold, or only the due ones with a ``scheduler``.
+
+    Pass ``scheduler=True`` for the default ``AdaptiveScheduler`` or an
+    instance to control its state file, minimum interval and max staleness.
+
+    Each measurement is appended to ``history`` (a ``SizeHistory``; ``True``
+    for the default store, ``False`` to disable). Every configured path is
+    then forecast from its last ``forecast_window_days`` of samples, and an
+    ALERT fires when a breach is projected within ``forecast_horizon_days``.
+
+    Walks reuse the disk scan's size ``index`` (a ``SizeIndex``; ``True``
+    for the default index, ``False`` for full walks).
+    """
     thresholds = load_thresholds()
     if not thresholds:
         log_milestone(
@@ -84,34 +102,124 @@ def check_thresholds():
         )
         return
 
-    for entry in thresholds.items() if isinstance(thresholds, dict) else enumerate(thresholds):
-        path, limit_gb = None, None
-
-        if isinstance(entry, tuple) and len(entry) == 2:
-            path, limit_gb = entry
-        elif isinstance(entry, dict) and "path" in entry and "limit" in entry:
-            path, limit_gb = entry["path"], entry["limit"]
-        else:
+    entries, malformed = parse_threshold_entries(thresholds)
+    configured = list(entries)
+    if scheduler is True:
+        scheduler = AdaptiveScheduler()
+    if scheduler:
+        due = set(scheduler.due({path: int(limit * GB) for path, limit in entries}))
+        if len(due) < len(entries):
             log_milestone(
                 mode="FLOW",
-                note=f"Skipped malformed threshold entry: {entry}",
-                reflection="Entry did not match expected structure"
+                note=f"Threshold schedule: {len(due)} of {len(entries)} paths due",
+                reflection="Paths with headroom and slow growth are checked less often"
+            )
+        entries = [(path, limit) for path, limit in entries if path in due]
+
+    if index is True:
+        from agentic_tools.agents.disk_hygiene.size_index import SizeIndex
+
+        index = SizeIndex()
+    results, _ = evaluate_thresholds(entries, live=live, index=index or None)
+    if scheduler:
+        for result in results:
+            scheduler.record(result)
+        try:
+            scheduler.save()
+        except OSError as e:
+            log_milestone(
+                mode="ERROR",
+                note="Failed to save threshold schedule",
+                reflection=str(e)
+            )
+
+    for entry in malformed:
+        log_milestone(
+            mode="FLOW",
+            note=f"Skipped malformed threshold entry: {entry}",
+            reflection="Entry did not match expected structure"
+        )
+
+    for result in results:
+        if result.error:
+            log_milestone(
+                mode="ERROR",
+                note=f"Failed to get disk usage for {result.path}",
+                reflection=result.error
             )
             continue
+        if not result.complete:
+            log_milestone(
+                mode="ERROR",
+                note=f"Timeout while checking usage for {result.path}",
+                reflection="Walk hit its deadline; usage below is a lower bound"
+            )
 
-        usage_gb = get_disk_usage(path)
-        if usage_gb > limit_gb:
+        if result.exceeded:
             log_milestone(
                 mode="ALERT",
-                note=f"{path} exceeded threshold: {usage_gb:.2f}G > {limit_gb}G",
+                note=f"{result.path} exceeded threshold: {result.used_gb:.2f}G > {result.limit_gb:g}G",
                 reflection="Consider cleanup or archiving"
             )
         else:
             log_milestone(
                 mode="FLOW",
-                note=f"{path} within threshold: {usage_gb:.2f}G ≤ {limit_gb}G",
+                note=f"{result.path} within threshold: {result.used_gb:.2f}G ≤ {result.limit_gb:g}G",
                 reflection="No action needed"
             )
 
+    if history is True:
+        from agentic_tools.agents.threshold_alert.history import SizeHistory
+
+        history = SizeHistory()
+    if history:
+        forecast_thresholds(
+            history,
+            results,
+            configured,
+            horizon_days=forecast_horizon_days,
+            method=forecast_method,
+            window_days=forecast_window_days,
+        )
+    return results
+
+def forecast_thresholds(history, results, entries, horizon_days=7.0, method="linear", window_days=30.0):
+    """Records ``results`` in ``history`` and alerts on breaches forecast within the horizon."""
+    now = time.time()
+    try:
+        history.record(
+            (result.path, now, result.used_bytes)
+            for result in results
+            if result.used_bytes is not None and result.complete
+        )
+        limits = {path: int(limit * GB) for path, limit in entries}
+        series = history.series(limits, since=now - window_days * 86400)
+    except sqlite3.Error as e:
+        log_milestone(
+            mode="ERROR",
+            note="Size history unavailable",
+            reflection=str(e)
+        )
+        return []
+
+    from agentic_tools.agents.threshold_alert.forecast import forecast_breaches
+
+    forecasts = forecast_breaches(series, limits, method=method)
+    for forecast in forecasts:
+        # Paths already over the limit were alerted on above.
+        if forecast.seconds_to_breach and forecast.breaches_within(horizon_days * 86400):
+            log_milestone(
+                mode="ALERT",
+                note=(
+                    f"{forecast.path} forecast to exceed threshold in "
+                    f"{forecast.seconds_to_breach / 86400:.1f} days"
+                ),
+                reflection=(
+                    f"{forecast.current_bytes / GB:.2f}G of {forecast.limit_bytes / GB:g}G, "
+                    f"growing {forecast.growth_bytes_per_s * 86400 / GB:.2f}G/day ({method} trend)"
+                )
+            )
+    return forecasts
+
 if __name__ == "__main__":
     check_thresholds()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""Compiled, mtime-cached configuration for the disk agents.
+
+Two files in the config directory (``AGENTIC_CONFIG_DIR``, default: this
+package) feed one ``CompiledConfig``:
+
+* ``thresholds.yaml``: ``{path: limit_gb}``, as before.
+* ``disk_hygiene.yaml``: ``scan_roots``, ``safe_roots`` and ``exclude`` lists.
+  Missing keys (or a missing file) fall back to the built-in defaults.
+
+``load_config()`` only stats the files on each call and recompiles when a
+modification time or size changes, so agents pick up edits without a
+restart. Path rules are compiled into ``PathTrie`` objects, which match a
+path against any number of rules in time proportional to its depth.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+CONFIG_DIR = Path(os.environ.get("AGENTIC_CONFIG_DIR", str(Path(__file__).resolve().parent))).expanduser()
+THRESHOLDS_FILE = "thresholds.yaml"
+DISK_HYGIENE_FILE = "disk_hygiene.yaml"
+
+DEFAULT_SCAN_ROOTS = (
+    "~/Downloads",
+    "~/Documents",
+    "~/Desktop",
+    "~/Library/Caches",
+    "~/Library/Logs",
+    "~/Library/Developer/Xcode/DerivedData",
+    "~/repos",
+)
+DEFAULT_SAFE_ROOTS = (
+    "~/Library/Caches",
+    "~/Library/Logs",
+    "~/Library/Developer/Xcode/DerivedData",
+    "~/.Trash",
+)
+
+# Key under which a trie node stores the rule ending there; never a path component.
+_RULE = None
+
+
+def normalize_path(path: Union[str, Path]) -> str:
+    return os.path.realpath(os.path.expanduser(str(path)))
+
+
+def _components(path: str) -> List[str]:
+    return [part for part in path.split("/") if part]
+
+
+class PathTrie:
+    """Path-prefix rules keyed by path component.
+
+    ``longest_match`` walks one node per component of the queried path, so a
+    lookup costs O(depth) no matter how many rules are stored. Paths are
+    used as given; pass normalized absolute paths.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, Any]] = ()):
+        self._root: Dict[Any, Any] = {}
+        self._count = 0
+        for path, value in rules:
+            self.add(path, value)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, path: str, value: Any = True) -> None:
+        node = self._root
+        for part in _components(path):
+            node = node.setdefault(part, {})
+        if _RULE not in node:
+            self._count += 1
+        node[_RULE] = ("/" + "/".join(_components(path)), value)
+
+    def longest_match(self, path: str) -> Optional[Tuple[str, Any]]:
+        """The deepest rule at or above ``path`` as ``(rule_path, value)``."""
+        node = self._root
+        found = node.get(_RULE)
+        for part in _components(path):
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_RULE, found)
+        return found
+
+    def covers(self, path: str) -> bool:
+        return self.longest_match(path) is not None
+
+    def under(self, path: str) -> Iterator[Tuple[str, Any]]:
+        """Every rule at or below ``path``."""
+        node = self._root
+        for part in _components(path):
+            node = node.get(part)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is _RULE:
+                    yield child
+                else:
+                    stack.append(child)
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    thresholds: Dict[str, Any]
+    scan_roots: Tuple[str, ...]
+    safe_roots: Tuple[str, ...]
+    exclusions: Tuple[str, ...]
+    threshold_rules: PathTrie = field(repr=False)
+    safe_rules: PathTrie = field(repr=False)
+    exclude_rules: PathTrie = field(repr=False)
+    # (note, reflection) pairs for files that could not be used.
+    problems: Tuple[Tuple[str, str], ...] = ()
+
+    def safe_root_for(self, path: str) -> Optional[str]:
+        match = self.safe_rules.longest_match(path)
+        return match[0] if match else None
+
+    def is_excluded(self, path: str) -> bool:
+        return self.exclude_rules.covers(path)
+
+    def exclusions_under(self, root: str) -> List[str]:
+        return sorted(rule for rule, _ in self.exclude_rules.under(root))
+
+    def threshold_for(self, path: str) -> Optional[Tuple[str, float]]:
+        """The nearest configured threshold path at or above ``path`` and its limit."""
+        return self.threshold_rules.longest_match(path)
+
+
+class _ParsedFile:
+    __slots__ = ("signature", "data", "error")
+
+    def __init__(self, signature, data, error):
+        self.signature = signature
+        self.data = data
+        self.error = error
+
+
+_lock = threading.Lock()
+_files: Dict[Path, _ParsedFile] = {}
+_compiled: Dict[Path, Tuple[tuple, CompiledConfig]] = {}
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_file(path: Path, signature) -> _ParsedFile:
+    cached = _files.get(path)
+    if cached is not None and cached.signature == signature:
+        return cached
+    data, error = None, None
+    if signature is not None:
+        try:
+            import yaml
+
+            with open(path) as handle:
+                data = yaml.safe_load(handle)
+        except Exception as exc:
+            error = str(exc)
+    parsed = _ParsedFile(signature, data, error)
+    _files[path] = parsed
+    return parsed
+
+
+def read_yaml(path: Union[str, Path]) -> Any:
+    """Parsed contents of a YAML file, re-read only when it changes on disk.
+
+    Raises ``FileNotFoundError`` for a missing file and ``ValueError`` when it
+    cannot be parsed.
+    """
+    path = Path(path).expanduser()
+    with _lock:
+        signature = _signature(path)
+        if signature is None:
+            raise FileNotFoundError(str(path))
+        parsed = _parse_file(path, signature)
+    if parsed.error is not None:
+        raise ValueError(parsed.error)
+    return parsed.data
+
+
+def _path_list(data: Dict[str, Any], key: str, default: Tuple[str, ...], problems: List[Tuple[str, str]]) -> Tuple[str, ...]:
+    value = data.get(key, default)
+    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+        problems.append((f"{DISK_HYGIENE_FILE}: {key} must be a list of paths", "Using built-in defaults"))
+        value = default
+    # Keep order (scan roots are reported in it) but drop duplicates.
+    return tuple(dict.fromkeys(normalize_path(item) for item in value))
+
+
+def _compile(thresholds: _ParsedFile, hygiene: _ParsedFile) -> CompiledConfig:
+    problems: List[Tuple[str, str]] = []
+
+    threshold_data: Dict[str, Any] = {}
+    if thresholds.error is not None:
+        problems.append((f"Failed to load {THRESHOLDS_FILE}", thresholds.error))
+    elif thresholds.signature is not None:
+        if isinstance(thresholds.data, dict):
+            threshold_data = thresholds.data
+        else:
+            problems.append((f"{THRESHOLDS_FILE} has unexpected structure", "Expected {path: limit}, got something else"))
+
+    hygiene_data: Dict[str, Any] = {}
+    if hygiene.error is not None:
+        problems.append((f"Failed to load {DISK_HYGIENE_FILE}", hygiene.error))
+    elif isinstance(hygiene.data, dict):
+        hygiene_data = hygiene.data
+    elif hygiene.data is not None:
+        problems.append((f"{DISK_HYGIENE_FILE} has unexpected structure", "Expected a mapping of rule lists"))
+
+    scan_roots = _path_list(hygiene_data, "scan_roots", DEFAULT_SCAN_ROOTS, problems)
+    safe_roots = _path_list(hygiene_data, "safe_roots", DEFAULT_SAFE_ROOTS, problems)
+    exclusions = _path_list(hygiene_data, "exclude", (), problems)
+
+    threshold_rules = PathTrie(
+        (normalize_path(path), limit)
+        for path, limit in threshold_data.items()
+        if isinstance(limit, (int, float)) and not isinstance(limit, bool)
+    )
+    return CompiledConfig(
+        thresholds=threshold_data,
+        scan_roots=scan_roots,
+        safe_roots=safe_roots,
+        exclusions=exclusions,
+        threshold_rules=threshold_rules,
+        safe_rules=PathTrie((root, True) for root in safe_roots),
+        exclude_rules=PathTrie((path, True) for path in exclusions),
+        problems=tuple(problems),
+    )
+
+
+def load_config(config_dir: Optional[Union[str, Path]] = None) -> CompiledConfig:
+    """The compiled config for ``config_dir``; recompiled only after a file changes."""
+    directory = Path(config_dir).expanduser() if config_dir is not None else CONFIG_DIR
+    thresholds_path = directory / THRESHOLDS_FILE
+    hygiene_path = directory / DISK_HYGIENE_FILE
+    with _lock:
+        key = (_signature(thresholds_path), _signature(hygiene_path))
+        cached = _compiled.get(directory)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        compiled = _compile(_parse_file(thresholds_path, key[0]), _parse_file(hygiene_path, key[1]))
+        _compiled[directory] = (key, compiled)
+        return compiled
@@ -0,0 +1,105 @@
+"""Async agent protocol and the event loop the orchestrator runs it on.
+
+An agent entrypoint is either a plain function or a coroutine function
+(``async def``, registered with ``is_async=True``). Coroutine agents run as
+tasks on one shared event loop in a background thread, so the network waits
+of every running async agent overlap, across plans and daemon requests.
+Async agents wrap their blocking client calls (requests, yfinance) in
+``asyncio.to_thread`` and bound their fan-out with a semaphore.
+
+Sync agents are unchanged. ``as_async`` adapts one to the async protocol by
+running it in an executor, so async code can await any agent; the DAG uses
+it to run sync steps in its worker pool (thread or process) while async
+steps share the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+
+def is_async_callable(func: Callable[..., Any]) -> bool:
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+
+def as_async(func: Callable[..., Any], executor: Optional[Executor] = None) -> Callable[..., Awaitable[Any]]:
+    """``func`` as a coroutine function; sync functions run in ``executor`` (default: the loop's)."""
+    if is_async_callable(func):
+        return func
+
+    @functools.wraps(func)
+    async def adapter(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    return adapter
+
+
+class EventLoopThread:
+    """An asyncio loop running forever in a daemon thread; submit coroutines from any thread."""
+
+    def __init__(self, name: str = "agentic-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if not self.running:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._loop = loop
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                started.wait()
+            return self._loop
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule ``coroutine`` on the loop; cancelling the returned future cancels the task."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._start())
+
+    def run(self, coroutine: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Block the calling thread (never the loop's own) until ``coroutine`` finishes."""
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("EventLoopThread.run() called from the loop itself; await the coroutine instead")
+        return self.submit(coroutine).result(timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+_default: Optional[EventLoopThread] = None
+_default_lock = threading.Lock()
+
+
+def shared_loop() -> EventLoopThread:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = EventLoopThread()
+        return _default
@@ -0,0 +1,349 @@
+"""Long-running orchestrator: cron schedules plus a local trigger socket.
+
+The daemon imports every registered agent (and the heavy modules they load
+lazily) once at start-up, then keeps them and their in-process caches warm:
+
+* Schedules come from ``schedules.yaml`` in the config directory and are
+  re-read whenever the file changes::
+
+      schedules:
+        - name: thresholds
+          cron: "*/15 * * * *"
+          agent: threshold_alert
+        - name: nightly
+          cron: "0 3 * * *"
+          plan: all
+          timeout: 1800
+
+  A schedule still running when it comes due again is not started twice,
+  and minutes missed while the machine slept are not replayed.
+
+* Ad-hoc runs arrive on a Unix domain socket as one JSON request per
+  connection (``{"agent": ..., "params": {...}}``, ``{"plan": ...}``,
+  ``{"cmd": "status"}`` or ``{"cmd": "stop"}``) and get one JSON reply with
+  the run report. Add ``"fresh": true`` to bypass cached agent results.
+  ``send_request`` is the client side.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from agentic_tools.config.loader import CONFIG_DIR, read_yaml
+from agentic_tools.orchestrator import dag, registry
+from agentic_tools.orchestrator.cron import CronSchedule
+from agentic_tools.orchestrator.result_cache import default_cache
+from agentic_tools.workspace_logger.logger import log_milestone
+
+SCHEDULES_FILE = "schedules.yaml"
+DEFAULT_SOCKET = Path(
+    os.environ.get(
+        "AGENTIC_ORCHESTRATOR_SOCKET",
+        str(Path(tempfile.gettempdir()) / f"agentic-orchestrator-{os.getuid()}.sock"),
+    )
+)
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class Schedule:
+    def __init__(self, name: str, cron: CronSchedule, steps: List[registry.PlanStep], timeout: Optional[float]):
+        self.name = name
+        self.cron = cron
+        self.steps = steps
+        self.timeout = timeout
+
+
+def parse_schedules(data: Any) -> Tuple[List[Schedule], List[str]]:
+    """Schedules and problems from the parsed ``schedules.yaml``."""
+    if data is None:
+        return [], []
+    entries = data.get("schedules") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return [], ["schedules.yaml must contain a 'schedules' list"]
+
+    schedules: List[Schedule] = []
+    problems: List[str] = []
+    for index, entry in enumerate(entries):
+        label = entry.get("name", f"#{index}") if isinstance(entry, dict) else f"#{index}"
+        if not isinstance(entry, dict) or "cron" not in entry or ("agent" in entry) == ("plan" in entry):
+            problems.append(f"schedule {label}: needs 'cron' and exactly one of 'agent' or 'plan'")
+            continue
+        try:
+            cron = CronSchedule(str(entry["cron"]))
+            if "plan" in entry:
+                if entry["plan"] not in registry.PLANS:
+                    raise ValueError(f"unknown plan {entry['plan']!r}")
+                steps = list(registry.PLANS[entry["plan"]])
+            else:
+                steps = [registry.PlanStep(str(entry["agent"]), str(entry["agent"]), params=dict(entry.get("params") or {}))]
+            plan_problems = registry.validate_plan(steps)
+            if plan_problems:
+                raise ValueError("; ".join(plan_problems))
+            timeout = entry.get("timeout")
+            schedules.append(Schedule(str(label), cron, steps, float(timeout) if timeout is not None else None))
+        except (TypeError, ValueError) as exc:
+            problems.append(f"schedule {label}: {exc}")
+    return schedules, problems
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            reply = self.server.daemon.handle_request(request)
+        except Exception as exc:
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: "OrchestratorDaemon"):
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+
+class OrchestratorDaemon:
+    def __init__(
+        self,
+        socket_path: Union[str, Path] = DEFAULT_SOCKET,
+        config_dir: Optional[Union[str, Path]] = None,
+        max_workers: int = dag.DEFAULT_MAX_WORKERS,
+    ):
+        self.socket_path = Path(socket_path)
+        self.schedules_path = Path(config_dir).expanduser() / SCHEDULES_FILE if config_dir else CONFIG_DIR / SCHEDULES_FILE
+        self.max_workers = max_workers
+        self.started_at = time.time()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._last_runs: Dict[str, Dict[str, Any]] = {}
+        self._schedules: List[Schedule] = []
+        self._schedules_source: Any = None
+        self._server: Optional[_Server] = None
+
+    # -- start-up -------------------------------------------------------
+
+    def warm_up(self) -> Dict[str, str]:
+        """Import every agent and its lazily imported dependencies once."""
+        outcome: Dict[str, str] = {}
+        for spec in registry.list_agents():
+            try:
+                for module in spec.warm_imports:
+                    importlib.import_module(module)
+                registry.load_entrypoint(spec)
+                outcome[spec.name] = "ok"
+            except (Exception, SystemExit) as exc:
+                # Includes SystemExit from agents that still exit on import.
+                outcome[spec.name] = f"{type(exc).__name__}: {exc}"
+        failed = {name: result for name, result in outcome.items() if result != "ok"}
+        log_milestone(
+            "FLOW" if not failed else "ERROR",
+            note=f"Orchestrator daemon warmed {len(outcome) - len(failed)}/{len(outcome)} agents",
+            reflection="; ".join(f"{name}: {result}" for name, result in failed.items()) or "All agents imported",
+        )
+        return outcome
+
+    def _refresh_schedules(self) -> List[Schedule]:
+        error = None
+        try:
+            data = read_yaml(self.schedules_path)
+        except FileNotFoundError:
+            data = None
+        except ValueError as exc:
+            data, error = None, str(exc)
+        # read_yaml returns a cached object until the file changes, so this
+        # only re-parses (and re-logs problems) after an edit.
+        if (data, error) != self._schedules_source:
+            self._schedules_source = (data, error)
+            if error is not None:
+                self._schedules, problems = [], [f"Failed to load {SCHEDULES_FILE}: {error}"]
+            else:
+                self._schedules, problems = parse_schedules(data)
+            for problem in problems:
+                log_milestone("ERROR", note="Invalid orchestrator schedule", reflection=problem)
+            log_milestone(
+                "FLOW",
+                note=f"Orchestrator daemon loaded {len(self._schedules)} schedules",
+                reflection=", ".join(f"{item.name} ({item.cron.expression})" for item in self._schedules) or "none",
+            )
+        return self._schedules
+
+    # -- running --------------------------------------------------------
+
+    def run_steps(
+        self,
+        key: str,
+        steps: List[registry.PlanStep],
+        timeout: Optional[float] = None,
+        include_results: bool = False,
+        fresh: bool = False,
+        exclusive: bool = False,
+    ) -> Dict[str, Any]:
+        """Run ``steps`` and summarize the report.
+
+        ``exclusive`` refuses to start while ``key`` is still running; other
+        concurrent identical runs share work through the result cache.
+        """
+        with self._lock:
+            if exclusive and key in self._running:
+                return {"ok": False, "error": f"{key} is already running"}
+            self._running[key] = self._running.get(key, 0) + 1
+        try:
+            report = dag.run_plan(steps, max_workers=self.max_workers, default_timeout=timeout, fresh=fresh)
+        finally:
+            with self._lock:
+                self._running[key] -= 1
+                if not self._running[key]:
+                    del self._running[key]
+        summary = report.to_dict(include_results=include_results)
+        self._last_runs[key] = {"finished": datetime.now().isoformat(), "ok": report.ok, "wall": report.wall}
+        return summary
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get("cmd")
+        if command == "status":
+            return self.status()
+        if command == "stop":
+            self.stop()
+            return {"ok": True, "stopping": True}
+        if command is not None:
+            raise ValueError(f"unknown command {command!r}")
+
+        timeout = request.get("timeout")
+        timeout = float(timeout) if timeout is not None else None
+        fresh = bool(request.get("fresh"))
+        if "plan" in request:
+            name = str(request["plan"])
+            if name not in registry.PLANS:
+                raise KeyError(f"unknown plan {name!r}")
+            report = self.run_steps(f"plan:{name}", list(registry.PLANS[name]), timeout, fresh=fresh)
+        elif "agent" in request:
+            spec = registry.get_agent(str(request["agent"]))
+            raw = {key: str(value) for key, value in (request.get("params") or {}).items()}
+            step = registry.PlanStep(spec.name, spec.name, params=registry.coerce_params(spec, raw), timeout=timeout)
+            report = self.run_steps(
+                f"agent:{spec.name}:{json.dumps(raw, sort_keys=True)}",
+                [step],
+                include_results=bool(request.get("results")),
+                fresh=fresh,
+            )
+        else:
+            raise ValueError("request needs 'agent', 'plan' or 'cmd'")
+        return report
+
+    def status(self) -> Dict[str, Any]:
+        now = datetime.now()
+        with self._lock:
+            running = sorted(self._running)
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "running": running,
+            "schedules": [
+                {
+                    "name": item.name,
+                    "cron": item.cron.expression,
+                    "next": (item.cron.next_after(now) or now).isoformat(),
+                }
+                for item in self._schedules
+            ],
+            "last_runs": self._last_runs,
+            "result_cache": dict(default_cache().stats, entries=len(default_cache())),
+        }
+
+    def _fire(self, schedule: Schedule) -> None:
+        threading.Thread(
+            target=self.run_steps,
+            args=(f"schedule:{schedule.name}", schedule.steps, schedule.timeout),
+            kwargs={"exclusive": True},
+            name=f"schedule-{schedule.name}",
+            daemon=True,
+        ).start()
+
+    def _schedule_loop(self) -> None:
+        while not self._stop.is_set():
+            # Wake at the top of each minute and fire whatever matches it.
+            now = time.time()
+            if self._stop.wait(60 - now % 60):
+                return
+            minute = datetime.now().replace(second=0, microsecond=0)
+            for schedule in self._refresh_schedules():
+                if schedule.cron.matches(minute):
+                    self._fire(schedule)
+
+    # -- lifecycle ------------------------------------------------------
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            # shutdown() blocks until serve_forever returns; never call it on that thread.
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def serve_forever(self) -> None:
+        if self.socket_path.exists():
+            try:
+                send_request({"cmd": "status"}, self.socket_path, timeout=2)
+            except OSError:
+                self.socket_path.unlink()  # stale socket from a previous daemon
+            else:
+                raise RuntimeError(f"An orchestrator daemon is already listening on {self.socket_path}")
+
+        self.warm_up()
+        self._refresh_schedules()
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _Server(str(self.socket_path), self)
+        finally:
+            os.umask(previous_umask)
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self.stop())
+        scheduler = threading.Thread(target=self._schedule_loop, name="orchestrator-cron", daemon=True)
+        scheduler.start()
+        log_milestone("FLOW", note="Orchestrator daemon listening", reflection=str(self.socket_path))
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            self._stop.set()
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+            log_milestone("FLOW", note="Orchestrator daemon stopped", reflection=str(self.socket_path))
+
+
+def send_request(
+    request: Dict[str, Any],
+    socket_path: Union[str, Path] = DEFAULT_SOCKET,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Send one request to a running daemon and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
@@ -0,0 +1,526 @@
+"""Run a plan of agents as a dependency graph.
+
+Steps whose dependencies have finished run concurrently, driven from the
+shared event loop (see ``async_agents``). Sync agents run on a thread or
+process pool, never more than ``max_workers`` at a time; async agents run
+as tasks on the loop itself and do not take a worker. A step that fails,
+times out or is cancelled causes every step depending on it to be skipped;
+independent branches keep running.
+
+Python cannot interrupt a running thread, so a timed-out or cancelled step
+is abandoned rather than killed: its result is discarded, dependents are
+skipped, and steps whose entrypoint accepts ``cancel_event`` (thread mode)
+see that event set so they can stop early. Async steps are cancelled
+outright.
+
+The report lists every step with its queue wait and duration, and the
+critical path: the chain of steps, each gated by the last of its
+dependencies to finish, that determined the total wall time.
+
+Every step is also written to the run ledger (see ``ledger``) with its
+wall and CPU time, peak RSS while it ran (see ``_RssWindow``) and result
+size, including steps that failed, timed out or were skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import multiprocessing
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from agentic_tools.orchestrator import registry
+from agentic_tools.orchestrator.async_agents import as_async, shared_loop
+from agentic_tools.orchestrator.ledger import RunLedger, default_ledger
+from agentic_tools.orchestrator.result_cache import RAN, cache_key, default_cache, normalize_arguments
+from agentic_tools.workspace_logger.logger import log_milestone
+
+EXECUTOR_MODES = ("thread", "process")
+DEFAULT_MAX_WORKERS = 4
+
+# Step statuses.
+PENDING, RUNNING, SUCCEEDED, FAILED, TIMED_OUT, CANCELLED, SKIPPED = (
+    "pending", "running", "succeeded", "failed", "timeout", "cancelled", "skipped",
+)
+
+
+@dataclass
+class StepRecord:
+    name: str
+    agent: str
+    status: str = PENDING
+    # Seconds since the start of the run.
+    ready_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Any = None
+    # "ran", or "hit"/"shared" when the result came from the result cache.
+    cache: Optional[str] = None
+    # Measured in the worker; see ``_timed_call``.
+    cpu_s: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+    result_bytes: Optional[int] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def waited(self) -> Optional[float]:
+        if self.ready_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.ready_at
+
+
+@dataclass
+class DagReport:
+    steps: Dict[str, StepRecord]
+    wall: float
+    critical_path: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return all(record.status == SUCCEEDED for record in self.steps.values())
+
+    def results(self) -> Dict[str, Any]:
+        return {name: record.result for name, record in self.steps.items() if record.status == SUCCEEDED}
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        steps = {}
+        for name, record in self.steps.items():
+            entry = {
+                "agent": record.agent,
+                "status": record.status,
+                "started_at": record.started_at,
+                "duration": record.duration,
+                "error": record.error,
+            }
+            if record.cache is not None:
+                entry["cache"] = record.cache
+            if include_results and record.status == SUCCEEDED:
+                entry["result"] = record.result
+            steps[name] = entry
+        return {"ok": self.ok, "wall": self.wall, "critical_path": self.critical_path, "steps": steps}
+
+    def format(self) -> str:
+        busy = sum(record.duration or 0.0 for record in self.steps.values())
+        width = max([len("step")] + [len(name) for name in self.steps])
+        lines = [
+            f"{'step':<{width}}  {'status':<9}  {'start':>8}  {'wait':>8}  {'duration':>9}  {'share':>6}",
+        ]
+        lines.append("-" * len(lines[0]))
+        for record in sorted(self.steps.values(), key=lambda item: (item.started_at is None, item.started_at or 0.0)):
+            start = f"{record.started_at:7.2f}s" if record.started_at is not None else "-"
+            waited = f"{record.waited:7.2f}s" if record.waited is not None else "-"
+            duration = f"{record.duration:8.2f}s" if record.duration is not None else "-"
+            share = f"{100 * record.duration / busy:5.1f}%" if record.duration and busy else "-"
+            marker = " *" if record.name in self.critical_path else ""
+            if record.cache not in (None, RAN):
+                marker += f" [cache {record.cache}]"
+            lines.append(
+                f"{record.name:<{width}}  {record.status:<9}  {start:>8}  {waited:>8}  {duration:>9}  {share:>6}{marker}"
+            )
+        lines.append(
+            f"wall {self.wall:.2f}s, busy {busy:.2f}s (parallelism {busy / self.wall if self.wall else 0:.2f}x); "
+            f"critical path (*): {' -> '.join(self.critical_path) or 'none'}"
+        )
+        return "\n".join(lines)
+
+
+def _call_agent(
+    agent: str,
+    params: Dict[str, Any],
+    cancel_event: Optional[threading.Event] = None,
+    fresh: bool = False,
+) -> Tuple[Any, Optional[str]]:
+    # Module level so process pools can pickle it; the agent loads in the worker.
+    spec = registry.get_agent(agent)
+    entrypoint = registry.load_entrypoint(spec)
+    call_params = params
+    if cancel_event is not None and "cancel_event" in inspect.signature(entrypoint).parameters:
+        call_params = dict(params, cancel_event=cancel_event)
+    if spec.cache_ttl is None:
+        return entrypoint(**call_params), None
+    key = cache_key(agent, normalize_arguments(entrypoint, params))
+    return default_cache().get_or_run(key, spec.cache_ttl, lambda: entrypoint(**call_params), fresh=fresh)
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """The process's lifetime peak RSS."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _reset_hwm() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM to the current RSS.
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _read_hwm() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class _RssWindow:
+    """Peak RSS of this process while one or more steps run in it.
+
+    The high-water mark is reset when the first of a group of overlapping
+    steps starts and read as each finishes, so a step's peak covers its own
+    run plus whatever overlapped it in the same process; never earlier
+    steps. Without a resettable VmHWM, only a step that raised the lifetime
+    peak gets a value.
+    """
+
+    _lock = threading.Lock()
+    _active = 0
+    _resettable = False
+
+    def __enter__(self) -> "_RssWindow":
+        with _RssWindow._lock:
+            if _RssWindow._active == 0:
+                _RssWindow._resettable = _reset_hwm()
+            _RssWindow._active += 1
+            self._resettable = _RssWindow._resettable
+        self._lifetime_before = _max_rss_bytes()
+        self.peak: Optional[int] = None
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with _RssWindow._lock:
+            _RssWindow._active -= 1
+        if self._resettable:
+            self.peak = _read_hwm()
+            return
+        after = _max_rss_bytes()
+        if after is not None and self._lifetime_before is not None and after > self._lifetime_before:
+            self.peak = after
+
+
+def _result_bytes(result: Any) -> Optional[int]:
+    try:
+        return len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        return None
+
+
+def _metrics(cpu_start: float, rss: _RssWindow, result: Any) -> Dict[str, Any]:
+    return {
+        "cpu_s": time.process_time() - cpu_start,
+        "peak_rss_bytes": rss.peak,
+        "result_bytes": _result_bytes(result),
+    }
+
+
+def _timed_call(agent: str, params: Dict[str, Any], cancel_event: Optional[threading.Event] = None, fresh: bool = False):
+    # Wall-clock start, so it is comparable across processes.
+    started = time.time()
+    # Process CPU: includes other steps running in the same process (thread
+    # mode), but also the agent's own helper threads, which thread_time misses.
+    cpu_start = time.process_time()
+    with _RssWindow() as rss:
+        result, cache = _call_agent(agent, params, cancel_event, fresh)
+    return started, result, cache, _metrics(cpu_start, rss, result)
+
+
+async def _call_agent_async(agent: str, params: Dict[str, Any], fresh: bool = False) -> Tuple[Any, Optional[str]]:
+    spec = registry.get_agent(agent)
+    # Importing the agent blocks; keep it off the loop.
+    entrypoint = await asyncio.to_thread(registry.load_entrypoint, spec)
+    if spec.cache_ttl is None:
+        return await entrypoint(**params), None
+    key = cache_key(agent, normalize_arguments(entrypoint, params))
+    return await default_cache().get_or_run_async(key, spec.cache_ttl, lambda: entrypoint(**params), fresh=fresh)
+
+
+async def _timed_call_async(agent: str, params: Dict[str, Any], fresh: bool = False):
+    started = time.time()
+    cpu_start = time.process_time()
+    with _RssWindow() as rss:
+        result, cache = await _call_agent_async(agent, params, fresh)
+    return started, result, cache, _metrics(cpu_start, rss, result)
+
+
+class DagExecutor:
+    def __init__(
+        self,
+        steps: Sequence[registry.PlanStep],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        mode: str = "thread",
+        default_timeout: Optional[float] = None,
+        fresh: bool = False,
+        ledger: Optional[RunLedger] = None,
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"mode must be one of {EXECUTOR_MODES}, not {mode!r}")
+        problems = registry.validate_plan(steps)
+        if problems:
+            raise ValueError("Invalid plan: " + "; ".join(problems))
+        self.steps = {step.name: step for step in steps}
+        self.order = [step.name for step in steps]
+        self.max_workers = max(1, max_workers)
+        self.mode = mode
+        self.default_timeout = default_timeout
+        # Bypass cached agent results (see result_cache).
+        self.fresh = fresh
+        # None uses the default ledger, which AGENTIC_RUN_LEDGER="" disables.
+        self.ledger = ledger if ledger is not None else default_ledger()
+        self.run_id = uuid.uuid4().hex
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop starting new steps and abandon running ones."""
+        self._cancel.set()
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self.order}
+        for name in self.order:
+            for dependency in self.steps[name].dependencies:
+                dependents[dependency].append(name)
+        return dependents
+
+    def run(self) -> DagReport:
+        dependents = self._dependents()
+        records = {name: StepRecord(name, self.steps[name].agent) for name in self.order}
+        remaining = {name: set(self.steps[name].dependencies) for name in self.order}
+        ready = [name for name in self.order if not remaining[name]]
+        running: Dict[Future, str] = {}
+        # Running sync steps; async steps don't occupy a worker.
+        in_pool: Set[str] = set()
+        deadlines: Dict[str, float] = {}
+        step_events: Dict[str, threading.Event] = {}
+
+        wall_start = time.time()
+        clock_start = time.monotonic()
+
+        def now() -> float:
+            return time.monotonic() - clock_start
+
+        for name in ready:
+            records[name].ready_at = 0.0
+
+        def skip_dependents(name: str, reason: str) -> None:
+            stack = list(dependents[name])
+            while stack:
+                dependent = stack.pop()
+                record = records[dependent]
+                if record.status == PENDING:
+                    record.status = SKIPPED
+                    record.error = reason
+                    stack.extend(dependents[dependent])
+
+        def finish(name: str, status: str, error: Optional[str] = None) -> None:
+            record = records[name]
+            record.status = status
+            record.error = error
+            record.finished_at = now()
+            if status == SUCCEEDED:
+                log_milestone(
+                    "FLOW",
+                    note=f"{name} ({record.agent}) finished in {record.duration:.2f}s"
+                    + (f" from the result cache ({record.cache})" if record.cache not in (None, RAN) else ""),
+                    reflection=_describe(record.result),
+                )
+                for dependent in dependents[name]:
+                    remaining[dependent].discard(name)
+                    if not remaining[dependent] and records[dependent].status == PENDING:
+                        records[dependent].ready_at = record.finished_at
+                        ready.append(dependent)
+            else:
+                log_milestone("ERROR", note=f"{name} ({record.agent}) {status}", reflection=error or "")
+                skip_dependents(name, f"{name} {status}")
+
+        if self.mode == "thread":
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        else:
+            # Not fork: this process runs logger, event-loop and daemon threads
+            # whose held locks a forked worker would inherit.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        loop = shared_loop()
+        run_in_pool = as_async(_timed_call, executor=pool)
+        try:
+            while ready or running:
+                if self._cancel.is_set():
+                    for future, name in running.items():
+                        future.cancel()
+                        step_events.get(name, threading.Event()).set()
+                        finish(name, CANCELLED, "run cancelled")
+                    for name in ready:
+                        finish(name, CANCELLED, "run cancelled")
+                    running.clear()
+                    ready.clear()
+                    break
+
+                # Submit sync steps only into free workers, so a step starts
+                # when it is submitted and its timeout covers run time, not
+                # queueing.
+                for name in list(ready):
+                    step = self.steps[name]
+                    is_async = registry.get_agent(step.agent).is_async
+                    if not is_async and len(in_pool) >= self.max_workers:
+                        continue
+                    ready.remove(name)
+                    params = dict(step.params)
+                    for param, source in step.inputs.items():
+                        params[param] = records[source].result
+                    if is_async:
+                        future = loop.submit(_timed_call_async(step.agent, params, self.fresh))
+                    else:
+                        cancel_event = None
+                        if self.mode == "thread":
+                            cancel_event = step_events[name] = threading.Event()
+                        future = loop.submit(run_in_pool(step.agent, params, cancel_event, self.fresh))
+                        in_pool.add(name)
+                    running[future] = name
+                    records[name].status = RUNNING
+                    records[name].started_at = now()
+                    timeout = step.timeout if step.timeout is not None else self.default_timeout
+                    if timeout is not None:
+                        deadlines[name] = records[name].started_at + timeout
+
+                pending_deadlines = [deadlines[name] for name in running.values() if name in deadlines]
+                wait_for = max(0.0, min(pending_deadlines) - now()) if pending_deadlines else None
+                # Wake up periodically to notice cancel() from another thread.
+                wait_for = 0.5 if wait_for is None else min(wait_for, 0.5)
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    in_pool.discard(name)
+                    try:
+                        started, result, cache, metrics = future.result()
+                    except CancelledError:
+                        finish(name, CANCELLED, "task cancelled")
+                        continue
+                    except Exception as exc:
+                        finish(name, FAILED, f"{type(exc).__name__}: {exc}")
+                        continue
+                    records[name].result = result
+                    records[name].cache = cache
+                    for field, value in metrics.items():
+                        setattr(records[name], field, value)
+                    # Prefer the worker's own start time (it excludes pool start-up).
+                    records[name].started_at = max(records[name].started_at, started - wall_start)
+                    finish(name, SUCCEEDED)
+
+                current = now()
+                for future, name in list(running.items()):
+                    if name in deadlines and current >= deadlines[name]:
+                        running.pop(future)
+                        in_pool.discard(name)
+                        future.cancel()
+                        if name in step_events:
+                            step_events[name].set()
+                        timeout = deadlines[name] - records[name].started_at
+                        finish(name, TIMED_OUT, f"exceeded {timeout:g}s timeout")
+        except KeyboardInterrupt:
+            for future, name in running.items():
+                future.cancel()
+                finish(name, CANCELLED, "interrupted")
+            raise
+        finally:
+            # Abandoned steps keep their worker until they return; don't wait for them.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        report = DagReport(steps=records, wall=now(), critical_path=_critical_path(self.steps, records))
+        failed = [record.name for record in records.values() if record.status != SUCCEEDED]
+        log_milestone(
+            "REFLECT" if not failed else "ERROR",
+            note=f"Run plan finished in {report.wall:.2f}s: {len(records) - len(failed)}/{len(records)} steps succeeded",
+            reflection=f"Critical path: {' -> '.join(report.critical_path) or 'none'}"
+            + (f"; not succeeded: {', '.join(failed)}" if failed else ""),
+        )
+        self._record(records, wall_start)
+        return report
+
+    def _record(self, records: Dict[str, StepRecord], wall_start: float) -> None:
+        if self.ledger is None:
+            return
+        rows = [
+            {
+                "run_id": self.run_id,
+                "step": record.name,
+                "agent": record.agent,
+                "started": wall_start + (record.started_at or 0.0),
+                "status": record.status,
+                "wall_s": record.duration,
+                "cpu_s": record.cpu_s,
+                "peak_rss_bytes": record.peak_rss_bytes,
+                "result_bytes": record.result_bytes,
+                "cache": record.cache,
+                "error": record.error,
+            }
+            for record in records.values()
+        ]
+        try:
+            self.ledger.record(rows)
+        except (sqlite3.Error, OSError) as exc:
+            # The ledger is bookkeeping; never fail a run over it.
+            log_milestone("ERROR", note=f"Could not write the run ledger {self.ledger.path}", reflection=str(exc))
+
+
+def _describe(result: Any) -> str:
+    if isinstance(result, dict):
+        return f"keys: {list(result.keys())}"
+    if isinstance(result, (list, tuple)):
+        return f"{len(result)} items"
+    return type(result).__name__
+
+
+def _critical_path(steps: Dict[str, registry.PlanStep], records: Dict[str, StepRecord]) -> List[str]:
+    finished = [record for record in records.values() if record.finished_at is not None and record.started_at is not None]
+    if not finished:
+        return []
+    current: Optional[StepRecord] = max(finished, key=lambda record: record.finished_at)
+    path: List[str] = []
+    while current is not None:
+        path.append(current.name)
+        gating = [
+            records[dependency]
+            for dependency in steps[current.name].dependencies
+            if records[dependency].finished_at is not None
+        ]
+        current = max(gating, key=lambda record: record.finished_at) if gating else None
+    path.reverse()
+    return path
+
+
+def run_plan(
+    steps: Sequence[registry.PlanStep],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    mode: str = "thread",
+    default_timeout: Optional[float] = None,
+    fresh: bool = False,
+    ledger: Optional[RunLedger] = None,
+) -> DagReport:
+    return DagExecutor(
+        steps, max_workers=max_workers, mode=mode, default_timeout=default_timeout, fresh=fresh, ledger=ledger
+    ).run()
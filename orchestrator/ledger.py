@@ -0,0 +1,227 @@
+"""Local SQLite ledger of agent runs and a regression report over it.
+
+Every step the DAG executor finishes (or gives up on) becomes one row:
+wall and CPU seconds, peak RSS, serialized result size, status and whether
+the result came from the result cache. ``compare`` sets each agent's latest
+real run (cache hits excluded) against the median of its previous runs and
+flags the ones that slowed down by more than a ratio.
+
+CPU time and peak RSS are measured for the process the step ran in, over
+the step's run: in thread mode (and for async steps) they include other
+steps running at the same time; with ``--processes`` a worker runs one step
+at a time. Peak RSS is empty where the platform cannot
+reset the high-water mark and the step did not raise it.
+
+    python -m agentic_tools.orchestrator.ledger [--last N] [--threshold 1.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+_ledger_setting = os.environ.get(
+    "AGENTIC_RUN_LEDGER",
+    str(Path.home() / ".cache" / "agentic_tools" / "run_ledger.sqlite3"),
+)
+# An empty AGENTIC_RUN_LEDGER turns the ledger off.
+DEFAULT_LEDGER_PATH: Optional[Path] = Path(_ledger_setting).expanduser() if _ledger_setting else None
+
+DEFAULT_LAST_RUNS = 10
+DEFAULT_SLOWDOWN = 1.25
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        step TEXT NOT NULL,
+        agent TEXT NOT NULL,
+        started REAL NOT NULL,
+        status TEXT NOT NULL,
+        wall_s REAL,
+        cpu_s REAL,
+        peak_rss_bytes INTEGER,
+        result_bytes INTEGER,
+        cache TEXT,
+        error TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS runs_agent_started ON runs (agent, started)",
+    "CREATE INDEX IF NOT EXISTS runs_run_id ON runs (run_id)",
+)
+
+_COLUMNS = (
+    "run_id", "step", "agent", "started", "status", "wall_s", "cpu_s",
+    "peak_rss_bytes", "result_bytes", "cache", "error",
+)
+
+
+class RunLedger:
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path).expanduser() if path else DEFAULT_LEDGER_PATH
+        if self.path is None:
+            raise ValueError("AGENTIC_RUN_LEDGER is empty; the run ledger is disabled")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def record(self, rows: Iterable[Dict[str, Any]]) -> int:
+        values = [tuple(row.get(column) for column in _COLUMNS) for row in rows]
+        if not values:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    values,
+                )
+        return len(values)
+
+    def recent(self, agent: str, limit: int = DEFAULT_LAST_RUNS, include_cached: bool = False) -> List[Dict[str, Any]]:
+        """The agent's latest runs, newest first."""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM runs WHERE agent = ?"
+        if not include_cached:
+            sql += " AND (cache IS NULL OR cache = 'ran')"
+        sql += " ORDER BY started DESC LIMIT ?"
+        with self._lock:
+            rows = self._connection().execute(sql, (agent, int(limit))).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def agents(self) -> List[str]:
+        with self._lock:
+            rows = self._connection().execute("SELECT DISTINCT agent FROM runs ORDER BY agent").fetchall()
+        return [row[0] for row in rows]
+
+    def compare(self, last: int = DEFAULT_LAST_RUNS, threshold: float = DEFAULT_SLOWDOWN) -> List[Dict[str, Any]]:
+        """Per agent: the latest successful run against the median of the ones before it."""
+        report = []
+        for agent in self.agents():
+            runs = self.recent(agent, last)
+            succeeded = [run for run in runs if run["status"] == "succeeded" and run["wall_s"] is not None]
+            row: Dict[str, Any] = {
+                "agent": agent,
+                "runs": len(runs),
+                "failures": sum(run["status"] != "succeeded" for run in runs),
+                "last_wall_s": None,
+                "median_wall_s": None,
+                "ratio": None,
+                "last_cpu_s": None,
+                "peak_rss_bytes": max((run["peak_rss_bytes"] or 0 for run in runs), default=0) or None,
+                "last_result_bytes": None,
+                "slower": False,
+            }
+            if succeeded:
+                latest = succeeded[0]
+                row.update(
+                    last_wall_s=latest["wall_s"],
+                    last_cpu_s=latest["cpu_s"],
+                    last_result_bytes=latest["result_bytes"],
+                )
+                previous = [run["wall_s"] for run in succeeded[1:]]
+                if previous:
+                    median = statistics.median(previous)
+                    row["median_wall_s"] = median
+                    if median > 0:
+                        row["ratio"] = latest["wall_s"] / median
+                        row["slower"] = row["ratio"] > threshold
+            report.append(row)
+        return report
+
+
+_default: Optional[RunLedger] = None
+_default_lock = threading.Lock()
+
+
+def default_ledger() -> Optional[RunLedger]:
+    """The shared ledger at the default path, or None when it is disabled."""
+    global _default
+    if DEFAULT_LEDGER_PATH is None:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = RunLedger()
+        return _default
+
+
+def format_report(rows: List[Dict[str, Any]], threshold: float = DEFAULT_SLOWDOWN) -> str:
+    if not rows:
+        return "No agent runs recorded."
+
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+
+    def size(value):
+        if value is None:
+            return "-"
+        for unit in ("B", "K", "M", "G"):
+            if value < 1024 or unit == "G":
+                return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+            value /= 1024
+
+    width = max(len("agent"), *(len(row["agent"]) for row in rows))
+    header = (
+        f"{'agent':<{width}}  {'runs':>4}  {'fail':>4}  {'last':>8}  {'median':>8}  {'ratio':>6}  "
+        f"{'cpu':>8}  {'peak rss':>8}  {'result':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        flag = "  SLOWER" if row["slower"] else ""
+        lines.append(
+            f"{row['agent']:<{width}}  {row['runs']:>4}  {row['failures']:>4}  {seconds(row['last_wall_s']):>8}  "
+            f"{seconds(row['median_wall_s']):>8}  {ratio:>6}  {seconds(row['last_cpu_s']):>8}  "
+            f"{size(row['peak_rss_bytes']):>8}  {size(row['last_result_bytes']):>8}{flag}"
+        )
+    slower = [row["agent"] for row in rows if row["slower"]]
+    lines.append(
+        f"{len(slower)} agent(s) slower than {threshold:g}x their median: {', '.join(slower)}"
+        if slower else f"No agent slower than {threshold:g}x its median."
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare recent agent runs from the run ledger")
+    parser.add_argument("--last", type=int, default=DEFAULT_LAST_RUNS, help="Runs per agent to compare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SLOWDOWN,
+                        help="Flag agents whose latest run exceeds this multiple of their median")
+    parser.add_argument("--ledger", default=None, help="Ledger path (default: $AGENTIC_RUN_LEDGER)")
+    args = parser.parse_args(argv)
+
+    try:
+        ledger = RunLedger(args.ledger)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    rows = ledger.compare(last=args.last, threshold=args.threshold)
+    print(format_report(rows, args.threshold))
+    # Non-zero when something regressed, so this can gate a cron job or CI.
+    return 1 if any(row["slower"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
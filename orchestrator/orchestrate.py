@@ -1,7 +1,9 @@
 import argparse
 import importlib
+import json
 from datetime import datetime
 from agentic_tools.workspace_logger.logger import log_milestone
+from agentic_tools.orchestrator import dag, ledger, registry
 
 def run_agent(name: str, func):
     timestamp = datetime.now().isoformat()
@@ -21,15 +23,189 @@ def run_agent(name: str, func):
             "reflection": str(e)
         })
 
+def _parse_params(pairs):
+    params = {}
+    for pair in pairs or []:
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise SystemExit(f"--param expects KEY=VALUE, got {pair!r}")
+        params[key] = value
+    return params
+
+
+def list_agents():
+    for spec in registry.list_agents():
+        params = ", ".join(
+            f"{name}: {type_name}{'' if name not in spec.required else ' (required)'}"
+            for name, type_name in spec.params.items()
+        )
+        print(f"{spec.name:<16} {spec.entrypoint}")
+        print(f"{'':<16} {spec.description}")
+        if params:
+            print(f"{'':<16} params: {params}")
+    print()
+    for name, steps in registry.PLANS.items():
+        print(f"plan {name}: " + ", ".join(
+            step.name + (f" (after {', '.join(step.dependencies)})" if step.dependencies else "")
+            for step in steps
+        ))
+
+
+def validate_agents():
+    failures = {name: problems for name, problems in registry.validate_registry().items() if problems}
+    for problems in failures.values():
+        for problem in problems:
+            print(problem)
+    print(f"{len(registry.AGENTS) - len(failures)}/{len(registry.AGENTS)} agents valid")
+    for name, steps in registry.PLANS.items():
+        for problem in registry.validate_plan(steps):
+            failures.setdefault(f"plan {name}", []).append(problem)
+            print(f"plan {name}: {problem}")
+    return not failures
+
+
+def run_registered(name, raw_params, depth=None, limit=None, timeout=None, fresh=False):
+    spec = registry.get_agent(name)
+    raw_params = dict(raw_params)
+    # --depth/--limit still work for agents that declare them.
+    for key, value in (("depth", depth), ("limit", limit)):
+        if value is not None and key in spec.params:
+            raw_params.setdefault(key, str(value))
+    params = registry.coerce_params(spec, raw_params)
+
+    log_milestone({
+        "timestamp": datetime.now().isoformat(),
+        "mode": "FLOW",
+        "note": f"Orchestrator started for agent {spec.name}",
+        "reflection": f"Entrypoint {spec.entrypoint} with params {params}"
+    })
+    step = registry.PlanStep(spec.name, spec.name, params=params, timeout=timeout)
+    return dag.run_plan([step], fresh=fresh)
+
+
+def run_plan(name, workers=dag.DEFAULT_MAX_WORKERS, mode="thread", timeout=None, fresh=False):
+    if name not in registry.PLANS:
+        raise KeyError(f"Unknown plan {name!r}; known plans: {', '.join(sorted(registry.PLANS))}")
+    log_milestone({
+        "timestamp": datetime.now().isoformat(),
+        "mode": "FLOW",
+        "note": f"Orchestrator started for plan {name}",
+        "reflection": f"workers={workers}, mode={mode}, default timeout={timeout}"
+    })
+    report = dag.run_plan(registry.PLANS[name], max_workers=workers, mode=mode, default_timeout=timeout, fresh=fresh)
+    print(report.format())
+    return report
+
+
+def ledger_report(last, threshold):
+    store = ledger.default_ledger()
+    if store is None:
+        print("The run ledger is disabled (AGENTIC_RUN_LEDGER is empty)")
+        return 2
+    rows = store.compare(last=last, threshold=threshold)
+    print(ledger.format_report(rows, threshold))
+    return 1 if any(row["slower"] for row in rows) else 0
+
+
+def daemon_command(args):
+    # Imported here so --help and --list stay free of the daemon's socket setup.
+    from agentic_tools.orchestrator import daemon
+
+    socket_path = args.socket or daemon.DEFAULT_SOCKET
+    if args.daemon:
+        daemon.OrchestratorDaemon(socket_path, max_workers=args.workers).serve_forever()
+        return 0
+
+    if args.daemon_status:
+        request = {"cmd": "status"}
+    elif args.stop_daemon:
+        request = {"cmd": "stop"}
+    elif args.agent:
+        params = _parse_params(args.param)
+        try:
+            declared = registry.get_agent(args.agent).params
+        except KeyError as e:
+            return e.args[0]
+        for key, value in (("depth", args.depth), ("limit", args.limit)):
+            if value is not None and key in declared:
+                params.setdefault(key, str(value))
+        request = {"agent": args.agent, "params": params, "timeout": args.timeout, "fresh": args.fresh}
+    elif args.plan:
+        request = {"plan": args.plan, "timeout": args.timeout, "fresh": args.fresh}
+    else:
+        return "--remote needs -a/--agent or --plan"
+
+    try:
+        reply = daemon.send_request(request, socket_path)
+    except OSError as e:
+        return f"No orchestrator daemon at {socket_path}: {e}"
+    print(json.dumps(reply, indent=2, default=str))
+    return 0 if reply.get("ok") else 1
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run agentic tool via orchestrator")
-    parser.add_argument("-m", "--module", required=True, help="Agent module path (e.g. agentic_tools.agents.disk_hygiene.disk_hygiene_agent)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-a", "--agent", help="Registered agent name (see --list)")
+    target.add_argument("--plan", help="Run a named plan of agents as a dependency graph (see --list)")
+    target.add_argument("--daemon", action="store_true", help="Stay running: serve cron schedules and socket requests")
+    target.add_argument("--daemon-status", action="store_true", help="Show the running daemon's schedules and runs")
+    target.add_argument("--stop-daemon", action="store_true", help="Ask the running daemon to exit")
+    target.add_argument("-m", "--module", help="Agent module path (e.g. agentic_tools.agents.disk_hygiene.disk_hygiene_agent)")
+    target.add_argument("--list", action="store_true", help="List registered agents without importing them")
+    target.add_argument("--validate", action="store_true", help="Check every registered entrypoint against its source")
+    target.add_argument("--check-startup", nargs="?", type=float, const=registry.DEFAULT_STARTUP_BUDGET, metavar="SECONDS",
+                        help="Fail if --help or --list exceed the startup budget or import an agent")
+    target.add_argument("--ledger-report", nargs="?", type=int, const=ledger.DEFAULT_LAST_RUNS, metavar="N",
+                        help="Compare each agent's last N recorded runs and flag slowdowns")
+    parser.add_argument("-p", "--param", action="append", metavar="KEY=VALUE", help="Agent parameter (repeatable)")
+    parser.add_argument("--timeout", type=float, help="Per-agent timeout in seconds")
+    parser.add_argument("--workers", type=int, default=dag.DEFAULT_MAX_WORKERS, help="Agents run concurrently in a plan")
+    parser.add_argument("--processes", action="store_true", help="Run plan steps in worker processes instead of threads")
+    parser.add_argument("--fresh", action="store_true", help="Ignore cached agent results and run again")
+    parser.add_argument("--slowdown", type=float, default=ledger.DEFAULT_SLOWDOWN,
+                        help="With --ledger-report: flag agents slower than this multiple of their median run")
+    parser.add_argument("--remote", action="store_true", help="Send -a/--plan to the running daemon instead of running here")
+    parser.add_argument("--socket", default=None, help="Daemon socket path (default: $AGENTIC_ORCHESTRATOR_SOCKET)")
     parser.add_argument("--class", dest="class_name", default=None, help="Agent class name (if applicable)")
     parser.add_argument("--method", dest="method_name", default=None, help="Method to invoke (if applicable)")
     parser.add_argument("--depth", type=int, help="Optional depth parameter")
     parser.add_argument("--limit", type=int, help="Optional limit parameter")
     args = parser.parse_args()
 
+    if args.list:
+        list_agents()
+        return
+    if args.validate:
+        raise SystemExit(0 if validate_agents() else 1)
+    if args.check_startup is not None:
+        problems = registry.check_startup(args.check_startup)
+        for problem in problems:
+            print(problem)
+        print("startup check " + ("failed" if problems else f"passed (budget {args.check_startup:.3f}s)"))
+        raise SystemExit(1 if problems else 0)
+    if args.ledger_report is not None:
+        raise SystemExit(ledger_report(args.ledger_report, args.slowdown))
+    if args.daemon or args.daemon_status or args.stop_daemon or args.remote:
+        raise SystemExit(daemon_command(args))
+    if args.agent or args.plan:
+        try:
+            if args.agent:
+                report = run_registered(args.agent, _parse_params(args.param), depth=args.depth, limit=args.limit,
+                                        timeout=args.timeout, fresh=args.fresh)
+            else:
+                report = run_plan(args.plan, workers=args.workers, mode="process" if args.processes else "thread",
+                                  timeout=args.timeout, fresh=args.fresh)
+        except (KeyError, ValueError) as e:
+            log_milestone({
+                "timestamp": datetime.now().isoformat(),
+                "mode": "ERROR",
+                "note": f"Orchestrator failed for {'agent ' + args.agent if args.agent else 'plan ' + args.plan}",
+                "reflection": e.args[0] if e.args else str(e)
+            })
+            raise SystemExit(e.args[0] if e.args else str(e))
+        raise SystemExit(0 if report.ok else 1)
+
     timestamp = datetime.now().isoformat()
     log_milestone({
         "timestamp": timestamp,
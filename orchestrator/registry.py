@@ -0,0 +1,377 @@
+"""Declarative agent registry.
+
+Each agent is described by data only: an entrypoint of the form
+``"package.module:function"`` or ``"package.module:Class.method"`` (the class
+is instantiated without arguments) and the parameters it accepts. Listing and
+validating the registry never imports an agent; validation parses the agent's
+source with ``ast`` to check that the entrypoint exists and takes the declared
+parameters. The module is imported only by ``load_entrypoint`` when the agent
+actually runs. Entrypoints declared ``async def`` are registered with
+``is_async=True`` and run on the orchestrator's event loop (see
+``async_agents``).
+
+``check_startup`` times ``orchestrate --help`` and ``--list`` in fresh
+interpreters against a budget and fails if either imported an agent module or
+one of its heavy dependencies.
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "agentic_tools"
+
+PARAM_TYPES: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "bool": lambda value: value.strip().lower() in ("1", "true", "yes", "on"),
+    "list": lambda value: [item.strip() for item in value.split(",") if item.strip()],
+}
+
+DEFAULT_STARTUP_BUDGET = float(os.environ.get("AGENTIC_STARTUP_BUDGET", "0.5"))
+# Modules that must never be imported just to print help or list agents.
+HEAVY_MODULES = ("yaml", "yfinance", "pandas", "numpy", "requests", "bs4")
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    name: str
+    entrypoint: str
+    description: str = ""
+    # Parameter name -> type name from PARAM_TYPES.
+    params: Dict[str, str] = field(default_factory=dict)
+    required: Tuple[str, ...] = ()
+    # Heavy modules the entrypoint imports lazily; a daemon preloads them.
+    warm_imports: Tuple[str, ...] = ()
+    # Seconds a result may be reused for identical arguments; None disables
+    # caching. A cache hit skips the run entirely, so only agents whose run has
+    # no side effects (alerts, history, cleanup) may set one.
+    cache_ttl: Optional[float] = None
+    # The entrypoint is a coroutine function.
+    is_async: bool = False
+
+    @property
+    def module(self) -> str:
+        return self.entrypoint.partition(":")[0]
+
+    @property
+    def attribute(self) -> str:
+        return self.entrypoint.partition(":")[2]
+
+
+AGENTS: Tuple[AgentSpec, ...] = (
+    AgentSpec(
+        name="disk_hygiene",
+        entrypoint="agents.disk_hygiene.disk_hygiene_agent:check_disk_usage",
+        description="Scan disk usage, reflect on large entries and prune safe targets.",
+        params={"depth": "int", "limit": "int"},
+        warm_imports=("numpy",),
+    ),
+    AgentSpec(
+        name="disk_watch",
+        entrypoint="agents.disk_hygiene.disk_hygiene_agent:watch_disk_usage",
+        description="Keep a live size tree and report from it on an interval.",
+        params={"interval": "float", "depth": "int", "limit": "int", "check_thresholds": "bool"},
+    ),
+    AgentSpec(
+        name="threshold_alert",
+        entrypoint="agents.threshold_alert.threshold_agent_alert:check_thresholds",
+        description="Check configured size thresholds and forecast breaches.",
+        params={
+            "forecast_horizon_days": "float",
+            "forecast_method": "str",
+            "forecast_window_days": "float",
+        },
+        warm_imports=("yaml", "numpy"),
+    ),
+    AgentSpec(
+        name="stock_snapshot",
+        entrypoint="orchestrator.stock_snapshot:fetch_stock_data_async",
+        description="Fetch a Global Quote snapshot from Alpha Vantage.",
+        params={"ticker": "str"},
+        required=("ticker",),
+        warm_imports=("requests",),
+        cache_ttl=60,
+        is_async=True,
+    ),
+    AgentSpec(
+        name="top_asx",
+        entrypoint="agents.fetch_top_asx:fetch_top_asx_async",
+        description="Scrape ASX tickers and rank them by today's volume.",
+        params={"limit": "int", "concurrency": "int"},
+        warm_imports=("requests", "bs4", "yfinance"),
+        cache_ttl=600,
+        is_async=True,
+    ),
+    AgentSpec(
+        name="scrape_asx",
+        entrypoint="agents.scrape_asx_tickers:scrape_asx_tickers_async",
+        description="Scrape the list of ASX-listed tickers.",
+        warm_imports=("requests", "bs4"),
+        cache_ttl=3600,
+        is_async=True,
+    ),
+    AgentSpec(
+        name="rank_asx",
+        entrypoint="agents.rank_asx_tickers:rank_tickers_by_volume_async",
+        description="Rank tickers by today's traded volume.",
+        params={"tickers": "list", "limit": "int", "concurrency": "int"},
+        required=("tickers",),
+        warm_imports=("yfinance",),
+        cache_ttl=600,
+        is_async=True,
+    ),
+    AgentSpec(
+        name="stock_analysis",
+        entrypoint="agents.stock_analysis.stock_analysis_agent:StockAnalysisAgent.run",
+        description="Run the agentic_stock_system_starter backtest pipeline.",
+    ),
+)
+
+_BY_NAME = {spec.name: spec for spec in AGENTS}
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One node of a run plan.
+
+    ``inputs`` maps an agent parameter to the name of a step whose result is
+    passed in; those steps are implicit dependencies. ``timeout`` (seconds)
+    overrides the executor's default for this step.
+    """
+
+    name: str
+    agent: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    after: Tuple[str, ...] = ()
+    inputs: Dict[str, str] = field(default_factory=dict)
+    timeout: Optional[float] = None
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(self.after + tuple(self.inputs.values())))
+
+
+PLANS: Dict[str, Tuple[PlanStep, ...]] = {
+    "disk": (
+        PlanStep("disk_scan", "disk_hygiene"),
+        # Runs after the scan so it can reuse the size index the scan refreshed.
+        PlanStep("thresholds", "threshold_alert", after=("disk_scan",)),
+    ),
+    "asx": (
+        PlanStep("scrape", "scrape_asx", timeout=120),
+        PlanStep("rank", "rank_asx", params={"limit": 10}, inputs={"tickers": "scrape"}, timeout=300),
+    ),
+}
+PLANS["all"] = PLANS["disk"] + PLANS["asx"]
+
+
+def list_agents() -> List[AgentSpec]:
+    return list(AGENTS)
+
+
+def get_agent(name: str) -> AgentSpec:
+    try:
+        return _BY_NAME[name]
+    except KeyError:
+        raise KeyError(f"Unknown agent {name!r}; known agents: {', '.join(sorted(_BY_NAME))}") from None
+
+
+def module_path(module: str) -> Path:
+    base = REPO_ROOT.joinpath(*module.split("."))
+    package_init = base / "__init__.py"
+    return package_init if package_init.exists() else base.with_suffix(".py")
+
+
+def _find_callable(tree: ast.Module, attribute: str) -> Optional[ast.AST]:
+    node: Optional[ast.AST] = tree
+    for part in attribute.split("."):
+        body = getattr(node, "body", [])
+        node = next(
+            (
+                child
+                for child in body
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and child.name == part
+            ),
+            None,
+        )
+        if node is None:
+            return None
+    return node
+
+
+def validate_agent(spec: AgentSpec) -> List[str]:
+    """Problems with ``spec``, found from source alone; empty when valid."""
+    problems: List[str] = []
+    if not spec.module or not spec.attribute:
+        return [f"{spec.name}: entrypoint must look like 'module:function', got {spec.entrypoint!r}"]
+    for param, type_name in spec.params.items():
+        if type_name not in PARAM_TYPES:
+            problems.append(f"{spec.name}: parameter {param!r} has unknown type {type_name!r}")
+    for param in spec.required:
+        if param not in spec.params:
+            problems.append(f"{spec.name}: required parameter {param!r} is not declared")
+
+    path = module_path(spec.module)
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError) as exc:
+        return problems + [f"{spec.name}: cannot read {path}: {exc}"]
+
+    target = _find_callable(tree, spec.attribute)
+    if target is None:
+        return problems + [f"{spec.name}: {spec.attribute} is not defined in {path}"]
+    if isinstance(target, ast.ClassDef):
+        return problems + [f"{spec.name}: entrypoint {spec.attribute} is a class, not a function or method"]
+    if isinstance(target, ast.AsyncFunctionDef) != spec.is_async:
+        kind = "a coroutine function" if isinstance(target, ast.AsyncFunctionDef) else "not a coroutine function"
+        problems.append(f"{spec.name}: {spec.attribute} is {kind} but is_async={spec.is_async}")
+
+    args = target.args
+    positional = args.posonlyargs + args.args
+    if "." in spec.attribute:
+        positional = positional[1:]  # self
+    accepted = {arg.arg for arg in positional + args.kwonlyargs}
+    if args.kwarg is None:
+        for param in spec.params:
+            if param not in accepted:
+                problems.append(f"{spec.name}: {spec.attribute} does not accept {param!r}")
+
+    without_default = [arg.arg for arg in positional[: len(positional) - len(args.defaults)]]
+    without_default += [arg.arg for arg, default in zip(args.kwonlyargs, args.kw_defaults) if default is None]
+    for param in without_default:
+        if param not in spec.required:
+            problems.append(f"{spec.name}: {spec.attribute} needs {param!r}, which is not a required parameter")
+    return problems
+
+
+def validate_registry(specs: Optional[Sequence[AgentSpec]] = None) -> Dict[str, List[str]]:
+    return {spec.name: validate_agent(spec) for spec in (AGENTS if specs is None else specs)}
+
+
+def validate_plan(steps: Sequence[PlanStep]) -> List[str]:
+    """Unknown agents or parameters, missing dependencies and cycles in a plan."""
+    problems: List[str] = []
+    names = [step.name for step in steps]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        problems.append(f"duplicate step names: {', '.join(duplicates)}")
+    by_name = {step.name: step for step in steps}
+
+    for step in steps:
+        spec = _BY_NAME.get(step.agent)
+        if spec is None:
+            problems.append(f"{step.name}: unknown agent {step.agent!r}")
+            continue
+        for param in list(step.params) + list(step.inputs):
+            if param not in spec.params:
+                problems.append(f"{step.name}: {step.agent} does not take parameter {param!r}")
+        for param in spec.required:
+            if param not in step.params and param not in step.inputs:
+                problems.append(f"{step.name}: {step.agent} requires {param!r}")
+        for dependency in step.dependencies:
+            if dependency not in by_name:
+                problems.append(f"{step.name}: depends on unknown step {dependency!r}")
+
+    # Kahn's algorithm: anything left unvisited sits on a cycle.
+    pending = {step.name: {dep for dep in step.dependencies if dep in by_name} for step in steps}
+    ready = [name for name, deps in pending.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del pending[done]
+        for name, deps in pending.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(name)
+    if pending:
+        problems.append(f"dependency cycle through: {', '.join(sorted(pending))}")
+    return problems
+
+
+def coerce_params(spec: AgentSpec, raw: Dict[str, str]) -> Dict[str, Any]:
+    """Convert ``KEY=VALUE`` strings to the declared parameter types."""
+    params: Dict[str, Any] = {}
+    for key, value in raw.items():
+        if key not in spec.params:
+            raise ValueError(f"{spec.name} does not take parameter {key!r}; expected one of {sorted(spec.params)}")
+        try:
+            params[key] = PARAM_TYPES[spec.params[key]](value)
+        except ValueError:
+            raise ValueError(f"{spec.name}: {key}={value!r} is not a valid {spec.params[key]}") from None
+    missing = [param for param in spec.required if param not in params]
+    if missing:
+        raise ValueError(f"{spec.name} requires {', '.join(missing)}")
+    return params
+
+
+def _import_agent_module(module: str):
+    try:
+        return importlib.import_module(f"{PACKAGE}.{module}")
+    except ModuleNotFoundError as exc:
+        if exc.name not in (PACKAGE, f"{PACKAGE}.{module}"):
+            raise
+        repo_root_str = str(REPO_ROOT)
+        if repo_root_str not in sys.path:
+            sys.path.insert(0, repo_root_str)
+        return importlib.import_module(module)
+
+
+def load_entrypoint(spec: AgentSpec) -> Callable[..., Any]:
+    """Import the agent's module and return a callable for its entrypoint."""
+    target: Any = _import_agent_module(spec.module)
+    parts = spec.attribute.split(".")
+    target = getattr(target, parts[0])
+    if len(parts) > 1:
+        target = target()
+        for part in parts[1:]:
+            target = getattr(target, part)
+    return target
+
+
+def _imported_modules(importtime_stderr: str) -> List[str]:
+    modules = []
+    for line in importtime_stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.append(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def check_startup(budget: float = DEFAULT_STARTUP_BUDGET) -> List[str]:
+    """Run ``--help`` and ``--list`` in fresh interpreters; return budget or import violations."""
+    orchestrate = f"{__package__}.orchestrate" if __package__ else "orchestrator.orchestrate"
+    agent_modules = {spec.module for spec in AGENTS}
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(entry for entry in [str(REPO_ROOT.parent), *sys.path] if entry)
+
+    problems: List[str] = []
+    for flag in ("--help", "--list"):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", orchestrate, flag],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        elapsed = time.perf_counter() - started
+        if completed.returncode != 0:
+            problems.append(f"{flag} exited with {completed.returncode}: {completed.stderr.strip()[-500:]}")
+            continue
+        if elapsed > budget:
+            problems.append(f"{flag} took {elapsed:.3f}s (budget {budget:.3f}s)")
+
+        for imported in _imported_modules(completed.stderr):
+            bare = imported[len(PACKAGE) + 1:] if imported.startswith(PACKAGE + ".") else imported
+            if bare in agent_modules or imported.split(".")[0] in HEAVY_MODULES:
+                problems.append(f"{flag} imported {imported}")
+    return problems
@@ -0,0 +1,169 @@
+"""In-process result cache for agent runs.
+
+Results are keyed by agent name and its arguments, normalized by binding
+them to the entrypoint's signature with defaults applied, so ``limit=10``
+and an omitted ``limit`` that defaults to 10 share an entry. Each agent sets
+its own TTL (``AgentSpec.cache_ttl``; agents without one are never cached,
+which includes every agent whose run has side effects such as alerting or
+cleaning up), and the cache holds at most ``max_entries`` results, evicting the least
+recently used.
+
+Concurrent identical requests are single-flighted: the first caller runs
+the agent and the others wait for its result (or its exception; failures
+are never cached). A ``fresh`` request skips cached results but still joins
+a run that is already in flight, since that run started no earlier than it.
+``get_or_run_async`` is the same for coroutine agents on the event loop.
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("AGENTIC_RESULT_CACHE_SIZE", "128"))
+
+# How a result was obtained.
+RAN, HIT, SHARED = "ran", "hit", "shared"
+
+
+def normalize_arguments(func: Callable[..., Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        bound = inspect.signature(func).bind(**params)
+    except (TypeError, ValueError):
+        return dict(params)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def cache_key(agent: str, arguments: Dict[str, Any]) -> str:
+    return agent + ":" + json.dumps(arguments, sort_keys=True, default=repr)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {RAN: 0, HIT: 0, SHARED: 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _claim(self, key: str, fresh: bool) -> Tuple[str, Any]:
+        """``(HIT, value)``, ``(SHARED, flight)`` to wait on, or ``(RAN, flight)`` to lead."""
+        now = time.monotonic()
+        with self._lock:
+            if not fresh:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        self._entries.move_to_end(key)
+                        self.stats[HIT] += 1
+                        return HIT, entry[1]
+                    del self._entries[key]
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.stats[SHARED] += 1
+                return SHARED, flight
+            flight = self._inflight[key] = _Flight()
+            return RAN, flight
+
+    def _store(self, key: str, ttl: float, value: Any) -> None:
+        with self._lock:
+            self.stats[RAN] += 1
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        flight.done.set()
+
+    def get_or_run(self, key: str, ttl: float, run: Callable[[], Any], fresh: bool = False) -> Tuple[Any, str]:
+        """``(result, how)`` where ``how`` is ``"ran"``, ``"hit"`` or ``"shared"``."""
+        how, claimed = self._claim(key, fresh)
+        if how == HIT:
+            return claimed, HIT
+        if how == SHARED:
+            return claimed.wait(), SHARED
+
+        try:
+            value = run()
+        except BaseException as exc:
+            claimed.error = exc
+            raise
+        else:
+            claimed.value = value
+            self._store(key, ttl, value)
+            return value, RAN
+        finally:
+            self._land(key, claimed)
+
+    async def get_or_run_async(
+        self, key: str, ttl: float, run: Callable[[], Awaitable[Any]], fresh: bool = False
+    ) -> Tuple[Any, str]:
+        """``get_or_run`` for coroutines; waiting on a shared run does not block the loop."""
+        how, claimed = self._claim(key, fresh)
+        if how == HIT:
+            return claimed, HIT
+        if how == SHARED:
+            return await asyncio.to_thread(claimed.wait), SHARED
+
+        try:
+            value = await run()
+        except BaseException as exc:
+            claimed.error = exc
+            raise
+        else:
+            claimed.value = value
+            self._store(key, ttl, value)
+            return value, RAN
+        finally:
+            self._land(key, claimed)
+
+    def invalidate(self, agent: Optional[str] = None) -> int:
+        """Drop every entry, or only ``agent``'s; returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if agent is None or key.startswith(agent + ":")]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+_default: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> ResultCache:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ResultCache()
+        return _default
@@ -1,8 +1,9 @@
 from agentic_tools.workspace_logger.logger import log_milestone
-from agentic_tools.agents.disk_hygiene.disk_hygiene_agent import check_disk_usage
+from agentic_tools.orchestrator import dag
+from agentic_tools.orchestrator.registry import PLANS
 from datetime import datetime
 
-def launch():
+def launch(plan="disk", max_workers=dag.DEFAULT_MAX_WORKERS, timeout=None):
 
     log_milestone({
         "timestamp": datetime.now().isoformat(),
@@ -11,24 +12,24 @@ def launch():
         "reflection": "Execution context confirmed—launching agentic flow"
     })
 
-    # Run disk usage agent
-    result = check_disk_usage()
+    # Agents run as a dependency graph (see registry.PLANS): independent
+    # ones in parallel, threshold checks only after the disk scan.
+    report = dag.run_plan(PLANS[plan], max_workers=max_workers, default_timeout=timeout)
+    print(report.format())
 
     log_milestone({
         "timestamp": datetime.now().isoformat(),
         "mode": "REFLECT",
-        "note": "📊 Disk usage result",
-        "reflection": str(result)
+        "note": "📊 Run plan result",
+        "reflection": f"Critical path: {' -> '.join(report.critical_path)}; wall {report.wall:.2f}s"
     })
 
-    # Add more agent calls here as needed
-    # e.g., threshold checks, cleanup routines, sunset scans
-
     log_milestone({
         "timestamp": datetime.now().isoformat(),
         "mode": "FLOW",
         "note": "✅ Orchestration complete",
         "reflection": "All agents executed successfully—milestones logged and workspace state updated"
+        if report.ok else "Some agents failed, timed out or were skipped—see the run plan summary"
     })
 
 if __name__ == "__main__":
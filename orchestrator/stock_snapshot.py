@@ -1,23 +1,31 @@
-import requests
 from datetime import datetime
 from agentic_tools.workspace_logger.logger import log_milestone
+from agentic_tools.workspace_logger.spans import span
 
+import asyncio
 import os
 
-API_KEY = os.getenv("ALPHAVANTAGE_API_KEY")
-if not API_KEY:
-    log_milestone(
-        mode="ERROR",
-        note="Missing Alpha Vantage API key",
-        reflection="Set ALPHAVANTAGE_API_KEY in environment or config"
-    )
-    exit()
+BASE_URL = "https://www.alphavantage.co/query"
 
+@span("stock.fetch", label_args=("ticker",))
 def fetch_stock_data(ticker):
+    # Checked per call rather than at import so the orchestrator can load
+    # this module (and report the problem) without exiting.
+    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
+    if not api_key:
+        log_milestone(
+            mode="ERROR",
+            note="Missing Alpha Vantage API key",
+            reflection="Set ALPHAVANTAGE_API_KEY in environment or config"
+        )
+        return {"error": "ALPHAVANTAGE_API_KEY is not set"}
+
+    import requests
+
     params = {
         "function": "GLOBAL_QUOTE",
         "symbol": ticker,
-        "apikey": API_KEY
+        "apikey": api_key
     }
     try:
         response = requests.get(BASE_URL, params=params)
@@ -44,6 +52,10 @@ def fetch_stock_data(ticker):
         )
         return {"error": str(e)}
 
+async def fetch_stock_data_async(ticker):
+    # requests is blocking; run it on a thread so the event loop keeps going.
+    return await asyncio.to_thread(fetch_stock_data, ticker)
+
 def log_stock_snapshot(snapshot, metadata=None):
     if "error" in snapshot:
         print("Error:", snapshot["error"])
@@ -0,0 +1,32 @@
+"""Make the checkout importable as ``agentic_tools`` and keep logs out of the tree.
+
+The modules import each other through the ``agentic_tools`` package name,
+which is the name of the directory this repository is checked out into in
+deployment. Under any other checkout name the package is loaded from the
+repository root under that name instead.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The logger reads these when it is first imported.
+_LOG_DIR = tempfile.mkdtemp(prefix="agentic-tests-")
+os.environ.setdefault("AGENTIC_LOG_DIR", _LOG_DIR)
+os.environ.setdefault("AGENTIC_SPAN_SUMMARY", "0")
+os.environ.setdefault("AGENTIC_RUN_LEDGER", "")
+
+if "agentic_tools" not in sys.modules:
+    if ROOT.name == "agentic_tools":
+        sys.path.insert(0, str(ROOT.parent))
+    else:
+        spec = importlib.util.spec_from_file_location(
+            "agentic_tools", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["agentic_tools"] = package
+        spec.loader.exec_module(package)
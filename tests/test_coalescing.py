@@ -0,0 +1,22 @@
+from agentic_tools.workspace_logger.logger import flush_coalesced, flush_logs, log_milestone
+
+
+def _log_twice(path, key):
+    for index in range(2):
+        log_milestone("OBSERVE", note=f"{key} {index}", path=path, echo=False, coalesce=key)
+
+
+def test_flush_only_the_given_keys(tmp_path):
+    path = tmp_path / "milestones.txt"
+    _log_twice(path, "mine")
+    _log_twice(path, "theirs")
+
+    flush_coalesced(["mine"])
+    flush_logs()
+    lines = path.read_text().splitlines()
+    assert any("Note: mine: 1 more since" in line for line in lines)
+    assert not any("theirs: 1 more" in line for line in lines)
+
+    flush_coalesced()
+    flush_logs()
+    assert "Note: theirs: 1 more since" in path.read_text()
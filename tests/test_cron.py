@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from agentic_tools.orchestrator.cron import CronSchedule
+
+
+def _brute_force(schedule, moment, limit_days=800):
+    candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    end = moment + timedelta(days=limit_days)
+    while candidate <= end:
+        if schedule.matches(candidate):
+            return candidate
+        candidate += timedelta(minutes=1)
+    return None
+
+
+@pytest.mark.parametrize(
+    "expression, moment, expected",
+    [
+        ("*/15 * * * *", datetime(2026, 5, 4, 10, 7, 30), datetime(2026, 5, 4, 10, 15)),
+        ("*/15 * * * *", datetime(2026, 5, 4, 10, 15), datetime(2026, 5, 4, 10, 30)),
+        ("30 2 * * *", datetime(2026, 5, 4, 2, 30), datetime(2026, 5, 5, 2, 30)),
+        ("0 9 * * 1-5", datetime(2026, 5, 8, 9, 0), datetime(2026, 5, 11, 9, 0)),
+        ("0 0 1 * *", datetime(2026, 12, 15, 8, 0), datetime(2027, 1, 1, 0, 0)),
+        ("@weekly", datetime(2026, 5, 4, 0, 0), datetime(2026, 5, 10, 0, 0)),
+        ("0 12 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 12, 0)),
+        # Both day fields restricted: either one matching is enough.
+        ("0 6 13 * 5", datetime(2026, 5, 4), datetime(2026, 5, 8, 6, 0)),
+        ("0 0 * * 7", datetime(2026, 5, 4), datetime(2026, 5, 10, 0, 0)),
+    ],
+)
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize("expression", ["5,35 */6 * * *", "0 0 31 * *", "0 8 1-7 * 1", "45 23 * 2 0,6"])
+def test_next_after_agrees_with_minute_by_minute_search(expression):
+    schedule = CronSchedule(expression)
+    moment = datetime(2026, 1, 30, 22, 50)
+    for _ in range(5):
+        expected = _brute_force(schedule, moment)
+        assert schedule.next_after(moment) == expected
+        moment = expected
+
+
+def test_next_after_returns_none_past_the_horizon():
+    assert CronSchedule("0 0 30 2 *").next_after(datetime(2026, 1, 1)) is None
+    assert CronSchedule("0 0 29 2 *").next_after(datetime(2026, 3, 1), horizon_days=365) is None
+
+
+@pytest.mark.parametrize("expression", ["* * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from agentic_tools.orchestrator import dag, registry
+from agentic_tools.orchestrator.registry import AgentSpec, PlanStep
+
+
+def _ok(value=None):
+    return value if value is not None else "ok"
+
+
+def _boom(value=None):
+    raise RuntimeError("boom")
+
+
+def _slow(value=None):
+    time.sleep(2)
+    return "late"
+
+
+async def _async_ok(value=None):
+    return f"async {value}"
+
+
+AGENTS = {"ok": _ok, "boom": _boom, "slow": _slow, "async_ok": _async_ok}
+
+
+@pytest.fixture(autouse=True)
+def fake_agents(monkeypatch):
+    for name, func in AGENTS.items():
+        spec = AgentSpec(
+            name=f"test_{name}",
+            entrypoint=f"tests:{name}",
+            params={"value": "str"},
+            is_async=name.startswith("async"),
+        )
+        monkeypatch.setitem(registry._BY_NAME, spec.name, spec)
+    monkeypatch.setattr(registry, "load_entrypoint", lambda spec: AGENTS[spec.name[len("test_"):]])
+
+
+def _run(*steps, **options):
+    return dag.DagExecutor(list(steps), **options).run()
+
+
+def test_failure_skips_every_dependent_but_not_other_branches():
+    report = _run(
+        PlanStep("first", "test_ok", params={"value": "one"}),
+        PlanStep("fails", "test_boom", after=("first",)),
+        PlanStep("child", "test_ok", after=("fails",)),
+        PlanStep("grandchild", "test_ok", inputs={"value": "child"}),
+        PlanStep("independent", "test_async_ok", inputs={"value": "first"}),
+    )
+
+    statuses = {name: record.status for name, record in report.steps.items()}
+    assert statuses == {
+        "first": dag.SUCCEEDED,
+        "fails": dag.FAILED,
+        "child": dag.SKIPPED,
+        "grandchild": dag.SKIPPED,
+        "independent": dag.SUCCEEDED,
+    }
+    assert report.steps["fails"].error == "RuntimeError: boom"
+    assert report.steps["child"].error == report.steps["grandchild"].error == "fails failed"
+    assert report.results() == {"first": "one", "independent": "async one"}
+    assert not report.ok
+
+
+def test_timeout_abandons_the_step_and_skips_its_dependents():
+    started = time.monotonic()
+    report = _run(
+        PlanStep("slow", "test_slow", timeout=0.2),
+        PlanStep("after_slow", "test_ok", after=("slow",)),
+        PlanStep("other", "test_ok"),
+    )
+
+    assert time.monotonic() - started < 1.5
+    assert report.steps["slow"].status == dag.TIMED_OUT
+    assert report.steps["after_slow"].status == dag.SKIPPED
+    assert report.steps["after_slow"].error == "slow timeout"
+    assert report.steps["other"].status == dag.SUCCEEDED
+
+
+def test_invalid_plan_is_rejected_before_running():
+    with pytest.raises(ValueError, match="depends on unknown step"):
+        dag.DagExecutor([PlanStep("orphan", "test_ok", after=("missing",))])
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from agentic_tools.agents.disk_hygiene.disk_hygiene_agent import DiskHygieneAgent
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    for name, size in (("a/one.bin", 40_000), ("a/b/two.bin", 9_000), ("c/three.bin", 1_000)):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(size))
+    old = 400 * 86400
+    os.utime(root / "a" / "one.bin", (os.path.getatime(root / "a" / "one.bin") - old,) * 2)
+
+    agent = DiskHygieneAgent(scan_roots=[root], safe_cleanup_roots=[], incremental=False)
+    monkeypatch.setattr(agent, "write_summary", lambda report, path=None: None)
+    return agent
+
+
+def test_scan_report_is_plain_json(agent):
+    report = agent.scan(depth=2, limit=10, auto_cleanup=False, age_histograms=True, cold_days=180, cold_fraction=0.5)
+
+    assert report["du"] and report["cold"]
+    assert all(type(entry) is dict for entry in report["du"] + report["cold"])
+    decoded = json.loads(json.dumps(report))
+    assert decoded["du"][0]["size_bytes"] == max(entry["size_bytes"] for entry in report["du"])
+    assert decoded["du"][0]["ages"] == report["du"][0]["ages"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"cold_by": "ctime"},
+        {"age_histograms": True, "cold_days": 0},
+        {"age_histograms": True, "cold_days": -30},
+    ],
+)
+def test_scan_rejects_bad_cold_arguments_before_walking(agent, monkeypatch, kwargs):
+    def fail(*args, **kwargs):
+        raise AssertionError("scan went past argument checks")
+
+    monkeypatch.setattr(agent, "_run_df", fail)
+    monkeypatch.setattr(agent, "scan_iter", fail)
+
+    with pytest.raises(ValueError):
+        agent.scan(auto_cleanup=False, **kwargs)
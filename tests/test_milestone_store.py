@@ -0,0 +1,54 @@
+import sqlite3
+
+from agentic_tools.workspace_logger.store import MilestoneStore, parse_timestamp
+
+
+def _line(timestamp, note, extra=""):
+    return f"[{timestamp}] Mode: FLOW | Note: {note} | Reflection: r{extra}\n"
+
+
+def test_import_skips_records_already_logged_to_the_store(tmp_path):
+    store = MilestoneStore(tmp_path / "milestones.sqlite3")
+    store.insert_many([
+        {"timestamp": "2026-03-02T09:00:00", "mode": "FLOW", "note": "live one", "reflection": "r"},
+        {"timestamp": "2026-03-02T10:00:00", "mode": "FLOW", "note": "live two", "reflection": "r"},
+    ])
+    text = tmp_path / "milestones.txt"
+    text.write_text(
+        _line("2026-03-01T08:00:00", "old one")
+        + _line("2026-03-01T09:00:00", "old two", " | Extra: count=3")
+        + _line("2026-03-02T09:00:00", "live one")
+        + _line("2026-03-02T10:00:00", "live two")
+    )
+
+    assert store.import_text_file(text) == 2
+    assert store.import_text_file(text) == 0
+    assert store.import_text_file(text, force=True) == 2
+
+    notes = [entry["note"] for entry in store.query()]
+    assert notes == ["old one", "old two", "live one", "live two"]
+    # Imported extra values come back as the strings the text log held.
+    assert store.query(extra={"count": 3}) == []
+    assert [entry["note"] for entry in store.query(extra={"count": "3"})] == ["old two"]
+
+
+def test_import_into_a_store_without_the_source_column(tmp_path):
+    path = tmp_path / "milestones.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE milestones (id INTEGER PRIMARY KEY, ts REAL NOT NULL, timestamp TEXT NOT NULL, "
+        "mode TEXT NOT NULL, note TEXT NOT NULL, reflection TEXT NOT NULL, extra TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO milestones (ts, timestamp, mode, note, reflection) VALUES (?, ?, 'FLOW', 'live', 'r')",
+        (parse_timestamp("2026-03-02T09:00:00"), "2026-03-02T09:00:00"),
+    )
+    conn.commit()
+    conn.close()
+    text = tmp_path / "milestones.txt"
+    text.write_text(_line("2026-03-01T08:00:00", "old") + _line("2026-03-02T09:00:00", "live"))
+
+    store = MilestoneStore(path)
+
+    assert store.import_text_file(text) == 1
+    assert [entry["note"] for entry in store.query()] == ["old", "live"]
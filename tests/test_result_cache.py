@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agentic_tools.orchestrator import registry
+from agentic_tools.orchestrator.result_cache import HIT, RAN, SHARED, ResultCache, cache_key, normalize_arguments
+
+
+def _counting(value="v"):
+    calls = []
+
+    def run():
+        calls.append(1)
+        return value
+
+    return run, calls
+
+
+def test_hit_within_ttl_and_rerun_after_it(monkeypatch):
+    cache = ResultCache()
+    run, calls = _counting()
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+
+    assert cache.get_or_run("k", 10, run) == ("v", RAN)
+    assert cache.get_or_run("k", 10, run) == ("v", HIT)
+    clock[0] += 11
+    assert cache.get_or_run("k", 10, run) == ("v", RAN)
+    assert len(calls) == 2
+
+
+def test_fresh_skips_the_cached_result():
+    cache = ResultCache()
+    run, calls = _counting()
+    cache.get_or_run("k", 60, run)
+
+    assert cache.get_or_run("k", 60, run, fresh=True) == ("v", RAN)
+    assert len(calls) == 2
+
+
+def test_failures_are_not_cached():
+    cache = ResultCache()
+
+    def fail():
+        raise RuntimeError("nope")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_run("k", 60, fail)
+    assert cache.get_or_run("k", 60, lambda: "ok") == ("ok", RAN)
+
+
+def test_concurrent_identical_calls_share_one_run():
+    cache = ResultCache()
+    release = threading.Event()
+    calls = []
+
+    def run():
+        calls.append(1)
+        release.wait(5)
+        return "shared value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_run("k", 60, run))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while cache.stats[SHARED] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(how for _, how in results) == [RAN] + [SHARED] * 4
+    assert {value for value, _ in results} == {"shared value"}
+
+
+def test_async_calls_share_one_run():
+    cache = ResultCache()
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "async value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_run_async("k", 60, run) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert sorted(how for _, how in results) == [RAN, SHARED, SHARED]
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_run("a", 60, lambda: 1)
+    cache.get_or_run("b", 60, lambda: 2)
+    cache.get_or_run("a", 60, lambda: 1)
+    cache.get_or_run("c", 60, lambda: 3)
+
+    assert cache.get_or_run("a", 60, lambda: "rerun") == (1, HIT)
+    assert cache.get_or_run("b", 60, lambda: "rerun") == ("rerun", RAN)
+
+
+def test_defaults_are_part_of_the_key_and_invalidate_by_agent():
+    def agent(limit=10, verbose=False):
+        return limit
+
+    assert cache_key("x", normalize_arguments(agent, {})) == cache_key("x", normalize_arguments(agent, {"limit": 10}))
+
+    cache = ResultCache()
+    cache.get_or_run(cache_key("x", {"limit": 1}), 60, lambda: 1)
+    cache.get_or_run(cache_key("y", {"limit": 1}), 60, lambda: 1)
+    assert cache.invalidate("x") == 1
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("name", ["disk_hygiene", "disk_watch", "threshold_alert", "stock_analysis"])
+def test_agents_with_side_effects_are_not_cached(name):
+    assert registry.get_agent(name).cache_ttl is None
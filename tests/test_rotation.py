@@ -0,0 +1,79 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from agentic_tools.workspace_logger.rotation import (
+    RotationPolicy,
+    records_since,
+    segments,
+    tail_records,
+)
+
+
+def _stamp(ts):
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+def _record(ts, note):
+    return f"[{_stamp(ts)}] Mode: FLOW | Note: {note}\n"
+
+
+@pytest.fixture
+def log(tmp_path):
+    return tmp_path / "milestones.txt"
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def _rotate(policy, path, monkeypatch, at):
+    # Segment names carry the rotation time; keep them distinct and in order.
+    strftime = time.strftime
+    with monkeypatch.context() as patch:
+        patch.setattr(time, "strftime", lambda fmt, *args: strftime(fmt, time.localtime(at)))
+        assert policy.maybe_rotate(path, incoming=1)
+
+
+def test_tail_and_since_across_compressed_segments(log, monkeypatch):
+    policy = RotationPolicy(max_bytes=1)
+    base = int(time.time()) - 3600
+    notes = [f"n{index}" for index in range(12)]
+    for index, note in enumerate(notes):
+        _append(log, _record(base + index * 60, note))
+        if index % 3 == 2 and index < 11:
+            _rotate(policy, log, monkeypatch, base + index * 60 + 30)
+
+    rotated = segments(log)
+    assert [segment.suffix for _, segment in rotated] == [".gz", ".gz", ".txt"]
+
+    def notes_of(records):
+        return [record.rsplit("Note: ", 1)[1] for record in records]
+
+    assert notes_of(tail_records(log, 2)) == notes[-2:]
+    assert notes_of(tail_records(log, 5)) == notes[-5:]
+    assert notes_of(tail_records(log, 100)) == notes
+    assert notes_of(records_since(log, base + 60)) == notes[1:]
+    assert notes_of(records_since(log, base + 7 * 60)) == notes[7:]
+    assert records_since(log, base + 3600) == []
+
+
+def test_since_finds_records_written_out_of_order(log):
+    now = time.time()
+    _append(log, _record(now - 300, "first"))
+    _append(log, _record(now - 200, "second"))
+    # A scan summary logged at the end of a scan, stamped with its start time.
+    _append(log, _record(now - 250, "scan summary"))
+    _append(log, f"[SUMMARY] {_stamp(now - 260)}\nScanned Roots:\n- /tmp\n")
+    _append(log, _record(now - 100, "third"))
+
+    found = records_since(log, now - 255)
+
+    assert [record.splitlines()[0].rsplit("Note: ", 1)[-1] for record in found] == [
+        "second",
+        "scan summary",
+        "third",
+    ]
+    assert len(records_since(log, now - 265)) == 4
@@ -0,0 +1,46 @@
+import os
+
+from agentic_tools.agents.disk_hygiene.size_index import SizeIndex
+from agentic_tools.agents.disk_hygiene.walker import walk_tree
+from agentic_tools.agents.disk_hygiene.watch import LiveTree
+
+
+def _make_tree(root):
+    for name, size in (("a/one.bin", 30_000), ("a/skip/two.bin", 50_000), ("a/skip/x/three.bin", 8_000),
+                       ("b/four.bin", 12_000), ("five.bin", 4_000)):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(size))
+
+
+def test_excluding_walk_writes_back_to_the_index(tmp_path):
+    root = tmp_path / "root"
+    _make_tree(root)
+    skipped = str(root / "a" / "skip")
+    index = SizeIndex(tmp_path / "index.sqlite3")
+
+    full = dict(walk_tree(root, 1, index=index).entries)
+    first = walk_tree(root, 1, index=index, exclude=[skipped])
+    second = walk_tree(root, 1, index=index, exclude=[skipped])
+
+    assert second.dirs_reused == second.dirs_scanned > 0
+    assert dict(second.entries) == dict(first.entries)
+    assert dict(first.entries)[str(root)] == full[str(root)] - index.snapshot(skipped)[skipped].total_bytes
+    # Ancestors of the excluded directory lose their totals, the rest keep them.
+    assert index.total_for(str(root)) is None
+    assert index.total_for(str(root / "a")) is None
+    assert index.total_for(str(root / "b")) == full[str(root / "b")]
+    # The excluded subtree was not walked, so its rows are kept.
+    assert set(index.snapshot(skipped)) == {skipped, skipped + "/x"}
+
+
+def test_live_tree_excludes_like_the_walker(tmp_path):
+    root = tmp_path / "root"
+    _make_tree(root)
+    exclude = [str(root / "a" / "skip"), str(root / "a" / "skip" / "x")]
+    live = LiveTree(str(root))
+    live.graft(str(root), walk_tree(root, 0, collect_records=True).records)
+
+    for depth in (0, 1, 3):
+        walked = dict(walk_tree(root, depth, exclude=exclude).entries)
+        assert dict(live.to_dir_tree(depth, exclude).items()) == walked
@@ -0,0 +1,45 @@
+import os
+import subprocess
+
+from agentic_tools.agents.disk_hygiene.size_index import SizeIndex
+from agentic_tools.agents.threshold_alert.engine import measure_paths
+
+
+def _du_s(path):
+    output = subprocess.run(["du", "-k", "-s", "-x", str(path)], check=True, capture_output=True, text=True).stdout
+    return int(output.split("\t", 1)[0]) * 1024
+
+
+def test_nested_paths_count_shared_hardlinks_once(tmp_path):
+    parent = tmp_path / "parent"
+    child = parent / "child"
+    grandchild = child / "deeper" / "grandchild"
+    grandchild.mkdir(parents=True)
+    (parent / "big.bin").write_bytes(os.urandom(300_000))
+    (grandchild / "small.bin").write_bytes(os.urandom(20_000))
+    os.link(parent / "big.bin", child / "big-link.bin")
+    os.link(grandchild / "small.bin", parent / "small-link.bin")
+
+    measured = measure_paths([str(parent), str(child), str(grandchild)], timeout=None)
+
+    size, complete, source, error = measured[os.path.realpath(parent)]
+    assert (complete, source, error) == (True, "walk", None)
+    assert size == _du_s(parent)
+    assert measured[os.path.realpath(child)][0] <= _du_s(child)
+
+
+def test_measure_paths_refreshes_and_reuses_the_size_index(tmp_path):
+    parent = tmp_path / "parent"
+    child = parent / "child"
+    child.mkdir(parents=True)
+    (parent / "a.bin").write_bytes(os.urandom(40_000))
+    (child / "b.bin").write_bytes(os.urandom(60_000))
+    index = SizeIndex(tmp_path / "index.sqlite3")
+    paths = [str(parent), str(child)]
+
+    without = measure_paths(paths, timeout=None)
+    first = measure_paths(paths, index=index, timeout=None)
+    second = measure_paths(paths, index=index, timeout=None)
+
+    assert first == second == without
+    assert set(index.snapshot(os.path.realpath(parent))) == {os.path.realpath(parent), os.path.realpath(child)}
@@ -0,0 +1,65 @@
+import os
+import subprocess
+
+import pytest
+
+from agentic_tools.agents.disk_hygiene.walker import walk_tree
+
+
+def _du(root, depth):
+    output = subprocess.run(
+        ["du", "-k", "-x", "-d", str(depth), str(root)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    sizes = {}
+    for line in output.splitlines():
+        size, path = line.split("\t", 1)
+        sizes[path] = int(size) * 1024
+    return sizes
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    _write(root / "top.bin", 10_000)
+    _write(root / "a" / "one.bin", 50_000)
+    _write(root / "a" / "deep" / "deeper" / "two.bin", 123_456)
+    _write(root / "b" / "three.bin", 4_096)
+    (root / "b" / "empty").mkdir()
+    _write(root / "c" / "x" / "y" / "z" / "four.bin", 70_001)
+    os.link(root / "a" / "one.bin", root / "a" / "one-link.bin")
+    os.symlink(root / "a", root / "b" / "to-a")
+    return root
+
+
+@pytest.mark.parametrize("depth", [0, 1, 2, 5])
+def test_walk_matches_du(tree, depth):
+    result = walk_tree(tree, depth, max_workers=4)
+
+    assert result.complete
+    assert result.error_count == 0
+    assert dict(result.entries) == _du(tree, depth)
+
+
+def test_hardlink_across_directories_counted_once(tree):
+    os.link(tree / "a" / "deep" / "deeper" / "two.bin", tree / "c" / "two-link.bin")
+
+    result = walk_tree(tree, 0)
+
+    assert dict(result.entries) == _du(tree, 0)
+
+
+def test_exclude_drops_subtree_from_ancestors(tree):
+    excluded = str(tree / "a")
+
+    result = walk_tree(tree, 1, exclude=[excluded])
+    sizes = dict(result.entries)
+
+    assert excluded not in sizes
+    full = _du(tree, 1)
+    assert sizes[str(tree)] == full[str(tree)] - full[excluded]
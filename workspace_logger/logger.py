@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import atexit
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    from agentic_tools.workspace_logger.rotation import RotationPolicy, records_since, tail_records
+except ModuleNotFoundError:
+    repo_root = Path(__file__).resolve().parents[1]
+    repo_root_str = str(repo_root)
+    if repo_root_str not in sys.path:
+        sys.path.insert(0, repo_root_str)
+    from workspace_logger.rotation import RotationPolicy, records_since, tail_records
 
 def log_info(message: str) -> None:
     """
@@ -32,17 +46,293 @@ MILESTONE_FILE = Path(
     os.environ.get("AGENTIC_MILESTONE_FILE", DEFAULT_LOG_DIR / "milestones.txt")
 ).expanduser()
 
+# Structured copy of the default milestone log, committed in batches from a
+# writer thread; set AGENTIC_MILESTONE_DB to an empty string to turn it off.
+_milestone_db_setting = os.environ.get("AGENTIC_MILESTONE_DB", str(DEFAULT_LOG_DIR / "milestones.sqlite3"))
+MILESTONE_DB: Optional[Path] = Path(_milestone_db_setting).expanduser() if _milestone_db_setting else None
+
 
 def _ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
 def _write_line(path: Path, line: str) -> None:
+    writer = _writer
+    if writer is not None:
+        writer.write(path, line)
+        return
     _ensure_parent(path)
-    with path.open("a", encoding="utf-8") as handle:
+    rotation = _rotation
+    if rotation is not None:
+        rotation.maybe_rotate(path, len(line) + 1)
+    # Paths from undecodable filenames carry surrogate escapes; keep them visible.
+    with path.open("a", encoding="utf-8", errors="backslashreplace") as handle:
         handle.write(line + "\n")
 
 
+def write_log_block(text: str, path: Optional[Union[str, Path]] = None) -> None:
+    """Append a multi-line block (e.g. a scan summary) as one write, with rotation."""
+    _write_line(Path(path).expanduser() if path else LOG_FILE, text.rstrip("\n"))
+
+
+def _env_number(name: str, default: float) -> Optional[float]:
+    value = float(os.environ.get(name, default))
+    return value if value > 0 else None
+
+
+# Size/age rotation of every log file written here; 0 in either variable
+# disables that trigger. Age rotation is off unless AGENTIC_LOG_MAX_AGE_DAYS
+# is set (see rotation.DEFAULT_MAX_AGE).
+_rotation: Optional[RotationPolicy] = RotationPolicy(
+    max_bytes=int(_env_number("AGENTIC_LOG_MAX_BYTES", 16 * 1024 * 1024) or 0) or None,
+    max_age=(_env_number("AGENTIC_LOG_MAX_AGE_DAYS", 0) or 0) * 86400 or None,
+)
+
+
+def configure_rotation(
+    max_bytes: Optional[int] = 16 * 1024 * 1024,
+    max_age_days: Optional[float] = None,
+    compress: bool = True,
+) -> None:
+    """Rotate logs past ``max_bytes`` or ``max_age_days``; both ``None`` turns rotation off."""
+    global _rotation
+    if max_bytes is None and max_age_days is None:
+        _rotation = None
+        return
+    _rotation = RotationPolicy(
+        max_bytes=max_bytes,
+        max_age=max_age_days * 86400 if max_age_days is not None else None,
+        compress=compress,
+    )
+
+
+def tail_log(count: int = 20, path: Optional[Union[str, Path]] = None) -> List[str]:
+    """Last ``count`` records of a log (default: milestones), across rotated segments."""
+    flush_logs()
+    return tail_records(Path(path).expanduser() if path else MILESTONE_FILE, count)
+
+
+def read_log_since(since: Union[float, datetime], path: Optional[Union[str, Path]] = None) -> List[str]:
+    """Records stamped at or after ``since`` (epoch seconds or datetime), in the order they were written."""
+    flush_logs()
+    since_ts = since.timestamp() if isinstance(since, datetime) else float(since)
+    return records_since(Path(path).expanduser() if path else MILESTONE_FILE, since_ts)
+
+
+LOG_BACKENDS = ("sync", "buffered")
+# "never": leave it to the OS, "batch": fsync after every batch, "exit": fsync
+# each touched file once when the writer shuts down.
+FSYNC_POLICIES = ("never", "batch", "exit")
+
+
+class _BufferedWriter:
+    """Background thread that appends queued lines in batches, one open() per file per batch."""
+
+    def __init__(self, flush_interval: float, max_batch: int, fsync: str):
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_batch = max(1, max_batch)
+        self.fsync = fsync
+        self.queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, name="workspace-logger", daemon=True)
+        self.known_dirs: Set[Path] = set()
+        self.touched: Set[Path] = set()
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def write(self, path: Path, line: str) -> None:
+        self.queue.put((path, line))
+
+    def write_record(self, store: Any, entry: Dict[str, Any]) -> None:
+        self.queue.put((store, entry))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if not self.thread.is_alive():
+            # Nobody would ever set the event.
+            return False
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        pending: List[Tuple[Any, Any]] = []
+        oldest = 0.0
+        stopping = False
+        while not stopping:
+            timeout = None if not pending else max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            waiters: List[threading.Event] = []
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item:
+                    if not pending:
+                        oldest = time.monotonic()
+                    pending.append(item)
+                if stopping or len(pending) >= self.max_batch:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if pending and (
+                stopping
+                or waiters
+                or len(pending) >= self.max_batch
+                or time.monotonic() - oldest >= self.flush_interval
+            ):
+                try:
+                    self._write_batch(pending)
+                except Exception as exc:
+                    # Losing a batch is bad; losing the writer thread loses every later one.
+                    print(f"[workspace_logger] dropped {len(pending)} queued records: {exc}", file=sys.stderr)
+                pending = []
+            for waiter in waiters:
+                waiter.set()
+
+        if self.fsync == "exit":
+            for path in self.touched:
+                self._fsync_path(path)
+
+    def _write_batch(self, batch: List[Tuple[Any, Any]]) -> None:
+        by_path: Dict[Path, List[str]] = {}
+        by_store: Dict[Any, List[Dict[str, Any]]] = {}
+        for target, payload in batch:
+            if isinstance(target, Path):
+                by_path.setdefault(target, []).append(payload)
+            else:
+                by_store.setdefault(target, []).append(payload)
+
+        for store, entries in by_store.items():
+            try:
+                store.insert_many(entries)
+            except Exception as exc:
+                print(f"[workspace_logger] failed to store {len(entries)} milestones: {exc}", file=sys.stderr)
+
+        for path, lines in by_path.items():
+            try:
+                if path.parent not in self.known_dirs:
+                    _ensure_parent(path)
+                    self.known_dirs.add(path.parent)
+                rotation = _rotation
+                if rotation is not None:
+                    rotation.maybe_rotate(path, sum(len(line) + 1 for line in lines))
+                with path.open("a", encoding="utf-8", errors="backslashreplace") as handle:
+                    handle.write("\n".join(lines) + "\n")
+                    if self.fsync == "batch":
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                self.touched.add(path)
+            except Exception as exc:
+                self.known_dirs.discard(path.parent)
+                print(f"[workspace_logger] failed to write {len(lines)} lines to {path}: {exc}", file=sys.stderr)
+
+    @staticmethod
+    def _fsync_path(path: Path) -> None:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+_writer: Optional[_BufferedWriter] = None
+_writer_lock = threading.Lock()
+# With the sync backend, structured milestones still go through a writer
+# thread so the store commits per batch instead of once per milestone.
+_store_writer: Optional[_BufferedWriter] = None
+_store_writer_closed = False
+
+
+def _sync_store_writer() -> Optional[_BufferedWriter]:
+    global _store_writer
+    with _writer_lock:
+        if _store_writer is None and not _store_writer_closed:
+            _store_writer = _BufferedWriter(flush_interval=1.0, max_batch=512, fsync="never")
+            _store_writer.start()
+        return _store_writer
+
+
+def configure_logging(
+    backend: str = "sync",
+    *,
+    flush_interval: float = 1.0,
+    max_batch: int = 512,
+    fsync: str = "never",
+) -> None:
+    """Select how log lines reach disk.
+
+    ``"sync"`` (the default) appends each line before the call returns.
+    ``"buffered"`` queues lines to a background thread that writes them in
+    batches of up to ``max_batch`` at least every ``flush_interval`` seconds,
+    fsyncs according to ``fsync`` and is flushed at interpreter exit
+    (``shutdown_logging`` runs via ``atexit``).
+    """
+    global _writer
+    if backend not in LOG_BACKENDS:
+        raise ValueError(f"backend must be one of {LOG_BACKENDS}, not {backend!r}")
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {fsync!r}")
+
+    with _writer_lock:
+        previous, _writer = _writer, None
+        if previous is not None:
+            previous.close()
+        if backend == "buffered":
+            writer = _BufferedWriter(flush_interval, max_batch, fsync)
+            writer.start()
+            _writer = writer
+
+
+def flush_logs(timeout: Optional[float] = None) -> bool:
+    """Block until every line and structured milestone queued so far is written."""
+    flushed = True
+    for writer in (_writer, _store_writer):
+        if writer is not None:
+            flushed = writer.flush(timeout) and flushed
+    return flushed
+
+
+def shutdown_logging() -> None:
+    """Write pending coalesced summaries, drain the writers and go back to unbuffered writes."""
+    global _store_writer, _store_writer_closed
+    flush_coalesced()
+    configure_logging("sync")
+    with _writer_lock:
+        store_writer, _store_writer = _store_writer, None
+        # Anything logged after this (late atexit handlers) is stored directly.
+        _store_writer_closed = True
+    if store_writer is not None:
+        store_writer.close()
+
+
+atexit.register(shutdown_logging)
+
+
+if os.environ.get("AGENTIC_LOG_BACKEND") == "buffered":
+    configure_logging(
+        "buffered",
+        flush_interval=float(os.environ.get("AGENTIC_LOG_FLUSH_INTERVAL", "1.0")),
+        fsync=os.environ.get("AGENTIC_LOG_FSYNC", "never"),
+    )
+
+
 def log_entry(
     mode: str,
     note: str = "",
@@ -74,7 +364,17 @@ def log_milestone(
     path: Optional[Union[str, Path]] = None,
     echo: bool = True,
     extra: Optional[Dict[str, Any]] = None,
+    coalesce: Optional[str] = None,
+    sample: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """Record a milestone.
+
+    Milestones sharing a ``coalesce`` key are rate-limited: the first one in
+    each window is written as usual, later ones only bump a counter and keep
+    up to a few ``sample`` values (default: their note). When the window
+    closes a single summary record carries the count and samples, so a run
+    that skips ten thousand paths still writes two lines.
+    """
     if isinstance(mode, dict):
         entry = mode.copy()
         entry.setdefault("mode", "OTHER")
@@ -104,15 +404,205 @@ def log_milestone(
         else:
             entry["extra"] = extra
 
+    _flush_expired_coalesced()
+    if coalesce is not None and not _coalescer.admit(coalesce, entry, path, echo, sample):
+        return entry
+
+    _emit_milestone(entry, path, echo)
+    return entry
+
+
+def _emit_milestone(entry: Dict[str, Any], path: Optional[Union[str, Path]], echo: bool) -> None:
     line = _format_milestone_line(entry)
 
     target_path = Path(path).expanduser() if path else MILESTONE_FILE
     _write_line(target_path, line)
+    if not path:
+        _store_milestone(entry)
 
     if echo:
         print(f"[milestone] {line}")
 
-    return entry
+
+class _CoalesceWindow:
+    __slots__ = ("first", "opened", "count", "samples", "last", "path", "echo")
+
+    def __init__(self, first: Dict[str, Any], opened: float, path: Optional[Union[str, Path]], echo: bool):
+        self.first = first
+        self.opened = opened
+        self.count = 0
+        self.samples: List[str] = []
+        self.last: Optional[Dict[str, Any]] = None
+        self.path = path
+        self.echo = echo
+
+
+class _Coalescer:
+    def __init__(self, window: float = 60.0, max_samples: int = 3):
+        self.window = window
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.open: Dict[str, _CoalesceWindow] = {}
+        self.next_expiry: Optional[float] = None
+
+    def admit(
+        self,
+        key: str,
+        entry: Dict[str, Any],
+        path: Optional[Union[str, Path]],
+        echo: bool,
+        sample: Optional[str],
+    ) -> bool:
+        """True if ``entry`` opens a new window and should be written now."""
+        now = time.monotonic()
+        with self.lock:
+            current = self.open.get(key)
+            if current is not None and now - current.opened < self.window:
+                current.count += 1
+                current.last = entry
+                if len(current.samples) < self.max_samples:
+                    current.samples.append(sample if sample is not None else entry.get("note", ""))
+                return False
+            expired = self.open.pop(key, None)
+            self.open[key] = _CoalesceWindow(entry, now, path, echo)
+            self._update_expiry()
+
+        if expired is not None:
+            self._emit_summary(key, expired)
+        return True
+
+    def flush(self, expired_only: bool = False, keys: Optional[Collection[str]] = None) -> None:
+        now = time.monotonic()
+        with self.lock:
+            if expired_only and (self.next_expiry is None or now < self.next_expiry):
+                return
+            closing = [
+                (key, state)
+                for key, state in self.open.items()
+                if (not expired_only or now - state.opened >= self.window) and (keys is None or key in keys)
+            ]
+            for key, _ in closing:
+                del self.open[key]
+            self._update_expiry()
+
+        for key, state in closing:
+            self._emit_summary(key, state)
+
+    def _update_expiry(self) -> None:
+        self.next_expiry = min((state.opened for state in self.open.values()), default=None)
+        if self.next_expiry is not None:
+            self.next_expiry += self.window
+
+    @staticmethod
+    def _emit_summary(key: str, state: _CoalesceWindow) -> None:
+        if not state.count:
+            return
+        last = state.last or state.first
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "mode": state.first.get("mode", "OTHER"),
+            "note": f"{key}: {state.count} more since {state.first.get('timestamp', '?')}",
+            "reflection": last.get("reflection", ""),
+            "extra": {
+                "coalesced": key,
+                "count": state.count,
+                "samples": "; ".join(state.samples),
+            },
+        }
+        _emit_milestone(summary, state.path, state.echo)
+
+
+_coalescer = _Coalescer()
+
+
+def configure_coalescing(window: float = 60.0, max_samples: int = 3) -> None:
+    """Set the window (seconds) and sample count for ``coalesce`` keys; pending windows are flushed."""
+    flush_coalesced()
+    _coalescer.window = max(0.0, window)
+    _coalescer.max_samples = max(0, max_samples)
+
+
+def flush_coalesced(keys: Optional[Iterable[str]] = None) -> None:
+    """Write the summary record of every open coalescing window now, or only those of ``keys``."""
+    _coalescer.flush(keys=frozenset(keys) if keys is not None else None)
+
+
+def _flush_expired_coalesced() -> None:
+    _coalescer.flush(expired_only=True)
+
+
+_store: Optional[Any] = None
+_store_lock = threading.Lock()
+
+
+def milestone_store():
+    """The structured ``MilestoneStore`` behind the default milestone log, or None if disabled."""
+    global _store
+    if MILESTONE_DB is None:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                from agentic_tools.workspace_logger.store import MilestoneStore
+            except ModuleNotFoundError:
+                from workspace_logger.store import MilestoneStore
+            _store = MilestoneStore(MILESTONE_DB)
+        return _store
+
+
+def _store_milestone(entry: Dict[str, Any]) -> None:
+    store = milestone_store()
+    if store is None:
+        return
+    writer = _writer or _sync_store_writer()
+    if writer is not None:
+        writer.write_record(store, entry)
+        return
+    try:
+        store.insert(entry)
+    except Exception as exc:
+        # The text log already has the line; never fail the caller over the index.
+        print(f"[workspace_logger] failed to store milestone: {exc}", file=sys.stderr)
+
+
+def query_milestones(
+    mode: Union[None, str, List[str]] = None,
+    since: Any = None,
+    until: Any = None,
+    note_prefix: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+) -> List[Dict[str, Any]]:
+    """Filter structured milestones by mode, time range, note prefix and ``extra`` keys.
+
+    e.g. ``query_milestones("ALERT", since=time.time() - 7 * 86400)``.
+    Milestones still queued for the store are flushed first.
+    """
+    store = milestone_store()
+    if store is None:
+        return []
+    flush_logs()
+    return store.query(
+        mode=mode,
+        since=since,
+        until=until,
+        note_prefix=note_prefix,
+        extra=extra,
+        limit=limit,
+        newest_first=newest_first,
+    )
+
+
+def import_text_milestones(path: Optional[Union[str, Path]] = None, force: bool = False) -> int:
+    """One-time import of a text milestone log (default: MILESTONE_FILE) into the store."""
+    store = milestone_store()
+    source = Path(path).expanduser() if path else MILESTONE_FILE
+    if store is None or not source.exists():
+        return 0
+    # Queued milestones are what the import compares against to skip duplicates.
+    flush_logs()
+    return store.import_text_file(source, force=force)
 
 
 def log_reflection(
@@ -0,0 +1,270 @@
+"""Segmented rotation and fast tail reads for the workspace text logs.
+
+The active log keeps its usual name. Once it passes ``max_bytes``, or its
+first record is older than ``max_age``, it is renamed to a closed segment
+named after the rotation time, e.g. ``milestones.20261017T060902.txt``. Older
+closed segments are gzip-compressed at the next rotation, which leaves the
+newest one plain for a full rotation period so that late appends from other
+processes still land somewhere readable.
+
+Readers memory-map plain files and walk record boundaries from the end, so
+"last N records" only touches the tail of the log and only decompresses a
+segment when the answer actually reaches back into it. "Records since T"
+skips every segment rotated before T and checks the records of the rest.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+# Age rotation is opt-in: the default log directory holds tracked files whose
+# first records are old, and renaming those on the first write is a surprise.
+DEFAULT_MAX_AGE: Optional[float] = None
+
+_SEGMENT_TIME = "%Y%m%dT%H%M%S"
+# A record starts at a line opening with "[timestamp]" ("[SUMMARY] timestamp"
+# for disk summaries); anything else continues the previous record.
+_RECORD_START = re.compile(rb"\[(?P<stamp>[^\]\n]+)\](?: (?P<rest>[^\n]*))?")
+_TIMESTAMP_FORMATS = ("%d-%m-%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_record_time(record: bytes) -> Optional[float]:
+    match = _RECORD_START.match(record)
+    if match is None:
+        return None
+    stamp = match.group("stamp").decode("utf-8", "replace")
+    if stamp == "SUMMARY" and match.group("rest"):
+        stamp = match.group("rest").decode("utf-8", "replace").strip()
+    try:
+        return datetime.fromisoformat(stamp).timestamp()
+    except ValueError:
+        pass
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(stamp, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _segment_pattern(path: Path) -> re.Pattern:
+    return re.compile(
+        re.escape(path.stem) + r"\.(?P<time>\d{8}T\d{6})(?:-(?P<counter>\d+))?" + re.escape(path.suffix) + r"(?P<gz>\.gz)?$"
+    )
+
+
+def segments(path: Union[str, Path]) -> List[Tuple[float, Path]]:
+    """Closed segments of ``path`` as ``(rotated_at, segment)``, oldest first."""
+    path = Path(path)
+    pattern = _segment_pattern(path)
+    found: List[Tuple[float, int, Path]] = []
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            rotated_at = datetime.strptime(match.group("time"), _SEGMENT_TIME).timestamp()
+            found.append((rotated_at, int(match.group("counter") or 0), path.parent / name))
+    # Segments rotated within the same second are ordered by their counter.
+    found.sort()
+    return [(rotated_at, segment) for rotated_at, _, segment in found]
+
+
+class RotationPolicy:
+    """Rotates one log file by size and age; thread-safe within a process."""
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        compress: bool = True,
+    ):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._first_record: dict = {}
+
+    def maybe_rotate(self, path: Path, incoming: int = 0) -> bool:
+        """Rotate ``path`` if writing ``incoming`` more bytes would break the policy."""
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return False
+        if size == 0:
+            return False
+
+        with self._lock:
+            too_big = self.max_bytes is not None and size + incoming > self.max_bytes
+            too_old = False
+            if not too_big and self.max_age is not None:
+                first = self._first_record.get(path)
+                if first is None:
+                    first = self._first_record_time(path)
+                    self._first_record[path] = first
+                too_old = first is not None and time.time() - first > self.max_age
+            if not (too_big or too_old):
+                return False
+            self._first_record.pop(path, None)
+            return self._rotate(path)
+
+    @staticmethod
+    def _first_record_time(path: Path) -> Optional[float]:
+        try:
+            with open(path, "rb") as handle:
+                for line in handle:
+                    stamp = parse_record_time(line)
+                    if stamp is not None:
+                        return stamp
+        except OSError:
+            return None
+        return None
+
+    def _rotate(self, path: Path) -> bool:
+        stamp = time.strftime(_SEGMENT_TIME)
+        target = path.with_name(f"{path.stem}.{stamp}{path.suffix}")
+        counter = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = path.with_name(f"{path.stem}.{stamp}-{counter}{path.suffix}")
+            counter += 1
+        try:
+            os.rename(path, target)
+        except OSError:
+            # Another process rotated it first.
+            return False
+
+        if self.compress:
+            for _, segment in segments(path)[:-1]:
+                if segment.suffix != ".gz":
+                    compress_segment(segment)
+        return True
+
+
+def compress_segment(segment: Path) -> Optional[Path]:
+    target = segment.with_name(segment.name + ".gz")
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        with open(segment, "rb") as source, gzip.open(temp, "wb") as sink:
+            shutil.copyfileobj(source, sink, 1024 * 1024)
+        os.replace(temp, target)
+        os.unlink(segment)
+    except OSError:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        return None
+    return target
+
+
+def _record_starts_backward(data: Union[mmap.mmap, bytes], end: int) -> Iterator[int]:
+    """Offsets of record starts before ``end``, newest first."""
+    position = end
+    while position > 0:
+        newline = data.rfind(b"\n[", 0, position)
+        start = 0 if newline < 0 else newline + 1
+        if _RECORD_START.match(data, start):
+            yield start
+        position = start
+        if start == 0:
+            return
+
+
+def _split_records(blob: bytes) -> List[bytes]:
+    records: List[bytes] = []
+    current: List[bytes] = []
+    for line in blob.splitlines(keepends=True):
+        if _RECORD_START.match(line) and current:
+            records.append(b"".join(current))
+            current = []
+        current.append(line)
+    if current:
+        records.append(b"".join(current))
+    return records
+
+
+def _decode(records: List[bytes]) -> List[str]:
+    return [record.decode("utf-8", "replace").rstrip("\n") for record in records if record.strip()]
+
+
+def _tail_plain(path: Path, count: int) -> List[bytes]:
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = len(data)
+                found: List[bytes] = []
+                for start in _record_starts_backward(data, end):
+                    found.append(data[start:end])
+                    end = start
+                    if len(found) >= count:
+                        break
+                found.reverse()
+                return found
+    except (OSError, ValueError):
+        return []
+
+
+def _read_segment(segment: Path) -> bytes:
+    try:
+        if segment.suffix == ".gz":
+            with gzip.open(segment, "rb") as handle:
+                return handle.read()
+        return segment.read_bytes()
+    except OSError:
+        return b""
+
+
+def tail_records(path: Union[str, Path], count: int) -> List[str]:
+    """The last ``count`` records of a rotated log, oldest first."""
+    path = Path(path).expanduser()
+    if count <= 0:
+        return []
+    collected = _tail_plain(path, count)
+    for _, segment in reversed(segments(path)):
+        if len(collected) >= count:
+            break
+        needed = count - len(collected)
+        if segment.suffix == ".gz":
+            older = _split_records(_read_segment(segment))[-needed:]
+        else:
+            older = _tail_plain(segment, needed)
+        collected = older + collected
+    return _decode(collected[-count:])
+
+
+def _since(blob: bytes, since: float) -> List[bytes]:
+    # Stamps do not increase through a file: callers may log a record with
+    # an earlier time than it is written at (a scan summary carries the scan's
+    # start time), so every record in a candidate file is checked.
+    return [record for record in _split_records(blob) if (parse_record_time(record) or since) >= since]
+
+
+def records_since(path: Union[str, Path], since: float) -> List[str]:
+    """Every record stamped at or after ``since`` (epoch seconds), in write order.
+
+    A record is never written before the time it is stamped with, so a
+    segment rotated before ``since`` cannot hold one and is not read.
+    """
+    path = Path(path).expanduser()
+    collected: List[bytes] = []
+    for rotated_at, segment in segments(path):
+        # Segment names keep whole seconds of the rotation time.
+        if rotated_at + 1 <= since:
+            continue
+        collected.extend(_since(_read_segment(segment), since))
+    collected.extend(_since(_read_segment(path), since))
+    return _decode(collected)
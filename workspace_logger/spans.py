@@ -0,0 +1,215 @@
+"""Lightweight timing spans for agent phases.
+
+``span`` works as a context manager or a decorator and records wall time and
+process CPU time. Process CPU covers all threads, so it includes worker pools
+started inside the span, but also any other span running at the same time:
+the ``process_cpu_s`` of concurrent spans (several ``disk.du_root`` walks,
+say) overlap and do not add up. Spans nest per thread and per asyncio task,
+and decorating an ``async def`` times the awaited call, not just creating the
+coroutine. Each finished span is logged as a TIMING milestone whose ``extra``
+carries the timings, parent span and labels, and is kept in memory for
+``span_summary()``. A p50/p95 table is printed at exit when anything was
+recorded (set ``AGENTIC_SPAN_SUMMARY=0`` to silence it).
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# Per span name, only the most recent samples are kept for percentiles.
+MAX_SAMPLES_PER_SPAN = 10000
+
+# Each thread and each asyncio task sees its own stack of open spans.
+_open: contextvars.ContextVar[Tuple["span", ...]] = contextvars.ContextVar("agentic_open_spans", default=())
+_lock = threading.Lock()
+_samples: Dict[str, Deque[Tuple[float, float]]] = defaultdict(lambda: deque(maxlen=MAX_SAMPLES_PER_SPAN))
+
+
+def current_span() -> Optional[str]:
+    """Name of the innermost open span in this thread or task, if any."""
+    stack = _open.get()
+    return stack[-1].name if stack else None
+
+
+class span:
+    """Time a block or a function::
+
+        with span("disk.df"):
+            ...
+
+        @span("disk.du_root", label_args=("root",))
+        def _run_du_for_root(self, root, depth): ...
+
+    ``labels`` are attached to the milestone as-is; ``label_args`` names
+    arguments of a decorated function whose values become labels per call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        log: bool = True,
+        label_args: Sequence[str] = (),
+        **labels: Any,
+    ):
+        self.name = name
+        self.log = log
+        self.label_args = tuple(label_args)
+        self.labels = labels
+        self.wall = 0.0
+        self.process_cpu = 0.0
+        self._started: Optional[Tuple[float, float]] = None
+        self._parent: Optional[str] = None
+
+    def __enter__(self) -> "span":
+        stack = _open.get()
+        self._parent = stack[-1].name if stack else None
+        _open.set(stack + (self,))
+        self._started = (time.perf_counter(), time.process_time())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall_start, cpu_start = self._started or (time.perf_counter(), time.process_time())
+        self.wall = time.perf_counter() - wall_start
+        self.process_cpu = time.process_time() - cpu_start
+        stack = _open.get()
+        if self in stack:
+            _open.set(stack[: stack.index(self)])
+        _record(self, self._parent, failed=exc_type is not None)
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func: Callable) -> Callable:
+        signature = inspect.signature(func) if self.label_args else None
+
+        def call_span(args, kwargs) -> "span":
+            labels = dict(self.labels)
+            if signature is not None:
+                bound = signature.bind_partial(*args, **kwargs)
+                for name in self.label_args:
+                    if name in bound.arguments:
+                        labels[name] = str(bound.arguments[name])
+            # A fresh span per call keeps concurrent and recursive calls apart.
+            return span(self.name, log=self.log, **labels)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with call_span(args, kwargs):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with call_span(args, kwargs):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def _record(finished: span, parent: Optional[str], failed: bool) -> None:
+    with _lock:
+        _samples[finished.name].append((finished.wall, finished.process_cpu))
+    if not finished.log:
+        return
+
+    try:
+        from agentic_tools.workspace_logger.logger import log_milestone
+    except ModuleNotFoundError:
+        from workspace_logger.logger import log_milestone
+
+    extra: Dict[str, Any] = {
+        "span": finished.name,
+        "wall_s": round(finished.wall, 6),
+        "process_cpu_s": round(finished.process_cpu, 6),
+    }
+    if parent:
+        extra["parent"] = parent
+    if failed:
+        extra["failed"] = True
+    extra.update(finished.labels)
+    log_milestone(
+        "TIMING",
+        note=f"{finished.name}: {finished.wall:.3f}s wall, {finished.process_cpu:.3f}s process cpu",
+        extra=extra,
+        echo=False,
+    )
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile; fine for the sample sizes a run produces.
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def span_summary() -> List[Dict[str, Any]]:
+    """Per span name: count, total and p50/p95 wall and process CPU seconds, slowest total first."""
+    with _lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items() if samples}
+
+    rows = []
+    for name, samples in snapshot.items():
+        walls = sorted(wall for wall, _ in samples)
+        cpus = sorted(cpu for _, cpu in samples)
+        rows.append({
+            "name": name,
+            "count": len(samples),
+            "total_wall_s": sum(walls),
+            "p50_wall_s": _percentile(walls, 0.50),
+            "p95_wall_s": _percentile(walls, 0.95),
+            "p50_process_cpu_s": _percentile(cpus, 0.50),
+            "p95_process_cpu_s": _percentile(cpus, 0.95),
+        })
+    rows.sort(key=lambda row: row["total_wall_s"], reverse=True)
+    return rows
+
+
+def format_span_summary(rows: Optional[List[Dict[str, Any]]] = None) -> str:
+    rows = span_summary() if rows is None else rows
+    if not rows:
+        return "No spans recorded."
+    width = max(len("span"), *(len(row["name"]) for row in rows))
+    header = f"{'span':<{width}}  {'count':>5}  {'total':>9}  {'p50':>9}  {'p95':>9}  {'pcpu p50':>9}  {'pcpu p95':>9}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<{width}}  {row['count']:>5}  {row['total_wall_s']:>8.3f}s  "
+            f"{row['p50_wall_s']:>8.3f}s  {row['p95_wall_s']:>8.3f}s  "
+            f"{row['p50_process_cpu_s']:>8.3f}s  {row['p95_process_cpu_s']:>8.3f}s"
+        )
+    return "\n".join(lines)
+
+
+def print_span_summary() -> None:
+    print(format_span_summary())
+
+
+def reset_spans() -> None:
+    with _lock:
+        _samples.clear()
+
+
+def _summary_at_exit() -> None:
+    if os.environ.get("AGENTIC_SPAN_SUMMARY", "1") == "0":
+        return
+    with _lock:
+        recorded = any(_samples.values())
+    if recorded:
+        print("\n[span summary]\n" + format_span_summary())
+
+
+atexit.register(_summary_at_exit)
@@ -0,0 +1,327 @@
+"""Structured, indexed milestone store alongside ``milestones.txt``.
+
+Every milestone is also kept as one SQLite row (epoch seconds, mode, note,
+reflection and ``extra`` as JSON) with indexes on time, mode and note, so
+questions like "all ALERTs in the last week" are index range scans instead of
+regex passes over the whole text file. ``import_text_file`` backfills the
+store once from existing ``milestones.txt`` files, skipping the records the
+store already received when they were logged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS milestones (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        timestamp TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        note TEXT NOT NULL,
+        reflection TEXT NOT NULL,
+        extra TEXT,
+        source TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS milestones_ts ON milestones (ts)",
+    "CREATE INDEX IF NOT EXISTS milestones_mode_ts ON milestones (mode, ts)",
+    "CREATE INDEX IF NOT EXISTS milestones_note ON milestones (note)",
+    """
+    CREATE TABLE IF NOT EXISTS imports (
+        source TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        records INTEGER NOT NULL,
+        imported_at REAL NOT NULL
+    )
+    """,
+)
+
+_LINE = re.compile(
+    r"^\[(?P<timestamp>[^\]]+)\] Mode: (?P<mode>[^|]*?) \| Note: (?P<rest>.*)$"
+)
+_TIMESTAMP_FORMATS = ("%d-%m-%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S")
+_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+TimeBound = Union[None, float, str, datetime]
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds for an ISO or ``dd-mm-YYYY HH:MM:SS`` timestamp (or a number)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        pass
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _text(value: Any) -> str:
+    # SQLite needs valid UTF-8; undecodable filenames arrive as surrogate escapes.
+    return str(value).encode("utf-8", "backslashreplace").decode("utf-8")
+
+
+class MilestoneStore:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(milestones)")}
+            if "source" not in columns:
+                # Stores created before imports were tagged; their rows count as logged.
+                conn.execute("ALTER TABLE milestones ADD COLUMN source TEXT")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _row(entry: Dict[str, Any], source: Optional[str] = None) -> tuple:
+        timestamp = _text(entry.get("timestamp") or datetime.now().isoformat())
+        ts = parse_timestamp(timestamp)
+        extra = entry.get("extra")
+        return (
+            ts if ts is not None else datetime.now().timestamp(),
+            timestamp,
+            _text(entry.get("mode") or "OTHER"),
+            _text(entry.get("note") or ""),
+            _text(entry.get("reflection") or ""),
+            json.dumps(extra, default=str, sort_keys=True) if extra else None,
+            source,
+        )
+
+    def insert_many(self, entries: Iterable[Dict[str, Any]], source: Optional[str] = None) -> int:
+        """Insert milestones; ``source`` marks them as imported from that file."""
+        rows = [self._row(entry, source) for entry in entries]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO milestones (ts, timestamp, mode, note, reflection, extra, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def insert(self, entry: Dict[str, Any]) -> None:
+        self.insert_many([entry])
+
+    def query(
+        self,
+        mode: Union[None, str, Sequence[str]] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        note_prefix: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Milestones matching every given filter, in time order.
+
+        ``since`` is inclusive and ``until`` exclusive; both accept epoch
+        seconds, ``datetime`` objects or timestamp strings. ``extra`` maps key
+        names to required values, with ``None`` meaning "key is present".
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if mode is not None:
+            modes = [mode] if isinstance(mode, str) else list(mode)
+            clauses.append(f"mode IN ({', '.join('?' * len(modes))})")
+            params.extend(modes)
+        for bound, operator in ((since, ">="), (until, "<")):
+            if bound is not None:
+                value = parse_timestamp(bound)
+                if value is None:
+                    raise ValueError(f"Unrecognised timestamp: {bound!r}")
+                clauses.append(f"ts {operator} ?")
+                params.append(value)
+        if note_prefix:
+            # A half-open range keeps the note index usable (LIKE would not).
+            clauses.append("note >= ? AND note < ?")
+            params.extend([note_prefix, note_prefix + "\U0010ffff"])
+        for key, value in (extra or {}).items():
+            if not _KEY.match(key):
+                raise ValueError(f"Unsupported extra key: {key!r}")
+            if value is None:
+                clauses.append(f"json_extract(extra, '$.{key}') IS NOT NULL")
+            else:
+                clauses.append(f"json_extract(extra, '$.{key}') = ?")
+                params.append(value)
+
+        sql = "SELECT timestamp, mode, note, reflection, extra FROM milestones"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts DESC, id DESC" if newest_first else " ORDER BY ts, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+
+        results = []
+        for timestamp, mode_value, note, reflection, extra_json in rows:
+            entry: Dict[str, Any] = {
+                "timestamp": timestamp,
+                "mode": mode_value,
+                "note": note,
+                "reflection": reflection,
+            }
+            if extra_json:
+                entry["extra"] = json.loads(extra_json)
+            results.append(entry)
+        return results
+
+    def import_text_file(self, path: Union[str, Path], force: bool = False) -> int:
+        """Backfill from a ``milestones.txt`` file once; returns records imported.
+
+        Records timestamped at or after the earliest milestone the store
+        received directly were written to both, so they are skipped. ``force``
+        replaces an earlier import of the same file.
+
+        The text log holds ``str()`` of each ``extra`` value, so imported
+        values are strings: ``query(extra={"count": 3})`` only matches rows
+        that were logged directly, imported ones need ``{"count": "3"}``.
+        """
+        source = Path(path).expanduser()
+        size = source.stat().st_size
+        key = str(source.resolve())
+        with self._lock:
+            conn = self._connection()
+            previous = conn.execute("SELECT size FROM imports WHERE source = ?", (key,)).fetchone()
+            if previous is not None and not force:
+                return 0
+            with conn:
+                conn.execute("DELETE FROM milestones WHERE source = ?", (key,))
+            (cutoff,) = conn.execute("SELECT MIN(ts) FROM milestones WHERE source IS NULL").fetchone()
+
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        for entry in parse_text_milestones(source):
+            if cutoff is not None:
+                ts = parse_timestamp(entry["timestamp"])
+                if ts is None or ts >= cutoff:
+                    continue
+            batch.append(entry)
+            if len(batch) >= 1000:
+                count += self.insert_many(batch, source=key)
+                batch = []
+        count += self.insert_many(batch, source=key)
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO imports (source, size, records, imported_at) VALUES (?, ?, ?, ?)",
+                    (key, size, count, datetime.now().timestamp()),
+                )
+        return count
+
+
+def _parse_extra(text: str) -> Dict[str, Any]:
+    # Values were written with str(); they come back as strings.
+    extra: Dict[str, Any] = {}
+    for fragment in text.split(", "):
+        key, separator, value = fragment.partition("=")
+        if separator and _KEY.match(key):
+            extra[key] = value
+        elif extra:
+            last = next(reversed(extra))
+            extra[last] += ", " + fragment
+        else:
+            return {}
+    return extra
+
+
+def _split_fields(rest: str) -> Dict[str, Any]:
+    """Split ``note | Reflection: ... | Extra: ...`` back into fields."""
+    body, extra = rest, {}
+    if " | Extra: " in rest:
+        candidate, extra_text = rest.rsplit(" | Extra: ", 1)
+        extra = _parse_extra(extra_text)
+        if extra:
+            body = candidate
+
+    note, _, reflection = body.partition(" | Reflection: ")
+    entry: Dict[str, Any] = {"note": note, "reflection": reflection}
+    if extra:
+        entry["extra"] = extra
+    return entry
+
+
+def parse_text_milestones(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield milestone dicts from a text log; continuation lines join the previous record."""
+    current: Optional[Dict[str, Any]] = None
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for raw in handle:
+            line = raw.rstrip("\n")
+            match = _LINE.match(line)
+            if match is None:
+                if current is not None:
+                    current["rest"] += "\n" + line
+                continue
+            if current is not None:
+                yield _finish(current)
+            current = match.groupdict()
+    if current is not None:
+        yield _finish(current)
+
+
+def _finish(raw: Dict[str, str]) -> Dict[str, Any]:
+    entry = {"timestamp": raw["timestamp"], "mode": raw["mode"].strip() or "OTHER"}
+    entry.update(_split_fields(raw["rest"]))
+    return entry
+
+
+if __name__ == "__main__":
+    # python -m workspace_logger.store [milestones.txt ...] imports text logs
+    # into the default store (AGENTIC_MILESTONE_DB).
+    try:
+        from agentic_tools.workspace_logger.logger import MILESTONE_DB, MILESTONE_FILE
+    except ModuleNotFoundError:
+        from workspace_logger.logger import MILESTONE_DB, MILESTONE_FILE
+
+    if MILESTONE_DB is None:
+        sys.exit("AGENTIC_MILESTONE_DB is empty; the structured store is disabled.")
+    store = MilestoneStore(MILESTONE_DB)
+    for text_path in sys.argv[1:] or [str(MILESTONE_FILE)]:
+        if not os.path.exists(text_path):
+            print(f"skip {text_path}: not found")
+            continue
+        print(f"{text_path}: imported {store.import_text_file(text_path)} milestones into {MILESTONE_DB}")